@@ -78,7 +78,7 @@ from casm.learn.fit import example_input_Lasso, example_input_LassoCV, example_i
  example_input_GeneticAlgorithm, example_input_IndividualBestFirst, \
  example_input_PopulationBestFirst, example_input_DirectSelection, \
  open_input, set_input_defaults, \
- FittingData, TrainingData, \
+ FittingData, TrainingData, save_fitting_data, open_fitting_data, \
  print_input_help, print_individual, print_population, print_halloffame, print_eci, \
  to_json, open_halloffame, save_halloffame, \
  checkspecs, checkhull
@@ -92,8 +92,8 @@ __all__ = __all__ = [
     'example_input_GeneticAlgorithm', 'example_input_IndividualBestFirst',
     'example_input_PopulationBestFirst', 'example_input_DirectSelection',
     'open_input', 'set_input_defaults', 'FittingData', 'TrainingData',
-    'print_input_help', 'print_individual', 'print_population',
-    'print_halloffame', 'print_eci', 'to_json', 'open_halloffame',
-    'save_halloffame', 'checkspecs', 'checkhull', 'fit_and_select',
-    'direct_fit'
+    'save_fitting_data', 'open_fitting_data', 'print_input_help',
+    'print_individual', 'print_population', 'print_halloffame', 'print_eci',
+    'to_json', 'open_halloffame', 'save_halloffame', 'checkspecs', 'checkhull',
+    'fit_and_select', 'direct_fit'
 ]
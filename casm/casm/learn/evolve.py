@@ -2,11 +2,17 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from builtins import *
 
+from collections import OrderedDict
 import copy
+from functools import partial
+import hashlib
+import multiprocessing
 from operator import attrgetter
 import os
 import pickle
 import random
+import shutil
+import tempfile
 import time
 
 import deap
@@ -19,6 +25,8 @@ from sklearn.base import BaseEstimator
 from sklearn.feature_selection import SelectorMixin
 
 import casm.learn
+import casm.learn.linear_model
+import casm.learn.model_selection
 
 
 def initNRandomOn(container, n_features, n_features_init):
@@ -275,6 +283,251 @@ def save_halloffame(hall, filename, verbose=False):
         pickle.dump(hall, f, protocol=2)
 
 
+class FitnessCache(object):
+    """
+  Bounded least-recently-used cache of individual fitness values.
+
+  Individuals are keyed by their packed bitstring, so that identical feature
+  selections generated by mutation, crossover, or overlapping best-first
+  neighborhoods are only evaluated once. Entries are only valid for one
+  problem, identified by a hash of the fitting data, estimator, and CV
+  settings set by 'bind'. Optionally, the cache is saved to and loaded from
+  a file so that repeated runs can reuse prior scores.
+
+  Attributes
+  ----------
+
+    maxsize: int
+      Maximum number of cached fitness values.
+
+    filename: str or None
+      If not None, file used to persist the cache.
+
+    key: str or None
+      Hash identifying the problem the cached fitness values belong to.
+
+    hits: int
+      Number of cache lookups that found a fitness value.
+
+    misses: int
+      Number of cache lookups that did not find a fitness value.
+
+  """
+    def __init__(self, maxsize=100000, filename=None, verbose=False):
+        """
+    Arguments
+    ---------
+
+      maxsize: int, optional, default=100000
+        Maximum number of cached fitness values.
+
+      filename: str, optional, default=None
+        If not None, file used to persist the cache.
+
+      verbose: boolean, optional, default=False
+        Print information to stdout.
+
+    """
+        self.maxsize = maxsize
+        self.filename = filename
+        self.verbose = verbose
+        self.key = None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    @staticmethod
+    def packed(indiv):
+        """ Return hashable packed bitstring of an individual """
+        return (len(indiv), np.packbits(np.asarray(indiv,
+                                                   dtype=bool)).tobytes())
+
+    def bind(self, X, y, estimator=None, cv=None, scoring=None, penalty=0.0):
+        """
+    Set the problem the cached fitness values belong to.
+
+    If the problem hash differs from the current one, the cache is cleared,
+    and if 'filename' exists and was saved for the same problem, it is loaded.
+
+    Arguments
+    ---------
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+
+      estimator:  estimator object implementing 'fit'
+        The estimator used to evaluate fitness.
+
+      cv: cross-validation generator or an iterable
+        Provides train/test splits
+
+      scoring: string, callable or None
+        The scoring used to evaluate fitness.
+
+      penalty: float
+        The CV score is increased by 'penalty*(number of selected basis function)'
+    """
+        h = hashlib.sha1()
+        h.update(np.ascontiguousarray(X).tobytes())
+        h.update(np.ascontiguousarray(y).tobytes())
+        h.update(str(X.shape).encode('utf-8'))
+        if estimator is not None:
+            h.update(type(estimator).__name__.encode('utf-8'))
+            h.update(
+                str(sorted(six.iteritems(
+                    estimator.get_params()))).encode('utf-8'))
+        h.update(pickle.dumps(cv, protocol=2))
+        h.update(repr(scoring).encode('utf-8'))
+        h.update(repr(float(penalty)).encode('utf-8'))
+        key = h.hexdigest()
+
+        if key != self.key:
+            self.key = key
+            self._data = OrderedDict()
+            self.load()
+
+    def load(self):
+        """ Load cached fitness values from 'filename', if it exists and matches 'key' """
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb') as f:
+            saved = pickle.load(f)
+        if saved.get("key") != self.key:
+            if self.verbose:
+                print("Ignoring fitness cache for a different problem:",
+                      self.filename)
+            return
+        for k, fitness in saved["data"][-self.maxsize:]:
+            self._data[k] = fitness
+        if self.verbose:
+            print("Loaded", len(self._data), "cached fitness values:",
+                  self.filename)
+
+    def save(self):
+        """ Save cached fitness values to 'filename', if not None """
+        if self.filename is None:
+            return
+        if self.verbose:
+            print("Saving", len(self._data), "cached fitness values to:",
+                  self.filename)
+        with open(self.filename, 'wb') as f:
+            pickle.dump({
+                "key": self.key,
+                "data": list(self._data.items())
+            },
+                        f,
+                        protocol=2)
+
+    def get(self, indiv):
+        """ Return cached fitness values of an individual, or None """
+        k = self.packed(indiv)
+        fitness = self._data.get(k)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(k)
+        self.hits += 1
+        return fitness
+
+    def set(self, indiv, fitness):
+        """ Cache the fitness values of an individual """
+        if self.maxsize <= 0:
+            return
+        k = self.packed(indiv)
+        self._data[k] = tuple(fitness)
+        self._data.move_to_end(k)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def cached_map(toolbox, cache, map=map):
+    """
+  Returns a 'map' function that uses a FitnessCache for 'toolbox.evaluate'.
+
+  The returned function, f(func, iterable), looks up each individual in the
+  cache if 'func' is 'toolbox.evaluate', evaluates only the individuals not
+  found using 'map(func, missing)', and caches the results. For all other
+  functions it returns list(map(func, iterable)).
+
+  Arguments
+  ---------
+
+    toolbox: deap.base.Toolbox
+      Contains methods used by deap during evolution. Expected to contain:
+
+        toolbox.evaluate(indiv): To evaluate an individual's fitness
+
+    cache: casm.learn.evolve.FitnessCache
+      The fitness cache
+
+    map: func, optional, default=map
+      The map function used to evaluate individuals not in the cache.
+
+  Returns
+  -------
+
+    f: func
+      A function with signature 'results = f(func, iterable)'.
+
+  """
+    def _map(func, iterable):
+        if func is not getattr(toolbox, "evaluate", None):
+            return list(map(func, iterable))
+        pop = list(iterable)
+        fitnesses = [cache.get(indiv) for indiv in pop]
+        missing = [i for i, fit in enumerate(fitnesses) if fit is None]
+        for i, fit in zip(missing, map(func, [pop[i] for i in missing])):
+            cache.set(pop[i], fit)
+            fitnesses[i] = fit
+        return fitnesses
+
+    return _map
+
+
+def cache_stats(stats, cache):
+    """
+  Returns a copy of 'stats' that also logs the cache hits and misses.
+
+  Arguments
+  ---------
+
+    stats: deap.tools.Statistics or deap.tools.MultiStatistics
+      The statistics to be logged.
+
+    cache: casm.learn.evolve.FitnessCache
+      The fitness cache
+
+  Returns
+  -------
+    stats: deap.tools.Statistics or deap.tools.MultiStatistics
+      The statistics to be logged. For Statistics, "cache_hits" and
+      "cache_misses" are added. For MultiStatistics, the "cache" chapter is
+      added, with "hits" and "misses".
+
+  """
+    hits = lambda values: cache.hits
+    misses = lambda values: cache.misses
+    if stats is None:
+        stats = deap.tools.Statistics()
+    else:
+        stats = copy.deepcopy(stats)
+    if isinstance(stats, deap.tools.MultiStatistics):
+        counters = deap.tools.Statistics()
+        counters.register("hits", hits)
+        counters.register("misses", misses)
+        stats["cache"] = counters
+    else:
+        stats.register("cache_hits", hits)
+        stats.register("cache_misses", misses)
+    return stats
+
+
 def evaluate_all(pop, toolbox):
     """
   Evaluate and set fitness of all individual's with invalid fitness.
@@ -307,6 +560,248 @@ def evaluate_all(pop, toolbox):
     return len(invalid_ind)
 
 
+def population_map(toolbox, evaluate_population, map=map):
+    """
+  Returns a 'map' function that evaluates a whole population at once.
+
+  The returned function, f(func, iterable), returns
+  evaluate_population(list(iterable)) if 'func' is 'toolbox.evaluate', and
+  list(map(func, iterable)) otherwise. Registered as 'toolbox.map', this lets
+  evaluate_all, best_child, and deap.algorithms.eaSimple score populations in
+  batches without any other changes.
+
+  Arguments
+  ---------
+
+    toolbox: deap.base.Toolbox
+      Contains methods used by deap during evolution. Expected to contain:
+
+        toolbox.evaluate(indiv): To evaluate an individual's fitness
+
+    evaluate_population: func
+      A function with signature 'fitnesses = func(List[individual])', returning
+      the same values as '[toolbox.evaluate(indiv) for indiv in population]'.
+
+    map: func, optional, default=map
+      The map function used for all other functions.
+
+  Returns
+  -------
+
+    f: func
+      A function with signature 'results = f(func, iterable)'.
+
+  """
+    def _map(func, iterable):
+        if func is getattr(toolbox, "evaluate", None):
+            return evaluate_population(list(iterable))
+        return list(map(func, iterable))
+
+    return _map
+
+
+class _SharedArray(object):
+    """ Placeholder for an array that workers load from a memory-mapped .npy file """
+    def __init__(self, filename):
+        self.filename = filename
+
+
+_worker_evaluate = None
+
+
+def _init_worker(func, args, keywords):
+    """ Construct the worker's evaluate function, attaching to shared arrays """
+    global _worker_evaluate
+    load = lambda v: np.load(v.filename, mmap_mode='r') \
+        if isinstance(v, _SharedArray) else v
+    args = [load(v) for v in args]
+    keywords = dict((k, load(v)) for k, v in six.iteritems(keywords))
+    _worker_evaluate = partial(func, *args, **keywords)
+
+
+def _evaluate_in_worker(indiv):
+    return _worker_evaluate(indiv)
+
+
+class ProcessPoolMap(object):
+    """
+  A 'map' function that evaluates individuals in a pool of worker processes.
+
+  'toolbox.evaluate' must be a functools.partial, such as
+  partial(casm.learn.model_selection.cross_val_score, estimator, X, y=y, ...).
+  Any of its bound arguments that are the arrays 'X' or 'y' are saved once to
+  .npy files in a temporary directory, and each worker loads them with
+  mmap_mode='r', so that the training data is shared by the workers rather than
+  pickled with every task. Only the individuals and fitness values are sent
+  between processes.
+
+  Results are returned in the order of the input individuals, so results do
+  not depend on the number of workers.
+
+  Attributes
+  ----------
+
+    n_jobs: int
+      Number of worker processes.
+
+    chunksize: int or None
+      Number of individuals sent to a worker at a time. If None, chosen by
+      multiprocessing.Pool.map.
+
+  """
+    def __init__(self, toolbox, X, y, n_jobs=-1, chunksize=None, map=map):
+        """
+    Arguments
+    ---------
+
+      toolbox: deap.base.Toolbox
+        Contains methods used by deap during evolution. Expected to contain:
+
+          toolbox.evaluate(indiv): To evaluate an individual's fitness
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+
+      n_jobs: int, optional, default=-1
+        Number of worker processes. If -1, use the number of CPUs.
+
+      chunksize: int, optional, default=None
+        Number of individuals sent to a worker at a time. If None, chosen by
+        multiprocessing.Pool.map.
+
+      map: func, optional, default=map
+        The map function used for functions other than 'toolbox.evaluate'.
+
+    """
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = multiprocessing.cpu_count()
+        self.n_jobs = n_jobs
+        self.chunksize = chunksize
+        self.toolbox = toolbox
+        self._map = map
+
+        evaluate = toolbox.evaluate
+        if not isinstance(evaluate, partial):
+            raise Exception(
+                "Error in ProcessPoolMap: toolbox.evaluate is not a functools.partial"
+            )
+
+        self._tmpdir = tempfile.mkdtemp(prefix="casm_learn_")
+        shared = []
+        for name, arr in [("X", X), ("y", y)]:
+            filename = os.path.join(self._tmpdir, name + ".npy")
+            np.save(filename, np.asarray(arr))
+            shared.append((arr, _SharedArray(filename)))
+
+        def share(v):
+            for arr, s in shared:
+                if v is arr:
+                    return s
+            return v
+
+        args = [share(v) for v in evaluate.args]
+        keywords = dict(
+            (k, share(v)) for k, v in six.iteritems(evaluate.keywords or {}))
+
+        self._evaluate = evaluate
+        self._pool = multiprocessing.Pool(self.n_jobs,
+                                          initializer=_init_worker,
+                                          initargs=(evaluate.func, args,
+                                                    keywords))
+
+    def __call__(self, func, iterable):
+        if func is not self._evaluate or self._pool is None:
+            return list(self._map(func, iterable))
+        pop = [list(indiv) for indiv in iterable]
+        if len(pop) == 0:
+            return []
+        return self._pool.map(_evaluate_in_worker, pop, self.chunksize)
+
+    def close(self):
+        """ Stop the worker processes and remove the shared data files """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+
+def evaluate_children(parent, offspring, toolbox):
+    """
+  Evaluate and set fitness of all children with invalid fitness.
+
+  If the toolbox provides 'evaluate_neighborhood', children that differ from
+  the parent by exactly one feature are scored all at once from the parent,
+  and only the remaining children are evaluated with 'toolbox.evaluate'.
+
+  Arguments
+  ---------
+
+    parent: List[bool] of length n_features
+      This is a boolean list of shape [n_features], in which an element is True
+      iff its corresponding feature is selected for retention.
+
+    offspring: iterable of individual
+      Children of parent to be evaluated
+
+    toolbox: deap.base.Toolbox
+      Contains methods used by deap during evolution. Expected to contain:
+
+        toolbox.evaluate(indiv): To evaluate an individual's fitness
+
+        toolbox.map(func, List[individual]): To map function executions
+
+      And optionally:
+
+        toolbox.evaluate_neighborhood(parent): Returns an array, of length
+          n_features, of the fitness of the child with feature 'j' flipped
+
+        toolbox.lookup_fitness(indiv): Returns cached fitness values or None
+
+        toolbox.store_fitness(indiv, fitness): Caches fitness values
+
+  Returns
+  -------
+
+    nevals: int
+      Number of evaluations performed
+
+  """
+    if not hasattr(toolbox, "evaluate_neighborhood"):
+        return evaluate_all(offspring, toolbox)
+
+    invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+    if len(invalid_ind) == 0:
+        return 0
+
+    lookup = getattr(toolbox, "lookup_fitness", None)
+    store = getattr(toolbox, "store_fitness", None)
+
+    mask = np.asarray(parent, dtype=bool)
+    scores = None
+    remaining = []
+    for ind in invalid_ind:
+        flipped = np.where(np.asarray(ind, dtype=bool) != mask)[0]
+        if len(flipped) == 1:
+            fit = lookup(ind) if lookup is not None else None
+            if fit is None:
+                if scores is None:
+                    scores = toolbox.evaluate_neighborhood(parent)
+                fit = (float(scores[flipped[0]]), )
+                if store is not None:
+                    store(ind, fit)
+            ind.fitness.values = fit
+        else:
+            remaining.append(ind)
+    evaluate_all(remaining, toolbox)
+    return len(invalid_ind)
+
+
 class EvolutionaryParams(object):
     """
   Holds parameters used by evolutionary algorithms.
@@ -529,6 +1024,9 @@ def best_child(indiv, toolbox):
 
         toolbox.map(func, List[individual]): To map function executions
 
+      And optionally, toolbox.evaluate_neighborhood(parent). See
+      'evaluate_children'.
+
   Returns
   -------
 
@@ -542,7 +1040,7 @@ def best_child(indiv, toolbox):
   """
     # generate children
     offspring = toolbox.children(indiv)
-    nevals = evaluate_all(offspring, toolbox)
+    nevals = evaluate_children(indiv, offspring, toolbox)
     return max(offspring, key=lambda child: child.fitness), nevals
 
 
@@ -571,6 +1069,9 @@ def eaIndividualBestFirst(pop,
 
         toolbox.map(func, List[individual]): To map function executions
 
+      And optionally, toolbox.evaluate_neighborhood(parent). See
+      'evaluate_children'.
+
     n_generation: int, optional, default=10
       Number of generations to run.
 
@@ -673,6 +1174,9 @@ def eaPopulationBestFirst(pop,
 
         toolbox.map(func, List[individual]): To map function executions
 
+      And optionally, toolbox.evaluate_neighborhood(parent). See
+      'evaluate_children'.
+
     n_generation: int, optional, default=10
       Number of generations between saving the hall of fame. Note, this only
       controls how often the hall of fame is saved. Minimization continues until
@@ -739,7 +1243,7 @@ def eaPopulationBestFirst(pop,
 
         # generate children
         offspring = toolbox.children(next_parent)
-        nevals = evaluate_all(offspring, toolbox)
+        nevals = evaluate_children(next_parent, offspring, toolbox)
 
         # set offspring as non-parents
         for indiv in offspring:
@@ -773,6 +1277,8 @@ class EvolutionaryFeatureSelection(BaseEstimator, SelectorMixin):
                  alg_args=list(),
                  alg_kwargs=dict(),
                  stats=default_stats(),
+                 fitness_cache=None,
+                 n_jobs=1,
                  verbose=True):
 
         self.algorithm = algorithm
@@ -790,7 +1296,109 @@ class EvolutionaryFeatureSelection(BaseEstimator, SelectorMixin):
         self.verbose = verbose
 
         self.toolbox = deap.base.Toolbox()
+        self.fitness_cache = fitness_cache
+        if self.fitness_cache is not None:
+            stats = cache_stats(stats, self.fitness_cache)
         self.stats = stats
+        self.n_jobs = n_jobs
+        self._pool_map = None
+
+    def _register_loocv(self, X, y):
+        """
+    If the CV score is the LinearRegression LOOCV score, register faster
+    equivalent evaluation methods:
+
+      toolbox.evaluate_neighborhood: scores single-flip children incrementally,
+        see casm.learn.linear_model.SingleFlipLOOCV
+
+      toolbox.map: scores populations in batches from a shared Gram matrix,
+        see casm.learn.linear_model.PopulationLOOCV
+
+    Arguments
+    ---------
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+
+    Returns
+    -------
+
+      registered: bool
+        True if the faster evaluation methods were registered.
+    """
+        if not casm.learn.model_selection.is_LeaveOneOutForLLS(
+                self.estimator, self.cv, self.scoring, X.shape[0]):
+            return False
+
+        neighborhood = casm.learn.linear_model.SingleFlipLOOCV(
+            X, y, pinv=self.estimator.pinv, dtype=self.estimator.dtype)
+        self.toolbox.register(
+            "evaluate_neighborhood",
+            casm.learn.model_selection.single_flip_cross_val_score,
+            neighborhood,
+            penalty=self.penalty)
+
+        evaluator = casm.learn.linear_model.PopulationLOOCV(
+            X, y, pinv=self.estimator.pinv, dtype=self.estimator.dtype)
+        self.toolbox.register(
+            "map",
+            population_map(
+                self.toolbox,
+                partial(casm.learn.model_selection.population_cross_val_score,
+                        evaluator,
+                        penalty=self.penalty), self.toolbox.map))
+        return True
+
+    def _register_evaluation(self, X, y):
+        """
+    Register the toolbox 'map' function, and optional faster evaluation
+    methods, for the problem X*b = y.
+
+    If 'n_jobs' != 1, and the LinearRegression LOOCV batched evaluation does not
+    apply, individuals are evaluated in a pool of worker processes, see
+    casm.learn.evolve.ProcessPoolMap. Call '_close_evaluation' when done.
+
+    Arguments
+    ---------
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+    """
+        self._close_evaluation()
+        self.toolbox.register("map", map)
+        if not self._register_loocv(X, y) and self.n_jobs != 1:
+            self._pool_map = ProcessPoolMap(self.toolbox,
+                                            X,
+                                            y,
+                                            n_jobs=self.n_jobs)
+            if self.verbose:
+                print("# Evaluating fitness using", self._pool_map.n_jobs,
+                      "processes\n")
+            self.toolbox.register("map", self._pool_map)
+        if self.fitness_cache is not None:
+            self.fitness_cache.bind(X,
+                                    y,
+                                    estimator=self.estimator,
+                                    cv=self.cv,
+                                    scoring=self.scoring,
+                                    penalty=self.penalty)
+            self.toolbox.register(
+                "map",
+                cached_map(self.toolbox, self.fitness_cache, self.toolbox.map))
+            self.toolbox.register("lookup_fitness", self.fitness_cache.get)
+            self.toolbox.register("store_fitness", self.fitness_cache.set)
+
+    def _close_evaluation(self):
+        """ Stop worker processes, if any were started by '_register_evaluation' """
+        if self._pool_map is not None:
+            self._pool_map.close()
+            self._pool_map = None
 
     def _run(self):
         """
@@ -891,6 +1499,9 @@ class EvolutionaryFeatureSelection(BaseEstimator, SelectorMixin):
                             filename=self.evolve_params.halloffame_filename,
                             verbose=self.verbose)
 
+            if self.fitness_cache is not None:
+                self.fitness_cache.save()
+
         return self
 
     def _get_support_mask(self):
@@ -973,6 +1584,12 @@ class GeneticAlgorithm(EvolutionaryFeatureSelection):
     MutateProb: 1.9
       Probability of performing mutation.
 
+    fitness_cache: casm.learn.evolve.FitnessCache or None
+      Cache of fitness values used to avoid re-evaluating individuals.
+
+    n_jobs: int
+      Number of processes used to evaluate individuals.
+
     toolbox: deap.base.Toolbox
       Contains methods used by deap during evolution.
 
@@ -1001,6 +1618,8 @@ class GeneticAlgorithm(EvolutionaryFeatureSelection):
                  selTournamentSize=3,
                  cxUniformProb=0.5,
                  mutFlipBitProb=0.01,
+                 fitness_cache=None,
+                 n_jobs=1,
                  verbose=True):
         """
     Arguments
@@ -1041,6 +1660,14 @@ class GeneticAlgorithm(EvolutionaryFeatureSelection):
       mutFlipBitProb: float, optional, default=0.01
         Probability of mutating bits "constraints".
 
+      fitness_cache: casm.learn.evolve.FitnessCache, optional, default=None
+        If not None, cache of fitness values used to avoid re-evaluating
+        individuals.
+
+      n_jobs: int, optional, default=1
+        Number of processes used to evaluate individuals. If -1, use the number
+        of CPUs.
+
       verbose: boolean, optional, default=True
         Print information to stdout.
 
@@ -1053,6 +1680,8 @@ class GeneticAlgorithm(EvolutionaryFeatureSelection):
                              penalty=penalty,
                              evolve_params_kwargs=evolve_params_kwargs,
                              constraints_kwargs=constraints_kwargs,
+                             fitness_cache=fitness_cache,
+                             n_jobs=n_jobs,
                              verbose=verbose,
                              alg_args=[
                                  attrgetter("pop"),
@@ -1129,7 +1758,11 @@ class GeneticAlgorithm(EvolutionaryFeatureSelection):
                               cv=self.cv,
                               penalty=self.penalty)
 
-        return self._run()
+        self._register_evaluation(X, y)
+        try:
+            return self._run()
+        finally:
+            self._close_evaluation()
 
 
 class IndividualBestFirst(EvolutionaryFeatureSelection):
@@ -1171,6 +1804,12 @@ class IndividualBestFirst(EvolutionaryFeatureSelection):
     children: func
       A function with signature 'offspring = func(indiv)'.
 
+    fitness_cache: casm.learn.evolve.FitnessCache or None
+      Cache of fitness values used to avoid re-evaluating individuals.
+
+    n_jobs: int
+      Number of processes used to evaluate individuals.
+
     toolbox: deap.base.Toolbox
       Contains methods used by deap during evolution.
 
@@ -1194,6 +1833,8 @@ class IndividualBestFirst(EvolutionaryFeatureSelection):
                  evolve_params_kwargs=dict(),
                  constraints_kwargs=dict(),
                  children=single_flip_children,
+                 fitness_cache=None,
+                 n_jobs=1,
                  verbose=True):
         """
     Arguments
@@ -1226,6 +1867,14 @@ class IndividualBestFirst(EvolutionaryFeatureSelection):
       children: func, optional, default=single_flip_children
         A function with signature 'offspring = func(indiv)'.
 
+      fitness_cache: casm.learn.evolve.FitnessCache, optional, default=None
+        If not None, cache of fitness values used to avoid re-evaluating
+        individuals.
+
+      n_jobs: int, optional, default=1
+        Number of processes used to evaluate individuals. If -1, use the number
+        of CPUs.
+
       verbose: boolean, optional, default=True
         Print information to stdout.
 
@@ -1246,6 +1895,8 @@ class IndividualBestFirst(EvolutionaryFeatureSelection):
                              penalty=penalty,
                              evolve_params_kwargs=evolve_params_kwargs,
                              constraints_kwargs=constraints_kwargs,
+                             fitness_cache=fitness_cache,
+                             n_jobs=n_jobs,
                              verbose=verbose,
                              alg_args=[
                                  attrgetter("pop"),
@@ -1301,7 +1952,11 @@ class IndividualBestFirst(EvolutionaryFeatureSelection):
                               cv=self.cv,
                               penalty=self.penalty)
 
-        return self._run()
+        self._register_evaluation(X, y)
+        try:
+            return self._run()
+        finally:
+            self._close_evaluation()
 
 
 class PopulationBestFirst(EvolutionaryFeatureSelection):
@@ -1346,6 +2001,12 @@ class PopulationBestFirst(EvolutionaryFeatureSelection):
     children: func
       A function with signature 'offspring = func(indiv)'.
 
+    fitness_cache: casm.learn.evolve.FitnessCache or None
+      Cache of fitness values used to avoid re-evaluating individuals.
+
+    n_jobs: int
+      Number of processes used to evaluate individuals.
+
     toolbox: deap.base.Toolbox
       Contains methods used by deap during evolution.
 
@@ -1369,6 +2030,8 @@ class PopulationBestFirst(EvolutionaryFeatureSelection):
                  evolve_params_kwargs=dict(),
                  constraints_kwargs=dict(),
                  children=single_flip_children,
+                 fitness_cache=None,
+                 n_jobs=1,
                  verbose=True):
         """
     Arguments
@@ -1401,6 +2064,14 @@ class PopulationBestFirst(EvolutionaryFeatureSelection):
       children: func, optional, default=single_flip_children
         A function with signature 'offspring = func(indiv)'.
 
+      fitness_cache: casm.learn.evolve.FitnessCache, optional, default=None
+        If not None, cache of fitness values used to avoid re-evaluating
+        individuals.
+
+      n_jobs: int, optional, default=1
+        Number of processes used to evaluate individuals. If -1, use the number
+        of CPUs.
+
       verbose: boolean, optional, default=True
         Print information to stdout.
 
@@ -1420,6 +2091,8 @@ class PopulationBestFirst(EvolutionaryFeatureSelection):
                              penalty=penalty,
                              evolve_params_kwargs=evolve_params_kwargs,
                              constraints_kwargs=constraints_kwargs,
+                             fitness_cache=fitness_cache,
+                             n_jobs=n_jobs,
                              verbose=verbose,
                              alg_args=[
                                  attrgetter("pop"),
@@ -1475,4 +2148,8 @@ class PopulationBestFirst(EvolutionaryFeatureSelection):
                               cv=self.cv,
                               penalty=self.penalty)
 
-        return self._run()
+        self._register_evaluation(X, y)
+        try:
+            return self._run()
+        finally:
+            self._close_evaluation()
@@ -14,6 +14,7 @@ import sklearn.metrics
 import random, re, time, os, types, json, pickle, copy, uuid, shutil, tempfile
 import numpy as np
 import pandas
+import scipy.sparse
 import six
 
 if six.PY2:
@@ -24,6 +25,7 @@ else:
 from math import sqrt
 from os.path import splitext, basename, join
 
+import casm.learn.hull
 import casm.learn.linear_model
 import casm.learn.tools
 import casm.learn.selection_wrapper
@@ -529,6 +531,9 @@ def print_input_help():
   #   a numpy array called 'w':
   #     W = np.diag(w)*Nvalue/np.sum(w)
   #
+  #   In this case L = np.diag(np.sqrt(np.diag(W))), and the weights are applied
+  #   by scaling each row of X and y, without forming W or doing the SVD.
+  #
   #   If the 'custom2d' method is used, the input W_in must by Hermitian,
   #   positive-definite and is normalized by:
   #     W = W_in*Nvalue/np.sum(W_in)
@@ -611,6 +616,12 @@ def print_input_help():
   #
   #       LOOCV = np.mean(((y - y_pred)/(1.0 - np.diag(H)))**2)
   #
+  #     With 'IndividualBestFirst' and 'PopulationBestFirst' feature selection,
+  #     the LOOCV scores of all children that differ from a parent by one basis
+  #     function are then calculated at once by rank-one updates of the parent's
+  #     solution. With the evolutionary feature selection methods, populations
+  #     are scored in batches that share the Gram matrix X.transpose().dot(X).
+  #
   # kwargs: dict or null, optional, default=dict()
   #   Additional parameters to be used to construct the cross-validation method
   #   constructor.
@@ -629,11 +640,17 @@ def print_input_help():
 
   # The "problem_specs"/"specs_filename" option:
   #
-  # Optional. Name to use for file storing the training data and CV train/test
-  # sets. The default is determined from the input filename, for example,
-  # 'my_input_specs.pkl' is used if the input file is named 'my_input.json'.
+  # Optional. Name to use for the directory storing the training data and CV
+  # train/test sets. The default is determined from the input filename, for
+  # example, 'my_input_specs' is used if the input file is named 'my_input.json'.
+  #
+  # The directory holds the data arrays as .npy files, which are memory-mapped
+  # when read, and a 'manifest.json' file with the "problem_specs" settings.
+  # Pickle files ('my_input_specs.pkl') written by previous versions are still
+  # read if they exist. If the name ends in '.pkl' and no such file exists, the
+  # directory is named without the '.pkl' extension.
 
-      "specs_filename": "problem_specs.pkl"
+      "specs_filename": "problem_specs"
 
     },
 
@@ -662,6 +679,16 @@ def print_input_help():
   #     "pinv": bool, optional, default=True
   #       If True, use the pseudo-inverse via np.linalg.pinv; else use np.linalg.inv.
   #
+  #     "hat_matrix": bool, optional, default=True
+  #       If True, construct the full hat matrix H, of shape (n_samples, n_samples).
+  #       If False, only the diagonal of H is calculated, using a thin SVD
+  #       (pinv=True) or QR (pinv=False) factorization of X, so that memory
+  #       scales linearly with the number of training samples. Recommended for
+  #       large training sets.
+  #
+  #     "dtype": str, optional, default="float64"
+  #       Floating point type used for fitting, "float64" or "float32".
+  #
   #   Options for other methods:
   #     Any options to pass to the estimator construtor.
   #
@@ -866,6 +893,36 @@ def print_input_help():
   #        extension. For example, if input file is named "Ef_kfold10.json", then
   #        "Ef_kfold10_population_begin.pkl", "Ef_kfold10_population_end.pkl", and
   #        "Ef_kfold10_evolve_halloffame.pkl" are used.
+  #
+  #
+  #   The evolutionary algorithms share an optional "fitness_cache" parameter
+  #   that controls caching of CV scores, so that individuals regenerated by
+  #   mutation, crossover, or overlapping best-first children are not fit again.
+  #   Cached scores are only reused for identical training data, weights, cv
+  #   train/test sets, estimator, and penalty.
+  #
+  #   Options for "fitness_cache":
+  #
+  #     "maxsize": int, optional, default=100000
+  #        Maximum number of cached CV scores. Use 0 to disable the cache.
+  #
+  #     "persist": bool, optional, default=False
+  #        If true, save cached CV scores after each repetition and reuse them
+  #        in later 'casm-learn' runs.
+  #
+  #     "filename": string, optional
+  #        File where cached CV scores are saved. Default is determined from the
+  #        problem specs filename. For example, if "specs_filename" is
+  #        "Ef_kfold10_specs", then "Ef_kfold10_fitness_cache.pkl" is used.
+  #
+  #   The evolutionary algorithms also share an optional "n_jobs" parameter:
+  #
+  #     "n_jobs": int, optional, default=1
+  #        Number of processes used to evaluate CV scores. Use -1 to use all
+  #        CPUs. The training data is shared with the worker processes through
+  #        memory-mapped files, and results do not depend on "n_jobs". Not used
+  #        for LinearRegression with LeaveOneOut, which is already evaluated in
+  #        batches.
 
     "feature_selection" : {
       "method": "GeneticAlgorithm",
@@ -1091,7 +1148,7 @@ def set_input_defaults(input, input_filename=None):
 
     if "specs_filename" not in specs:
         specs["specs_filename"] = default_filename(
-            specs["problem_specs_prefix"], "problem_specs.pkl", "_specs.pkl")
+            specs["problem_specs_prefix"], "problem_specs", "_specs")
 
     # set data defaults if not provided
     if "data" not in specs:
@@ -1219,11 +1276,13 @@ class FittingData(object):
     n_features: int
       The number of features (number of columns in X)
 
-    W: array-like of shape: (n_samples, n_samples)
-      Contains sample weights.
+    W: array-like or scipy.sparse.dia_matrix of shape: (n_samples, n_samples)
+      Contains sample weights. Stored as a sparse diagonal matrix unless
+      sample_weight is 2-dimensional.
 
-    L: array-like of shape: (n_samples, n_samples)
-      Used to generate weighted_X and weighted_y, W = L * L.transpose().
+    L: array-like or scipy.sparse.dia_matrix of shape: (n_samples, n_samples)
+      Used to generate weighted_X and weighted_y, W = L * L.transpose(). Stored
+      as a sparse diagonal matrix unless sample_weight is 2-dimensional.
 
     weighted_X: array-like of shape: (n_samples, n_features)
       Weighted training input data, weighted_X = L*x.
@@ -1244,6 +1303,9 @@ class FittingData(object):
         added. No checks are made for consistency of tdata.X, tdata.y and X and
         y or other parameters.
 
+    weighted_columns: List[str], optional
+        Names of the weighted_X and weighted_y columns added to 'data'.
+
   """
     def __init__(self,
                  X,
@@ -1312,11 +1374,200 @@ class FittingData(object):
         # data
         if tdata is not None:
             self.data = tdata.data.copy()
+            self.weighted_columns = []
             for i in range(self.n_features):
-                self.data.loc[:, "weighted_" + tdata.X_name + "(" + str(i) +
-                              ")"] = self.weighted_X[:, i]
-            for i in range(self.n_features):
-                self.data.loc[:, "weighted_" + tdata.y_name] = self.weighted_y
+                name = "weighted_" + tdata.X_name + "(" + str(i) + ")"
+                self.data.loc[:, name] = self.weighted_X[:, i]
+                self.weighted_columns.append(name)
+            self.data.loc[:, "weighted_" + tdata.y_name] = self.weighted_y
+            self.weighted_columns.append("weighted_" + tdata.y_name)
+
+    def __getattr__(self, name):
+        # 'data' is read on first use when opened by open_fitting_data
+        if name == "data" and "data_filename" in self.__dict__:
+            data = pandas.read_pickle(self.data_filename)
+            for col, i in zip(self.weighted_columns[:-1],
+                              range(self.n_features)):
+                data.loc[:, col] = self.weighted_X[:, i]
+            data.loc[:, self.weighted_columns[-1]] = self.weighted_y
+            self.data = data
+            return data
+        raise AttributeError(name)
+
+
+FITTING_DATA_FORMAT = "casm-learn-problem-specs"
+FITTING_DATA_VERSION = 1
+
+
+def save_fitting_data(fdata, path, verbose=False):
+    """
+  Save FittingData as a problem specs directory.
+
+  The directory contains:
+
+    manifest.json: The format version, the "problem_specs" input settings,
+      the problem dimensions, and the names of the other files.
+
+    X.npy, y.npy, weighted_X.npy, weighted_y.npy: The training data arrays.
+
+    sample_weight.npy: If sample weights were used.
+
+    w.npy, or W.npy and L.npy: The diagonal of W if the weights are diagonal, or
+      W and L if 2-dimensional sample weights were used.
+
+    objects.pkl: The cv train/test sets and scoring metric.
+
+    data.pkl: The training data as a pandas.DataFrame, excluding the weighted
+      data columns, if FittingData.data exists.
+
+  The directory is written under a temporary name and then moved to 'path', so
+  that concurrent readers never see a partially written directory.
+
+  Arguments
+  ---------
+
+    fdata: casm.learn.FittingData
+      The problem data to save
+
+    path: string
+      Name of the problem specs directory
+
+    verbose: boolean, optional, default=False
+      Print information to stdout.
+
+  """
+    path = os.path.abspath(path)
+    tmpdir = tempfile.mkdtemp(prefix=basename(path) + ".tmp",
+                              dir=os.path.dirname(path))
+
+    arrays = {
+        "X": fdata.X,
+        "y": fdata.y,
+        "weighted_X": fdata.weighted_X,
+        "weighted_y": fdata.weighted_y
+    }
+    sample_weight = getattr(fdata, "sample_weight", None)
+    if sample_weight is not None and len(sample_weight):
+        arrays["sample_weight"] = sample_weight
+    if scipy.sparse.issparse(fdata.W):
+        weight = "diagonal"
+        arrays["w"] = fdata.W.diagonal()
+    else:
+        weight = "dense"
+        arrays["W"] = fdata.W
+        arrays["L"] = fdata.L
+
+    manifest = {
+        "format": FITTING_DATA_FORMAT,
+        "version": FITTING_DATA_VERSION,
+        "problem_specs": fdata.input["problem_specs"],
+        "n_samples": int(fdata.n_samples),
+        "n_features": int(fdata.n_features),
+        "penalty": fdata.penalty,
+        "weight": weight,
+        "arrays": dict()
+    }
+    for name, arr in six.iteritems(arrays):
+        manifest["arrays"][name] = name + ".npy"
+        np.save(join(tmpdir, name + ".npy"), np.asarray(arr))
+
+    with open(join(tmpdir, "objects.pkl"), 'wb') as f:
+        pickle.dump({"cv": fdata.cv, "scoring": fdata.scoring}, f, protocol=2)
+
+    if hasattr(fdata, "data"):
+        weighted_columns = getattr(fdata, "weighted_columns", [])
+        data = fdata.data.drop(columns=weighted_columns)
+        data.to_pickle(join(tmpdir, "data.pkl"))
+        manifest["data"] = "data.pkl"
+        manifest["weighted_columns"] = weighted_columns
+
+    with open(join(tmpdir, "manifest.json"), 'w') as f:
+        f.write(six.u(json.dumps(manifest, indent=2)))
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    os.rename(tmpdir, path)
+
+    if verbose:
+        print("# Wrote problem specs to:", path)
+
+
+def open_fitting_data(path, mmap_mode='r', verbose=False):
+    """
+  Open FittingData from a problem specs directory, or a pickle file as written
+  by previous versions of 'casm-learn'.
+
+  Arrays are opened using numpy.load(..., mmap_mode=mmap_mode), so that opening
+  is fast and concurrent runs share the pages of the data files. FittingData.data
+  is only read if it is used.
+
+  Arguments
+  ---------
+
+    path: string
+      Name of the problem specs directory, or pickle file.
+
+    mmap_mode: None or string, optional, default='r'
+      Passed to numpy.load. Use None to read arrays into memory.
+
+    verbose: boolean, optional, default=False
+      Print information to stdout.
+
+  Returns
+  -------
+
+    fdata: casm.learn.FittingData
+      The problem data
+
+  """
+    if os.path.isfile(path):
+        if verbose:
+            print("# Reading pickled problem specs:", path)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    with open(join(path, "manifest.json"), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FITTING_DATA_FORMAT:
+        raise Exception("Error in open_fitting_data: '" + path +
+                        "' is not a problem specs directory")
+    if manifest["version"] > FITTING_DATA_VERSION:
+        raise Exception("Error in open_fitting_data: '" + path +
+                        "' has format version " + str(manifest["version"]) +
+                        ", this version of casm-learn reads up to version " +
+                        str(FITTING_DATA_VERSION))
+
+    arrays = dict()
+    for name, filename in six.iteritems(manifest["arrays"]):
+        arrays[name] = np.load(join(path, filename), mmap_mode=mmap_mode)
+
+    with open(join(path, "objects.pkl"), 'rb') as f:
+        objects = pickle.load(f)
+
+    fdata = FittingData.__new__(FittingData)
+    fdata.X = arrays["X"]
+    fdata.y = arrays["y"]
+    fdata.n_samples = manifest["n_samples"]
+    fdata.n_features = manifest["n_features"]
+    fdata.sample_weight = arrays.get("sample_weight")
+    fdata.weighted_X = arrays["weighted_X"]
+    fdata.weighted_y = arrays["weighted_y"]
+    if manifest["weight"] == "diagonal":
+        fdata.W = scipy.sparse.diags(arrays["w"], format='dia')
+        fdata.L = scipy.sparse.diags(np.sqrt(arrays["w"]), format='dia')
+    else:
+        fdata.W = arrays["W"]
+        fdata.L = arrays["L"]
+    fdata.cv = objects["cv"]
+    fdata.scoring = objects["scoring"]
+    fdata.penalty = manifest["penalty"]
+    fdata.input = {"problem_specs": manifest["problem_specs"]}
+    if "data" in manifest:
+        fdata.data_filename = join(path, manifest["data"])
+        fdata.weighted_columns = manifest["weighted_columns"]
+    return fdata
 
 
 class TrainingData(object):
@@ -1519,7 +1770,7 @@ def read_sample_weight(input, tdata, verbose=True):
 
 def make_fitting_data(input, save=True, verbose=True, read_existing=True):
     """
-  Construct a FittingData instance, either by reading existing 'fit_data.pkl',
+  Construct a FittingData instance, either by reading existing problem specs,
   or from an input settings.
 
   Arguments
@@ -1529,17 +1780,21 @@ def make_fitting_data(input, save=True, verbose=True, read_existing=True):
       The input settings as a dict
 
     save: boolean, optional, default=True
-      Save a pickle file containing the training data and scoring metric. The file
-      name is specified by input["problem_specs"]["specs_filename"].  See/use
-      set_input_defaults for default values.
+      Save a problem specs directory containing the training data and scoring
+      metric, see save_fitting_data. The directory name is specified by
+      input["problem_specs"]["specs_filename"], without any '.pkl' extension.
+      See/use set_input_defaults for default values.
 
     verbose: boolean, optional, default=True
       Print information to stdout.
 
     read_existing: boolean, optional, default=True
-      If it exists, read the pickle file containing the training data and scoring
-      metric. The file name, which can be specified by input["fit_data_filename"],
-      defaults to "fit_data.pkl".
+      If it exists, read the problem specs directory, or pickle file written by
+      previous versions, specified by input["problem_specs"]["specs_filename"].
+      If "specs_filename" is a directory name, and a pickle file with the same
+      name plus '.pkl' exists, it is read instead. If "specs_filename" ends in
+      '.pkl' and does not exist, the directory with the same name minus '.pkl'
+      is read. See open_fitting_data.
 
 
   Returns
@@ -1557,17 +1812,25 @@ def make_fitting_data(input, save=True, verbose=True, read_existing=True):
     # property, weight, and cv inputs should remain constant
     # estimator and feature_selection might change
     fit_data_filename = specs["specs_filename"]
-
-    if read_existing and os.path.exists(fit_data_filename):
+    if fit_data_filename.endswith(
+            ".pkl") and not os.path.exists(fit_data_filename):
+        # a pickle file name, as used by previous versions
+        fit_data_filename = fit_data_filename[:-len(".pkl")]
+    existing_filename = fit_data_filename
+    if not os.path.exists(existing_filename) and os.path.isfile(
+            existing_filename + ".pkl"):
+        existing_filename += ".pkl"
+
+    if read_existing and os.path.exists(existing_filename):
         if verbose:
-            print("# Reading existing problem specs from:", fit_data_filename)
-        fdata = pickle.load(open(fit_data_filename, 'rb'))
+            print("# Reading existing problem specs from:", existing_filename)
+        fdata = open_fitting_data(existing_filename)
         if verbose:
             print("#   DONE\n")
 
         s = "Problem specifications have changed.\n\n" + \
             "To proceed with the existing specs adjust your input settings \"problem_specs\" to match.\n" + \
-            "To proceed with the new specs run in a new directory or delete '" + fit_data_filename + "'."
+            "To proceed with the new specs run in a new directory or delete '" + existing_filename + "'."
 
         def check_input(name):
             if fdata.input["problem_specs"][name] != specs[name]:
@@ -1628,8 +1891,7 @@ def make_fitting_data(input, save=True, verbose=True, read_existing=True):
         fdata.input["problem_specs"] = specs
 
         if save == True:
-            with open(fit_data_filename, 'wb') as f:
-                pickle.dump(fdata, f, protocol=2)
+            save_fitting_data(fdata, fit_data_filename)
 
         if verbose:
             print("# Writing problem specs to:", fit_data_filename)
@@ -1690,6 +1952,64 @@ def make_estimator(input, verbose=True):
     return estimator
 
 
+def make_fitness_cache(input, verbose=True):
+    """
+  Construct fitness cache for evolutionary feature selection from input
+  settings.
+
+  Uses input["feature_selection"]["kwargs"]["fitness_cache"], with options:
+
+    maxsize: int, optional, default=100000
+      Maximum number of cached fitness values. Use 0 to disable the cache.
+
+    persist: bool, optional, default=False
+      If True, save the cache to 'filename' and reuse it in later runs with
+      the same problem specs and estimator.
+
+    filename: str, optional
+      Default is determined from the problem specs filename, for example,
+      'my_input_fitness_cache.pkl' is used if the problem specs filename is
+      'my_input_specs'.
+
+  Arguments
+  ---------
+
+    input: dict
+      The input settings as a dict
+
+    verbose: boolean, optional, default=True
+      Print information to stdout.
+
+
+  Returns
+  -------
+
+    fitness_cache: casm.learn.evolve.FitnessCache or None
+      The fitness cache, or None if disabled.
+
+  """
+    opt = copy.deepcopy(input["feature_selection"]["kwargs"].get(
+        "fitness_cache", dict()))
+    if opt is None:
+        opt = dict()
+
+    maxsize = opt.get("maxsize", 100000)
+    if maxsize <= 0:
+        return None
+
+    filename = None
+    if opt.get("persist", False):
+        specs_filename = input["problem_specs"]["specs_filename"]
+        default = splitext(specs_filename)[0]
+        if default.endswith("_specs"):
+            default = default[:-len("_specs")]
+        filename = opt.get("filename", default + "_fitness_cache.pkl")
+
+    return casm.learn.evolve.FitnessCache(maxsize=maxsize,
+                                          filename=filename,
+                                          verbose=verbose)
+
+
 def make_selector(input,
                   estimator,
                   scoring=None,
@@ -1774,6 +2094,8 @@ def make_selector(input,
         kwargs["penalty"] = penalty
     if "verbose" in sig.parameters:
         kwargs["verbose"] = verbose
+    if "fitness_cache" in sig.parameters:
+        kwargs["fitness_cache"] = make_fitness_cache(input, verbose=verbose)
 
     selector = selector_method(estimator, **kwargs)
 
@@ -1955,8 +2277,12 @@ def checkhull(input, hall, indices=None, verbose=True):
           provides all the ranges for which the RMSE is requested.
 
         composition: str, optional, default="atom_frac"
-          Composition argument use for 'casm query' properties 'hull_dist' and
-          'clex_hull_dist'. For thermodynamic ground states, use "atom_frac".
+          Composition used to construct convex hulls, as for the 'casm query'
+          properties 'hull_dist' and 'clex_hull_dist'. For thermodynamic ground
+          states, use "atom_frac", for which hulls are constructed using atom
+          fractions and formation energy per atom. If "comp", hulls are
+          constructed using parametric composition and formation energy per
+          unitcell.
 
         hull_tol: number, optional, default=proj.settings.data["lin_alg_tol"]
           Tolerance used for identify hull states
@@ -2000,6 +2326,15 @@ def checkhull(input, hall, indices=None, verbose=True):
       Print information to stdout.
 
 
+  Notes
+  -----
+
+  Composition, formation energy, and correlations are queried once. Predicted
+  formation energies are calculated from the correlations and each individual's
+  ECI, and the DFT and predicted convex hulls are constructed using
+  casm.learn.hull, so the project's eci.json and selection files are not
+  modified.
+
   """
 
     # set checkhull default settings
@@ -2043,11 +2378,8 @@ def checkhull(input, hall, indices=None, verbose=True):
     bottom_tol = d["bottom_tol"]
     primitive_only = d["primitive_only"]
 
-    # save current default clex
-    orig_clex = proj.settings.default_clex
-    clex = copy.deepcopy(orig_clex)
-    all_eci = proj.dir.all_eci(clex.property, clex.calctype, clex.ref,
-                               clex.bset)
+    # default clex, used to check the property
+    clex = proj.settings.default_clex
 
     # not sure of all the edge cases, enforcing these seems simpler for now...
     if clex.name != "formation_energy":
@@ -2063,103 +2395,118 @@ def checkhull(input, hall, indices=None, verbose=True):
         raise Exception(
             "Error using checkhull: property must be 'formation_energy'")
 
+    if composition not in ["atom_frac", "comp"]:
+        raise Exception(
+            "Error using checkhull: composition must be 'atom_frac' or 'comp'")
+
     # load hull selection
     sel = Selection(proj, selection, all=False)
 
-    # create a temporary file containing the subset of the selection that is calculated
-    tmp_dir = join(proj.dir.casm_dir(), "tmp")
-    if not os.path.exists(tmp_dir):
-        os.mkdir(tmp_dir)
-    dft_selection = join(tmp_dir, selection + "_dft")
-    dft_hull_selection = join(tmp_dir, selection + "_dft_hull")
-    proj.capture("select -c " + selection +
-                 " --set-off 'not(is_calculated)' -f -o " + dft_selection)
-
     # properties to query
     selected = "selected"
     is_primitive = "is_primitive"
     is_calculated = "is_calculated"
     configname = "configname"
-    dft_hull_dist_long = "hull_dist(" + dft_selection + "," + composition + ")"
     dft_hull_dist = "dft_hull_dist"
-    clex_hull_dist_long = "clex_hull_dist(" + selection + "," + composition + ")"
     clex_hull_dist = "clex_hull_dist"
-    clex_dft_hull_dist_long = "clex_hull_dist(" + dft_hull_selection + "," + composition + ")"
     clex_dft_hull_dist = "clex_dft_hull_dist"
     comp = "comp"
+    comp_n = "comp_n"
+    corr = input["problem_specs"]["data"]["X"]
     dft_Eform = "formation_energy"
     clex_Eform = "clex(formation_energy)"
 
-    query_cols = [
-        comp, is_calculated, configname, dft_hull_dist_long, dft_Eform
-    ]
+    # the ECI independent properties are queried once, and the predicted
+    # formation energies and hull distances are calculated here
+    query_cols = [comp, is_calculated, configname, dft_Eform, corr]
+    if composition == "atom_frac":
+        query_cols.append(comp_n)
     if primitive_only:
         query_cols.append(is_primitive)
     sel.query(query_cols)
 
+    def columns(name):
+        cols = [
+            col for col in sel.data.columns
+            if re.match(re.escape(name) + r"\([0-9]*\)$", col)
+        ]
+        return sorted(cols, key=lambda col: int(col[len(name) + 1:-1]))
+
     compcol = []
     for col in sel.data.columns:
         if len(col) >= 5 and col[:5] == "comp(":
             compcol.append(col)
     compcol.sort()
+    corrcol = columns(corr)
+    comp_n_col = [
+        col for col in sel.data.columns if col.startswith(comp_n + "(")
+    ]
+
+    data = sel.data.drop(corrcol + comp_n_col, axis=1)
+    calculated = data.loc[:, is_calculated].values == 1
+    E_dft = pandas.to_numeric(data.loc[:, dft_Eform],
+                              errors='coerce').values.astype(float)
+    E_dft[~calculated] = np.nan
+
+    # hull compositions and the number of formula units per unitcell
+    if composition == "atom_frac":
+        atom_col = [
+            col for col in comp_n_col
+            if col[len(comp_n) + 1:-1] not in ["Va", "va", "VA"]
+        ]
+        n_atoms = sel.data.loc[:, atom_col].values.astype(float)
+        per_unitcell = np.sum(n_atoms, axis=1)
+        hull_comp = n_atoms / per_unitcell[:, np.newaxis]
+    else:
+        per_unitcell = np.ones(data.shape[0])
+        hull_comp = sel.data.loc[:, compcol].values.astype(float)
+
+    def _hull_dist(energy, hull_points):
+        return casm.learn.hull.hull_dist(hull_comp,
+                                         energy / per_unitcell,
+                                         hull_points=hull_points,
+                                         dim_tol=dim_tol,
+                                         bottom_tol=bottom_tol)
+
+    dft_dist = _hull_dist(E_dft, calculated)
+    dft_on_hull = dft_dist < hull_tol
 
     if indices is None:
         indices = range(len(hall))
+    indices = list(indices)
 
-    # write eci.json
-    eci = "__tmp"
-    clex.eci = eci
-    if eci not in all_eci:
-        proj.capture("settings --new-eci " + eci)
-    else:
-        proj.capture("settings --set-eci " + eci)
+    # predicted formation energies of all individuals
+    X = sel.data.loc[:, corrcol].values.astype(float)
+    eci = np.zeros((X.shape[1], len(indices)))
+    for j, indiv_i in enumerate(indices):
+        for index, value in hall[indiv_i].eci:
+            eci[index, j] = value
+    E_clex_all = X.dot(eci)
 
     # for each individual specified...
-    for indiv_i in indices:
+    for j, indiv_i in enumerate(indices):
 
         if verbose:
             print("-- Check: individual", indiv_i, " --")
             print_individual(hall, [indiv_i])
             print("")
 
-        # write ECI to use
         indiv = hall[indiv_i]
-        write_eci(proj,
-                  indiv.eci,
-                  fit_details=casm.learn.to_json(indiv_i, indiv),
-                  clex=clex,
-                  verbose=verbose)
-
-        if primitive_only:
-            df = sel.data[sel.data.loc[:,
-                                       is_primitive] == 1].sort_values(compcol)
-        else:
-            df = sel.data.sort_values(compcol)
-        df_calc = df[df.loc[:, is_calculated] == 1].apply(pandas.to_numeric,
-                                                          errors='ignore')
-        dft_gs = df_calc[df_calc.loc[:, dft_hull_dist_long] < hull_tol]
+        E_clex = E_clex_all[:, j]
 
-        # create dft hull selection
-        dft_hull_sel = Selection(proj, dft_hull_selection)
-        dft_hull_sel.save(data=dft_gs, force=True)
-
-        # query:
-        sel.query([clex_hull_dist_long, clex_Eform, clex_dft_hull_dist_long],
-                  force=True)
+        df = data.copy()
+        df.loc[:, dft_hull_dist] = dft_dist
+        df.loc[:, clex_Eform] = E_clex
+        df.loc[:,
+               clex_hull_dist] = _hull_dist(E_clex,
+                                            np.ones(len(E_clex), dtype=bool))
+        df.loc[:, clex_dft_hull_dist] = _hull_dist(E_clex, dft_on_hull)
 
         if primitive_only:
-            df = sel.data[sel.data.loc[:,
-                                       is_primitive] == 1].sort_values(compcol)
-        else:
-            df = sel.data.sort_values(compcol)
-        df.rename(inplace=True,
-                  columns={
-                      dft_hull_dist_long: dft_hull_dist,
-                      clex_hull_dist_long: clex_hull_dist,
-                      clex_dft_hull_dist_long: clex_dft_hull_dist
-                  })
-        df_calc = df[df.loc[:, is_calculated] == 1].apply(pandas.to_numeric,
-                                                          errors='ignore')
+            df = df[df.loc[:, is_primitive] == 1]
+        df = df.sort_values(compcol)
+        df_calc = df[df.loc[:, is_calculated] == 1].copy()
+        df_calc[dft_Eform] = pandas.to_numeric(df_calc.loc[:, dft_Eform])
 
         clex_gs = df[df.loc[:, clex_hull_dist] < hull_tol]
         dft_gs = df_calc[df_calc.loc[:, dft_hull_dist] < hull_tol]
@@ -2256,22 +2603,12 @@ def checkhull(input, hall, indices=None, verbose=True):
                 print(d["range"], "eV/unitcell of the DFT hull:", d["rms"])
             print("")
 
-        sel.data.drop([clex_dft_hull_dist_long], axis=1, inplace=True)
-
         indiv.ranged_rms = ranged_rms
         indiv.checkhull_settings = input["checkhull"]
 
         if verbose:
             print("\n")
 
-    # reset eci setting
-    proj.capture("settings --set-eci " + orig_clex.eci)
-
-    # remove __tmp eci and tmp selections
-    shutil.rmtree(proj.dir.eci_dir(clex))
-    os.remove(dft_selection)
-    os.remove(dft_hull_selection)
-
 
 def checkspecs(input, verbose=True):
     """
@@ -0,0 +1,187 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import numpy as np
+import scipy.spatial
+
+
+class LowerHull(object):
+    """
+  The lower convex hull of a set of (composition, energy) points.
+
+  Compositions are first reduced to the independent composition dimensions
+  spanned by the hull points, so that, for example, atom fractions that sum to
+  one may be used directly. The hull energy at any composition is then the
+  maximum of the energies of the planes containing the bottom facets of the
+  convex hull, which for points in the composition range of the hull points is
+  the lower convex hull.
+
+  Attributes
+  ----------
+
+    origin: array-like of shape (n_comp,)
+      Mean composition of the hull points.
+
+    basis: array-like of shape (n_comp, n_dim)
+      Orthonormal basis of the independent composition dimensions.
+
+    planes: array-like of shape (n_facets, n_dim+1)
+      Bottom facet planes, 'E = planes[:,:-1].dot(x) + planes[:,-1]', where 'x'
+      is the reduced composition.
+
+    vertices: List[int]
+      Indices of the hull points on the lower convex hull.
+
+  """
+    def __init__(self, comp, energy, dim_tol=1e-8, bottom_tol=1e-8):
+        """
+    Arguments
+    ---------
+
+      comp: array-like of shape (n_points, n_comp)
+        Compositions of the hull points
+
+      energy: array-like of shape (n_points,)
+        Energies of the hull points
+
+      dim_tol: number, optional, default=1e-8
+        Tolerance for detecting composition dimensionality
+
+      bottom_tol: number, optional, default=1e-8
+        Tolerance for detecting which facets form the convex hull bottom
+
+    """
+        comp = np.asarray(comp, dtype=float).reshape(len(energy), -1)
+        energy = np.asarray(energy, dtype=float)
+        if len(energy) == 0:
+            raise Exception("Error constructing LowerHull: no points")
+
+        self.origin = np.mean(comp, axis=0)
+        U, S, V = np.linalg.svd(comp - self.origin, full_matrices=False)
+        self.basis = V[S > dim_tol].transpose()
+        n_dim = self.basis.shape[1]
+
+        if n_dim == 0:
+            i = np.argmin(energy)
+            self.planes = np.array([[energy[i]]])
+            self.vertices = [int(i)]
+            return
+
+        # add points lifted above every hull point, so that the points are
+        # never degenerate in the energy dimension; this only adds facets that
+        # are vertical or face upwards
+        x = self.reduce(comp)
+        lifted = np.max(energy) + 1.0 + (np.max(energy) - np.min(energy))
+        points = np.vstack([
+            np.column_stack([x, energy]),
+            np.column_stack([x, np.full(len(energy), lifted)])
+        ])
+        hull = scipy.spatial.ConvexHull(points)
+
+        # outward normals with negative energy component are bottom facets
+        eq = hull.equations[hull.equations[:, n_dim] < -bottom_tol]
+        self.planes = np.column_stack([
+            -eq[:, :n_dim] / eq[:, [n_dim]], -eq[:, n_dim + 1] / eq[:, n_dim]
+        ])
+        self.vertices = sorted(
+            set(
+                int(i) for i in np.unique(hull.simplices[
+                    hull.equations[:, n_dim] < -bottom_tol])
+                if i < len(energy)))
+
+    def reduce(self, comp):
+        """ Return reduced compositions, of shape (n_points, n_dim) """
+        comp = np.asarray(comp, dtype=float).reshape(-1, len(self.origin))
+        return (comp - self.origin).dot(self.basis)
+
+    def hull_energy(self, comp):
+        """
+    Return the energy of the lower convex hull at the given compositions.
+
+    Arguments
+    ---------
+
+      comp: array-like of shape (n_points, n_comp)
+        Compositions
+
+    Returns
+    -------
+
+      hull_energy: array-like of shape (n_points,)
+        The energy of the lower convex hull
+
+    """
+        x = self.reduce(comp)
+        x1 = np.column_stack([x, np.ones(x.shape[0])])
+        return np.max(x1.dot(self.planes.transpose()), axis=1)
+
+    def dist(self, comp, energy):
+        """
+    Return the distance in energy of points above the lower convex hull.
+
+    Arguments
+    ---------
+
+      comp: array-like of shape (n_points, n_comp)
+        Compositions
+
+      energy: array-like of shape (n_points,) or (n_points, n_energy)
+        Energies. If 2-dimensional, distances are calculated for each column.
+
+    Returns
+    -------
+
+      dist: array-like, the same shape as 'energy'
+        'energy - hull_energy(comp)'
+
+    """
+        energy = np.asarray(energy, dtype=float)
+        E_hull = self.hull_energy(comp)
+        if energy.ndim == 2:
+            return energy - E_hull[:, np.newaxis]
+        return energy - E_hull
+
+
+def hull_dist(comp, energy, hull_points=None, dim_tol=1e-8, bottom_tol=1e-8):
+    """
+  Return the distance of points above the lower convex hull of a subset of
+  the points.
+
+  Arguments
+  ---------
+
+    comp: array-like of shape (n_points, n_comp)
+      Compositions
+
+    energy: array-like of shape (n_points,)
+      Energies
+
+    hull_points: array-like of bool of shape (n_points,), optional
+      Which points are used to construct the convex hull. Default uses all
+      points with finite energy.
+
+    dim_tol: number, optional, default=1e-8
+      Tolerance for detecting composition dimensionality
+
+    bottom_tol: number, optional, default=1e-8
+      Tolerance for detecting which facets form the convex hull bottom
+
+  Returns
+  -------
+
+    dist: array-like of shape (n_points,)
+      The distance in energy of each point above the convex hull.
+
+  """
+    comp = np.asarray(comp, dtype=float).reshape(len(energy), -1)
+    energy = np.asarray(energy, dtype=float)
+    if hull_points is None:
+        hull_points = np.isfinite(energy)
+    else:
+        hull_points = np.asarray(hull_points, dtype=bool) & np.isfinite(energy)
+    hull = LowerHull(comp[hull_points],
+                     energy[hull_points],
+                     dim_tol=dim_tol,
+                     bottom_tol=bottom_tol)
+    return hull.dist(comp, energy)
@@ -3,6 +3,7 @@ from __future__ import (absolute_import, division, print_function,
 from builtins import *
 
 import numpy as np
+import scipy.linalg
 import sklearn
 
 
@@ -17,13 +18,25 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
     pinv: boolean, optional, default=True
       If true, use the psuedo-inverse in solving the least squares problem.
     
+    hat_matrix: boolean, optional, default=True
+      If true, construct the full hat matrix H_. If false, only the diagonal
+      of the hat matrix (the leverage) is calculated, from a thin SVD
+      (pinv=True) or thin QR (pinv=False) factorization of X, so that memory
+      scales linearly with n_samples.
+    
+    dtype: str, optional, default="float64"
+      Floating point type used for fitting, "float64" or "float32".
+    
     coef_: array-like of shape (n_samples, 1)
       Estimated coefficients for the linear regression problem.
         
     H_: array-like of shape (n_samples, n_features)
-      H = X*(X.transpose()*X).inverse()*X.transpose()
+      H = X*(X.transpose()*X).inverse()*X.transpose(). Only if hat_matrix=True.
+    
+    h_: array-like of shape (n_samples,)
+      The diagonal of H.
   """
-    def __init__(self, pinv=True, **kwargs):
+    def __init__(self, pinv=True, hat_matrix=True, dtype="float64", **kwargs):
         """
     Calculates linear least squares solution for X*b = y.
     
@@ -33,10 +46,20 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
       pinv: boolean, optional, default=True
         If true, use the psuedo-inverse in solving the least squares problem.
       
+      hat_matrix: boolean, optional, default=True
+        If true, construct the full hat matrix H_, of shape
+        (n_samples, n_samples).
+        If false, only calculate its diagonal, h_.
+      
+      dtype: str, optional, default="float64"
+        Floating point type used for fitting, "float64" or "float32".
+      
       kwargs: keyword args
         Other keyword args are ignored
     """
         self.pinv = pinv
+        self.hat_matrix = hat_matrix
+        self.dtype = dtype
 
     def fit(self, X, y):
         """
@@ -68,8 +91,21 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
       where
         H = X * S
       
-      Calculates attributes: coef_, H_
+      Calculates attributes: coef_, H_, h_
+      
+      If hat_matrix=False, H is not constructed. With the thin factorization
+      X = Q*R (or X = U*S*V.t), H = Q*Q.t, so:
+        h = np.sum(Q**2, axis=1)
+      
+      Calculates attributes: coef_, h_
     """
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
+
+        if not self.hat_matrix:
+            self._fit_leverage(X, y)
+            return
+
         if self.pinv == False:
             S = np.linalg.inv(X.transpose().dot(X)).dot(X.transpose())
         else:
@@ -80,6 +116,29 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
 
         # stores results for LOOCV formula
         self.H_ = np.dot(X, S)
+        self.h_ = np.diag(self.H_)
+
+    def _fit_leverage(self, X, y):
+        """
+    Calculates coef_ and h_ without constructing H.
+    """
+        if self.pinv == False:
+            Q, R = np.linalg.qr(X)
+            self.coef_ = scipy.linalg.solve_triangular(R, Q.transpose().dot(y))
+        else:
+            # same cutoff as np.linalg.pinv(X.t*X), whose singular values are
+            # s**2
+            rcond = 1e-15
+            if X.dtype != np.float64:
+                rcond = np.finfo(X.dtype).eps
+            U, s, Vt = np.linalg.svd(X, full_matrices=False)
+            keep = s**2 > rcond * np.max(s**2, initial=0.0)
+            Q = U[:, keep]
+            self.coef_ = Vt[keep].transpose().dot(
+                (Q.transpose().dot(y).transpose() / s[keep]).transpose())
+        self.h_ = np.einsum('ij,ij->i', Q, Q)
+        if hasattr(self, "H_"):
+            del self.H_
 
     def predict(self, X):
         """
@@ -110,7 +169,7 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
     ---------
     
       X: array-like of shape (n_samples, n_features)
-        The input data. (This parameter is ignored)
+        The input data. (This parameter is ignored if hat_matrix=True)
       
       y: array-like of shape (n_samples, 1)
         The values
@@ -124,8 +183,343 @@ class LinearRegressionForLOOCV(sklearn.base.BaseEstimator):
     
     Notes
     -----
-      Must already be fit. 'X' parameter is ignored.
+      Must already be fit. If hat_matrix=True, 'X' parameter is ignored. If
+      hat_matrix=False, 'X' must be the data used for fitting and 
+      y_pred = X*coef_.
       
     """
+        if not self.hat_matrix:
+            y = np.asarray(y, dtype=self.dtype)
+            h = self.h_ if y.ndim == 1 else self.h_[:, np.newaxis]
+            y_pred = self.predict(np.asarray(X, dtype=self.dtype))
+            return np.mean(((y - y_pred) / (1.0 - h))**2)
         y_pred = np.dot(self.H_, y)
         return np.mean(((y - y_pred) / (1.0 - np.diag(self.H_)))**2)
+
+
+class SingleFlipLOOCV(object):
+    """
+  Scores all single-flip neighbors of an individual with incremental updates
+  to the LOOCV score of LinearRegressionForLOOCV.
+
+  For a parent selecting the columns A of X, the parent's Gram inverse,
+  G_inv = (X_A.t * X_A).inv, hat matrix diagonal, h, and residuals, e, are
+  calculated once. Then each child that differs from the parent by one
+  feature is scored with a rank-one update, without refitting:
+
+    add feature j, with z = X[:,j]:
+      r = z - X_A * G_inv * X_A.t * z,  s = r.t * r
+      h' = h + r**2 / s
+      e' = e - r * (z.t * e) / s
+
+    drop feature A[t], with u = X_A * G_inv[:,t]:
+      h' = h - u**2 / G_inv[t,t]
+      e' = e + u * coef[t] / G_inv[t,t]
+
+  and LOOCV = np.mean((e' / (1.0 - h'))**2). So the whole neighborhood costs
+  about as much as a single fit, instead of n_features fits.
+
+  Attributes
+  ----------
+
+    X: array-like of shape (n_samples, n_features)
+      The input data
+
+    y: array-like of shape (n_samples, 1)
+      The values
+
+    pinv: boolean, optional, default=True
+      If true, use the psuedo-inverse in solving the least squares problem.
+
+    tol: float, optional, default=1e-10
+      Relative tolerance used to detect added features that are linearly
+      dependent on the parent's features, and parents with a singular Gram
+      matrix, for which dropped features are scored by refitting.
+
+    chunk_size: int, optional, default=256
+      Number of added features scored at once, limiting temporary memory to
+      (n_samples, chunk_size) arrays.
+
+    dtype: str, optional, default="float64"
+      Floating point type used for scoring, "float64" or "float32".
+  """
+    def __init__(self,
+                 X,
+                 y,
+                 pinv=True,
+                 tol=1e-10,
+                 chunk_size=256,
+                 dtype="float64"):
+        """
+    Arguments
+    ---------
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+
+      pinv: boolean, optional, default=True
+        If true, use the psuedo-inverse in solving the least squares problem.
+
+      tol: float, optional, default=1e-10
+        Relative tolerance for detecting linearly dependent features.
+
+      chunk_size: int, optional, default=256
+        Number of added features scored at once.
+
+      dtype: str, optional, default="float64"
+        Floating point type used for scoring, "float64" or "float32".
+    """
+        self.X = np.asarray(X, dtype=dtype)
+        self.y = np.asarray(y, dtype=dtype).reshape(-1)
+        self.pinv = pinv
+        self.tol = tol
+        self.chunk_size = chunk_size
+
+    def _gram_inv(self, G):
+        if G.shape[0] == 0:
+            return G
+        if self.pinv == False:
+            return np.linalg.inv(G)
+        return np.linalg.pinv(G)
+
+    def _loocv(self, e, h):
+        return np.mean((e / (1.0 - h))**2, axis=0)
+
+    def fit_score(self, selected):
+        """
+    Return the LOOCV score of a single fit using the columns 'selected',
+    equivalent to LinearRegressionForLOOCV.fit followed by score.
+    """
+        X_A = self.X[:, selected]
+        G_inv = self._gram_inv(X_A.transpose().dot(X_A))
+        U = X_A.dot(G_inv)
+        h = np.einsum('ij,ij->i', U, X_A)
+        e = self.y - U.dot(X_A.transpose().dot(self.y))
+        return self._loocv(e, h)
+
+    def scores(self, parent):
+        """
+    Return the LOOCV score of every child that differs from parent by one
+    selected feature.
+
+    Arguments
+    ---------
+
+      parent: List[bool] of length n_features
+        This is a boolean list of shape [n_features], in which an element is
+        True iff its corresponding feature is selected for retention.
+
+
+    Returns
+    -------
+
+      loocv: array-like of shape (n_features,)
+        loocv[j] is the LOOCV score, as by LinearRegressionForLOOCV.score, of
+        the child with feature 'j' flipped on/off.
+    """
+        mask = np.asarray(parent, dtype=bool)
+        on = np.where(mask)[0]
+        off = np.where(~mask)[0]
+        loocv = np.empty(mask.shape[0])
+
+        # parent factorization
+        X_A = self.X[:, on]
+        G = X_A.transpose().dot(X_A)
+        G_inv = self._gram_inv(G)
+        U = X_A.dot(G_inv)
+        coef = G_inv.dot(X_A.transpose().dot(self.y))
+        h = np.einsum('ij,ij->i', U, X_A)
+        e = self.y - X_A.dot(coef)
+
+        # add one feature: bordered update
+        for begin in range(0, len(off), self.chunk_size):
+            cols = off[begin:begin + self.chunk_size]
+            Z = self.X[:, cols]
+            R = Z - U.dot(X_A.transpose().dot(Z))
+            s = np.einsum('ij,ij->j', R, R)
+            zz = np.einsum('ij,ij->j', Z, Z)
+            dependent = s <= self.tol * np.maximum(zz, 1.0)
+            s[dependent] = 1.0
+            R[:, dependent] = 0.0
+            h_new = h[:, np.newaxis] + R**2 / s
+            e_new = e[:, np.newaxis] - R * (Z.transpose().dot(e) / s)
+            loocv[cols] = self._loocv(e_new, h_new)
+
+        # drop one feature: Sherman-Morrison downdate
+        if len(on):
+            d = np.diag(G_inv)
+            if np.linalg.matrix_rank(G) < len(on) or np.any(
+                    d <= self.tol * np.max(np.abs(G_inv))):
+                for t, j in enumerate(on):
+                    loocv[j] = self.fit_score(np.delete(on, t))
+            else:
+                h_new = h[:, np.newaxis] - U**2 / d
+                e_new = e[:, np.newaxis] + U * (coef / d)
+                loocv[on] = self._loocv(e_new, h_new)
+
+        return loocv
+
+
+class PopulationLOOCV(object):
+    """
+  Scores a whole population of individuals with the LOOCV score of
+  LinearRegressionForLOOCV, sharing one Gram matrix.
+
+  The Gram matrix, G = X.t*X, and X.t*y are calculated once. For each
+  individual selecting the columns A, G[A,A] and (X.t*y)[A] are sub-selected
+  instead of recalculated, and individuals with the same number of selected
+  features are solved together with a stacked Cholesky factorization,
+  G[A,A] = C*C.t:
+
+    coef = G[A,A].inv * (X.t*y)[A]
+    h = np.sum((C.inv * X_A.t)**2, axis=0)
+    e = y - X_A*coef
+
+  and LOOCV = np.mean((e / (1.0 - h))**2). Individuals with a singular
+  G[A,A] are scored by LinearRegressionForLOOCV(hat_matrix=False).
+
+  Attributes
+  ----------
+
+    X: array-like of shape (n_samples, n_features)
+      The input data
+
+    y: array-like of shape (n_samples, 1)
+      The values
+
+    G: array-like of shape (n_features, n_features)
+      The Gram matrix, X.t*X
+
+    Xty: array-like of shape (n_features,)
+      X.t*y
+
+    pinv: boolean, optional, default=True
+      If true, use the psuedo-inverse for individuals with a singular G[A,A].
+
+    tol: float, optional, default=1e-10
+      Relative tolerance for detecting a singular G[A,A].
+
+    max_block_size: int, optional, default=2**24
+      Maximum number of elements of the (n_samples, n_individuals, n_selected)
+      blocks of X solved at once.
+
+    dtype: str, optional, default="float64"
+      Floating point type used for scoring, "float64" or "float32".
+  """
+    def __init__(self,
+                 X,
+                 y,
+                 pinv=True,
+                 tol=1e-10,
+                 max_block_size=2**24,
+                 dtype="float64"):
+        """
+    Arguments
+    ---------
+
+      X: array-like of shape (n_samples, n_features)
+        The input data
+
+      y: array-like of shape (n_samples, 1)
+        The values
+
+      pinv: boolean, optional, default=True
+        If true, use the psuedo-inverse for individuals with a singular G[A,A].
+
+      tol: float, optional, default=1e-10
+        Relative tolerance for detecting a singular G[A,A].
+
+      max_block_size: int, optional, default=2**24
+        Maximum number of elements of the blocks of X solved at once.
+
+      dtype: str, optional, default="float64"
+        Floating point type used for scoring, "float64" or "float32".
+    """
+        self.X = np.asarray(X, dtype=dtype)
+        self.y = np.asarray(y, dtype=dtype).reshape(-1)
+        self.G = self.X.transpose().dot(self.X)
+        self.Xty = self.X.transpose().dot(self.y)
+        self.pinv = pinv
+        self.tol = tol
+        self.max_block_size = max_block_size
+        self.dtype = dtype
+
+    def _fit_score(self, selected):
+        estimator = LinearRegressionForLOOCV(pinv=self.pinv,
+                                             hat_matrix=False,
+                                             dtype=self.dtype)
+        estimator.fit(self.X[:, selected], self.y)
+        return estimator.score(self.X[:, selected], self.y)
+
+    def _block_scores(self, idx):
+        """
+    Return LOOCV scores for a block of individuals with selected columns
+    idx, of shape (n_individuals, n_selected), or None for singular G[A,A].
+    """
+        G_A = self.G[idx[:, :, np.newaxis], idx[:, np.newaxis, :]]
+        try:
+            C = np.linalg.cholesky(G_A)
+        except np.linalg.LinAlgError:
+            if idx.shape[0] == 1:
+                return [None]
+            return [
+                self._block_scores(idx[i:i + 1])[0]
+                for i in range(idx.shape[0])
+            ]
+        d = np.diagonal(C, axis1=1, axis2=2)**2
+        singular = np.min(d, axis=1) <= self.tol * np.max(
+            np.diagonal(G_A, axis1=1, axis2=2), axis=1)
+
+        X_A = np.transpose(self.X[:, idx], (1, 2, 0))
+        w = np.linalg.solve(C, self.Xty[idx][:, :, np.newaxis])
+        coef = np.linalg.solve(np.transpose(C, (0, 2, 1)), w)[:, :, 0]
+        h = np.sum(np.linalg.solve(C, X_A)**2, axis=1)
+        e = self.y - np.einsum('ikn,ik->in', X_A, coef)
+        loocv = np.mean((e / (1.0 - h))**2, axis=1)
+        return [None if singular[i] else loocv[i] for i in range(len(loocv))]
+
+    def scores(self, population):
+        """
+    Return the LOOCV score of every individual in a population.
+
+    Arguments
+    ---------
+
+      population: iterable of List[bool] of length n_features
+        Each individual is a boolean list of shape [n_features], in which
+        an element is True iff its corresponding feature is selected for
+        retention.
+
+
+    Returns
+    -------
+
+      loocv: array-like of shape (n_individuals,)
+        The LOOCV score, as by LinearRegressionForLOOCV.score, of each
+        individual.
+    """
+        masks = np.asarray(
+            [np.asarray(indiv, dtype=bool) for indiv in population])
+        loocv = np.empty(len(masks))
+        if len(masks) == 0:
+            return loocv
+
+        n_selected = np.sum(masks, axis=1)
+        for k in np.unique(n_selected):
+            members = np.where(n_selected == k)[0]
+            if k == 0:
+                loocv[members] = np.mean(self.y**2)
+                continue
+            idx = np.asarray([np.where(masks[i])[0] for i in members])
+            block = max(1, self.max_block_size // (self.X.shape[0] * k))
+            for begin in range(0, len(members), block):
+                block_members = members[begin:begin + block]
+                results = self._block_scores(idx[begin:begin + block])
+                for i, res in zip(block_members, results):
+                    if res is None:
+                        res = self._fit_score(np.where(masks[i])[0])
+                    loocv[i] = res
+        return loocv
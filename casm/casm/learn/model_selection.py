@@ -6,7 +6,8 @@ import sklearn.model_selection
 import numpy as np
 import pickle
 from math import sqrt
-from casm.learn.linear_model import LinearRegressionForLOOCV
+from casm.learn.linear_model import LinearRegressionForLOOCV, SingleFlipLOOCV, \
+  PopulationLOOCV
 from casm.learn.tools import indices
 
 
@@ -112,3 +113,78 @@ def cross_val_score(estimator,
                                                      cv=cv,
                                                      fit_params=fit_params)
     return sqrt(np.mean(scores)) + penalty * sum(individual),
+
+
+def is_LeaveOneOutForLLS(estimator, cv, scoring, n_samples):
+    """
+  Return True if cross_val_score with these arguments reduces to the
+  LinearRegressionForLOOCV hat matrix LOOCV score.
+  
+  This is the case when 'estimator' is a LinearRegressionForLOOCV, 'scoring' 
+  is None, and 'cv' is the LeaveOneOutForLLS train/test set, as set by
+  casm.learn.fit.make_fitting_data for LinearRegression with LeaveOneOut.
+  """
+    return isinstance(estimator, LinearRegressionForLOOCV) \
+        and scoring is None \
+        and isinstance(cv, list) \
+        and cv == LeaveOneOutForLLS(n_samples)
+
+
+def single_flip_cross_val_score(neighborhood, parent, penalty=0.0):
+    """
+  Evaluate CV scores for all children that differ from parent by one feature.
+  
+  Arguments
+  ---------
+    
+    neighborhood: casm.learn.linear_model.SingleFlipLOOCV
+      Incremental LOOCV evaluator holding the training data.
+    
+    parent: List[bool] of length n_features
+      This is a boolean list of shape [n_features], in which an element is True 
+      iff its corresponding feature is selected for retention.
+    
+    penalty: float, optional, default=0.0
+      The CV score is increased by 'penalty*sum(child)'.
+  
+  
+  Returns
+  -------
+    
+    scores: array-like of shape (n_features,)
+      scores[j] is the CV score, as from cross_val_score, of the child with
+      feature 'j' flipped on/off.
+  """
+    mask = np.asarray(parent, dtype=bool)
+    n_selected = np.sum(mask) + np.where(mask, -1, 1)
+    return np.sqrt(neighborhood.scores(mask)) + penalty * n_selected
+
+
+def population_cross_val_score(evaluator, population, penalty=0.0):
+    """
+  Evaluate CV scores for all individuals in a population at once.
+  
+  Arguments
+  ---------
+    
+    evaluator: casm.learn.linear_model.PopulationLOOCV
+      Batched LOOCV evaluator holding the training data.
+    
+    population: iterable of List[bool] of length n_features
+      Each individual is a boolean list of shape [n_features], in which an 
+      element is True iff its corresponding feature is selected for retention.
+    
+    penalty: float, optional, default=0.0
+      The CV score is increased by 'penalty*sum(individual)'.
+  
+  
+  Returns
+  -------
+    
+    fitnesses: List[(float,)]
+      The CV score, as from cross_val_score, of each individual.
+  """
+    population = list(population)
+    scores = np.sqrt(evaluator.scores(population))
+    return [(float(score) + penalty * sum(indiv), )
+            for score, indiv in zip(scores, population)]
@@ -4,6 +4,7 @@ from builtins import *
 
 import numpy as np
 import random
+import scipy.sparse
 
 
 def eci(individual, coef):
@@ -106,6 +107,10 @@ def set_sample_weight(sample_weight, y=None, X=None):
     
   So, if weights are included, then the linear model is changed from
     X*b = y  ->  L*X*b = L*y
+  
+  If W is diagonal (sample_weight is None or 1-dimensional), the SVD is not
+  needed, L = diag(sqrt(w)), and the weights are applied by scaling the rows of
+  X and y. In that case W and L are returned as scipy.sparse.dia_matrix.
     
     
   Arguments
@@ -138,11 +143,12 @@ def set_sample_weight(sample_weight, y=None, X=None):
     weighted_X: None, or array-like of shape: (n_samples, n_features)
       If X given as input, the weighted training input data, weighted_X = L*x.
     
-    W: array-like of shape: (n_samples, n_samples)
-      Contains sample weights. 
+    W: array-like or scipy.sparse.dia_matrix of shape: (n_samples, n_samples)
+      Contains sample weights. Sparse if sample_weight is None or 1-dimensional.
     
-    L: array-like of shape: (n_samples, n_samples)
-      Used to generate weighted_X and weighted_y, W = L * L.transpose(). 
+    L: array-like or scipy.sparse.dia_matrix of shape: (n_samples, n_samples)
+      Used to generate weighted_X and weighted_y, W = L * L.transpose(). Sparse
+      if sample_weight is None or 1-dimensional.
     
       
   Notes
@@ -156,11 +162,8 @@ def set_sample_weight(sample_weight, y=None, X=None):
     weighted_y = None
     weighted_X = None
 
-    if sample_weight is None:
-        W = np.identity(y.shape[0])
-    elif len(sample_weight.shape) == 1:
-        n_samples = len(sample_weight)
-        W = np.diag(sample_weight) * n_samples / np.sum(sample_weight)
+    if sample_weight is None or len(sample_weight.shape) == 1:
+        return _set_diagonal_sample_weight(sample_weight, y=y, X=X)
     elif len(sample_weight.shape) == 2:
         n_samples = len(sample_weight)
         W = sample_weight * n_samples / np.sum(sample_weight)
@@ -179,3 +182,33 @@ def set_sample_weight(sample_weight, y=None, X=None):
         weighted_y = np.dot(L, y)
 
     return (weighted_y, weighted_X, W, L)
+
+
+def _set_diagonal_sample_weight(sample_weight, y=None, X=None):
+    """ 
+  Implements set_sample_weight for sample_weight None or 1-dimensional, 
+  without constructing dense (n_samples, n_samples) matrices.
+  """
+    weighted_y = None
+    weighted_X = None
+
+    if sample_weight is None:
+        n_samples = (y if y is not None else X).shape[0]
+        w = np.ones(n_samples)
+    else:
+        n_samples = len(sample_weight)
+        w = sample_weight * n_samples / np.sum(sample_weight)
+    sqrt_w = np.sqrt(w)
+
+    W = scipy.sparse.diags(w, format='dia')
+    L = scipy.sparse.diags(sqrt_w, format='dia')
+
+    if X is not None:
+        X = np.asarray(X)
+        weighted_X = X * sqrt_w.reshape((-1, ) + (1, ) * (X.ndim - 1))
+
+    if y is not None:
+        y = np.asarray(y)
+        weighted_y = y * sqrt_w.reshape((-1, ) + (1, ) * (y.ndim - 1))
+
+    return (weighted_y, weighted_X, W, L)
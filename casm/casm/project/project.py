@@ -156,6 +156,10 @@ class DirectoryStructure(object):
         self.__sym_dir = "symmetry"
         self.__clex_dir = "cluster_expansions"
 
+        # settings_path_crawl caches
+        self._settings_dir_files = dict()
+        self._settings_paths = dict()
+
     # ** Query filesystem **
 
     def all_bset(self):
@@ -319,25 +323,52 @@ class DirectoryStructure(object):
             The path to the first file named 'filename' found in the settings
             directories, or None if not found.
 
+
+        Notes
+        -----
+          Each settings directory is listed once, and the result for each
+          (filename, configname, calctype, calc_subdir) is remembered, so that
+          looking up many files for many configurations does not check for each
+          file separately. Use 'refresh_settings' if settings files are added
+          or removed.
+
         """
-        filepath = join(
-            self.configuration_calc_settings_dir(configname, clex,
-                                                 calc_subdir), filename)
-        if os.path.exists(filepath):
-            return filepath
+        key = (filename, configname, clex.calctype, calc_subdir)
+        if key in self._settings_paths:
+            return self._settings_paths[key]
 
         scelname = configname.split('/')[0]
-        filepath = join(
-            self.supercell_calc_settings_dir(scelname, clex, calc_subdir),
-            filename)
-        if os.path.exists(filepath):
-            return filepath
-
-        filepath = join(self.calc_settings_dir(clex), filename)
-        if os.path.exists(filepath):
-            return filepath
+        filepath = None
+        for settings_dir in [
+                self.configuration_calc_settings_dir(configname, clex,
+                                                     calc_subdir),
+                self.supercell_calc_settings_dir(scelname, clex, calc_subdir),
+                self.calc_settings_dir(clex)
+        ]:
+            if self._settings_file_exists(settings_dir, filename):
+                filepath = join(settings_dir, filename)
+                break
 
-        return None
+        self._settings_paths[key] = filepath
+        return filepath
+
+    def _settings_file_exists(self, settings_dir, filename):
+        """Check if 'filename' exists in 'settings_dir', listing each settings
+        directory only once"""
+        if os.path.dirname(filename):
+            return os.path.exists(join(settings_dir, filename))
+        if settings_dir not in self._settings_dir_files:
+            try:
+                self._settings_dir_files[settings_dir] = set(
+                    os.listdir(settings_dir))
+            except OSError:
+                self._settings_dir_files[settings_dir] = set()
+        return filename in self._settings_dir_files[settings_dir]
+
+    def refresh_settings(self):
+        """Forget the settings files found by settings_path_crawl"""
+        self._settings_dir_files.clear()
+        self._settings_paths.clear()
 
     def supercell_dir(self, scelname, calc_subdir=""):
         """Return supercell directory path (scelname has format SCELV_A_B_C_D_E_F)"""
@@ -4,7 +4,13 @@
 # warnings.filterwarnings("ignore", message="numpy.dtype size changed")
 # warnings.filterwarnings("ignore", message="numpy.ufunc size changed")
 
-from io import StringIO
+from collections import OrderedDict
+import glob
+import hashlib
+import os
+import re
+import shutil
+import tempfile
 import pandas
 import casm
 from casm.misc import compat
@@ -46,16 +52,60 @@ def query(proj,
     data: pandas.DataFrame
         A DataFrame containing the query results. Note that no columns are loaded as bool dtype.
     """
-    args = query_args(columns, selection_path, selection_type, verbatim, all)
+    tmpdir = tempfile.mkdtemp(prefix="casm_query_")
+    try:
+        return read_query_output(
+            _query_to_file(proj, columns, selection_path, selection_type,
+                           verbatim, all, tmpdir))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
 
-    stdout, stderr, returncode = proj.capture(args)
 
+def query_chunks(proj,
+                 columns,
+                 selection_path,
+                 selection_type,
+                 verbatim=True,
+                 all=False,
+                 chunksize=10000):
+    """Yield `casm query` output as a sequence of pandas.DataFrame blocks
+
+    Equivalent to `query`, but the output is read `chunksize` rows at a time, so that large queries can be processed without holding all the results in memory at once. Arguments are the same as for `query`, with the addition of:
+
+    Arguments
+    ---------
+    chunksize: int
+        Maximum number of rows in each DataFrame block.
+
+    Yields
+    ------
+    data: pandas.DataFrame
+        A DataFrame containing up to `chunksize` rows of query results, with the same index as the corresponding rows would have in the result of `query`.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="casm_query_")
     try:
-        sout = StringIO(stdout)
-        if compat.peek(sout) == '#':
-            sout.read(1)
-        return pandas.read_csv(sout, sep=compat.str(' +'), engine='python')
-    except:
+        filename = _query_to_file(proj, columns, selection_path,
+                                  selection_type, verbatim, all, tmpdir)
+        for df in read_query_output(filename, chunksize=chunksize):
+            yield df
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _query_to_file(proj, columns, selection_path, selection_type, verbatim,
+                   all, tmpdir):
+    """Run `casm query`, writing output to a file in tmpdir, and return the file path"""
+    filename = os.path.join(tmpdir, "query.txt")
+    args = query_args(columns,
+                      selection_path,
+                      selection_type,
+                      verbatim,
+                      all,
+                      output=filename)
+
+    stdout, stderr, returncode = proj.capture(args)
+
+    if returncode != 0 or not os.path.isfile(filename):
         print("Error in casm.query")
         print("  proj:", proj.path)
         print("  Attempted to execute: '" + args + "'")
@@ -64,14 +114,51 @@ def query(proj,
         print("---- stderr: ---------------------")
         print(stderr)
         print("----------------------------------")
-        raise
+        raise Exception("Error in casm.query: 'casm " + args + "' failed")
+    return filename
+
+
+def read_query_output(filename, chunksize=None):
+    """Read `casm query` output from a file
+
+    The whitespace separated output is parsed using the pandas C parser.
+
+    Arguments
+    ---------
+    filename: str
+        Path to a file written by `casm query -o`
+
+    chunksize: int, optional
+        If not None, return an iterator of pandas.DataFrame blocks containing up to `chunksize` rows.
+
+    Returns
+    -------
+    data: pandas.DataFrame, or iterator of pandas.DataFrame
+        A DataFrame containing the query results. Note that no columns are loaded as bool dtype.
+    """
+    f = open(filename, compat.pandas_rmode())
+    if compat.peek(f) == '#':
+        f.read(1)
+    if chunksize is None:
+        with f:
+            return pandas.read_csv(f, sep=compat.str(r'\s+'))
+
+    def _chunks():
+        with f:
+            for df in pandas.read_csv(f,
+                                      sep=compat.str(r'\s+'),
+                                      chunksize=chunksize):
+                yield df
+
+    return _chunks()
 
 
 def query_args(columns,
                selection_path,
                selection_type,
                verbatim=True,
-               all=False):
+               all=False,
+               output="STDOUT"):
     """Constructs a string appropriate for use by `casm query`
 
     Arguments
@@ -94,10 +181,13 @@ def query_args(columns,
     all: bool
         If True, use `-a,--all` to include unselected objects in the output
 
+    output: str
+        The `-o,--output` option, a path to an output file, or "STDOUT".
+
     Returns
     -------
     args: str
-        A string appropriate for use by `casm query`. The `-o STDOUT` option is always included. Example:
+        A string appropriate for use by `casm query`. The `-o` option is always included. Example:
 
             "query -k 'comp_n scel_size' -c MASTER -t config -v -o STDOUT"
     """
@@ -112,5 +202,213 @@ def query_args(columns,
         args += " -v"
     if all:
         args += " -a"
-    args += " -o STDOUT"
+    args += " -o " + output
     return args
+
+
+class QueryCache(object):
+    """Cache of `casm query` results for one CASM project
+
+    Results are cached for each column expression, keyed on the selection path, the selection type, and the `all` option. Each cached result is stored with a signature of the selection file contents and the project files it may depend on, and is re-queried if the signature changes:
+
+        - All columns: the contents of the selection file, the modification times and sizes of the files in the project database ('.casm/jsonDB', including calculated properties), the project settings, composition axes, master selections, basis sets and calculation settings, and the contents of any selection file named in the column expression.
+        - Columns with 'clex' or 'eci' in the expression, additionally: the contents of all 'eci.json' files.
+
+    The project files are checked once per call to `query`, and at most `maxsize` column results are kept, discarding the least recently used.
+
+    Use `query_cache(proj)` to get the QueryCache shared by all Selection of a project.
+
+    Attributes
+    ----------
+    proj: casm.project.Project
+        The project to query
+
+    maxsize: int
+        Maximum number of column results kept
+
+    hits: int
+        Number of column expressions found in the cache
+
+    misses: int
+        Number of column expressions queried
+    """
+    def __init__(self, proj, maxsize=256):
+        """
+        Arguments
+        ---------
+        proj: casm.project.Project
+            The project to query
+
+        maxsize: int, optional, default=256
+            Maximum number of column results kept
+        """
+        self.proj = proj
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def clear(self):
+        """Remove all cached results"""
+        self._data = OrderedDict()
+
+    def query(self,
+              columns,
+              selection_path,
+              selection_type,
+              all=False,
+              force=False):
+        """Return a pandas.DataFrame with `casm query` output, using cached results where valid
+
+        Equivalent to `query(proj, columns, selection_path, selection_type, verbatim=True, all=all)`. If `force==True`, all columns are re-queried and the cached results replaced.
+        """
+        selection_key = (selection_path, selection_type, bool(all))
+        project_signature = (_file_hash(selection_path),
+                             _stat_signature(self._project_files()))
+        eci_signature = None
+        signatures = dict()
+        results = dict()
+        missing = []
+        for col in columns:
+            if eci_signature is None and re.search('clex|eci', col):
+                eci_signature = self._eci_signature()
+            signatures[col] = self._signature(col, project_signature,
+                                              eci_signature)
+            cached = None if force else self._data.get(selection_key + (col, ))
+            if cached is not None and cached[0] == signatures[col]:
+                results[col] = cached[1]
+                self._data.move_to_end(selection_key + (col, ))
+                self.hits += 1
+            else:
+                missing.append(col)
+                self.misses += 1
+
+        if len(missing):
+            df = query(self.proj,
+                       missing,
+                       selection_path,
+                       selection_type,
+                       verbatim=True,
+                       all=all)
+            split = _split_columns(df, missing)
+            if split is None:
+                # can't attribute output columns to expressions, don't cache
+                if len(results) == 0:
+                    return df
+                return query(self.proj,
+                             columns,
+                             selection_path,
+                             selection_type,
+                             verbatim=True,
+                             all=all)
+            for col in missing:
+                results[col] = split[col]
+                self._data[selection_key + (col, )] = (signatures[col],
+                                                       split[col])
+                self._data.move_to_end(selection_key + (col, ))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return pandas.concat([results[col] for col in columns], axis=1)
+
+    def _signature(self, col, project_signature, eci_signature):
+        sig = [project_signature]
+        if re.search('clex|eci', col):
+            sig.append(eci_signature)
+        for token in re.split(r'[(),\s]+', col):
+            if len(token) and os.path.isfile(token):
+                sig.append((token, _file_hash(token)))
+        return tuple(sig)
+
+    def _eci_signature(self):
+        return tuple(
+            _file_hash(f) for f in sorted(
+                glob.glob(
+                    os.path.join(self.proj.path, "cluster_expansions", "*",
+                                 "*", "*", "*", "*", "eci.json"))))
+
+    def _project_files(self):
+        d = self.proj.dir
+        files = [
+            d.project_settings(),
+            d.composition_axes(),
+            d.master_selection("config"),
+            d.master_selection("scel")
+        ]
+        for root in [
+                d.casmdb_dir(),
+                os.path.join(self.proj.path, "basis_sets"),
+                os.path.join(self.proj.path, "training_data", "settings")
+        ]:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                files += [os.path.join(dirpath, f) for f in sorted(filenames)]
+        return files
+
+
+_query_caches = dict()
+
+
+def query_cache(proj):
+    """Return the QueryCache shared by all Selection of a CASM project
+
+    Arguments
+    ---------
+    proj: casm.project.Project
+        The project to query
+
+    Returns
+    -------
+    cache: casm.project.query.QueryCache
+        The query cache for the project at `proj.path`. If `proj` is a different Project instance than the one the cache was created with, the cache uses `proj` to run queries.
+    """
+    cache = _query_caches.get(proj.path)
+    if cache is None:
+        cache = QueryCache(proj)
+        _query_caches[proj.path] = cache
+    cache.proj = proj
+    return cache
+
+
+def _file_hash(path):
+    """Return sha1 of file contents, or None if path is not a file"""
+    if not os.path.isfile(path):
+        return None
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _stat_signature(files):
+    """Return tuple of (path, mtime, size) for files that exist"""
+    sig = []
+    for f in files:
+        try:
+            st = os.stat(f)
+        except OSError:
+            continue
+        sig.append((f, st.st_mtime, st.st_size))
+    return tuple(sig)
+
+
+def _split_columns(df, columns):
+    """Split `casm query` output by column expression
+
+    Output columns are in the order of the column expressions, and are named either 'expr' or 'expr(...)'. Returns a dict of expr:pandas.DataFrame, or None if the output columns can not be attributed to the expressions.
+    """
+    result = dict()
+    names = list(df.columns)
+    i = 0
+    for col in columns:
+        begin = i
+        while i < len(names) and (names[i] == col
+                                  or names[i].startswith(col + "(")):
+            i += 1
+        if i == begin:
+            return None
+        result[col] = df.iloc[:, begin:i]
+    if i != len(names):
+        return None
+    return result
@@ -19,7 +19,7 @@ import pandas
 import six
 
 from casm.project.project import Project
-from casm.project.query import query
+from casm.project.query import query, query_cache, read_query_output
 from casm.misc import compat
 
 
@@ -107,12 +107,7 @@ class Selection(object):
             elif self._is_json():
                 self._data = pandas.read_json(self.path, orient='records')
             else:
-                with open(self.path, compat.pandas_rmode()) as f:
-                    if compat.peek(f) == '#':
-                        f.read(1)
-                    self._data = pandas.read_csv(f,
-                                                 sep=compat.str(' +'),
-                                                 engine='python')
+                self._data = read_query_output(self.path)
 
             self._clean_data()
 
@@ -231,11 +226,13 @@ class Selection(object):
     def _clean_data(self):
         self.astype('selected', bool)
 
-    def query(self, columns, force=False, verbose=False):
+    def query(self, columns, force=False, verbose=False, cache=True):
         """ Query requested columns and store them in 'data'.
 
         Will not overwrite columns that already exist, unless 'force'==True. Will query data for all configurations, whether selected or not, if `self.all == True`.
 
+        By default, results are shared with other Selection of the same project through `casm.project.query.query_cache`, and are only re-queried if the selection file or relevant project files have changed. With `force==True` the columns are always re-queried.
+
         Arguments
         ---------
         columns: List(str)
@@ -246,6 +243,9 @@ class Selection(object):
 
         verbose: bool
             How much to print to stdout.
+
+        cache: bool
+            If True, use cached query results if still valid, unless `force==True`, and save results in the cache.
         """
 
         if force == False:
@@ -269,12 +269,19 @@ class Selection(object):
         if len(_col) == 0:
             return
 
-        df = query(self.proj,
-                   _col,
-                   self.path,
-                   self.type,
-                   verbatim=True,
-                   all=self.all)
+        if cache:
+            df = query_cache(self.proj).query(_col,
+                                              self.path,
+                                              self.type,
+                                              all=self.all,
+                                              force=force)
+        else:
+            df = query(self.proj,
+                       _col,
+                       self.path,
+                       self.type,
+                       verbatim=True,
+                       all=self.all)
 
         if verbose:
             print("#   DONE\n")
@@ -15,7 +15,7 @@ from casm.project import Project, Selection
 # casm-calc --configs selection
 #           --type "config", "diff_trans", etc.
 #           --calctype "default"
-#           --setup /  --run / --submit / --report
+#           --setup /  --run / --submit / --report / --status
 
 configs_help = """
 CASM selection file or one of 'CALCULATED', 'ALL', or 'MASTER' (Default)
@@ -49,6 +49,38 @@ report_help = """
 Report calculation results (print calc.properties.json file) for all selected configurations.
 """
 
+db_index_help = """
+With --submit, update the job database from the queue once and look up the jobs for all selected configurations at once.
+"""
+
+pack_help = """
+With --submit, submit jobs that each run several configurations, grouped so that the total estimated cost (number of atoms times number of k-points) of each job is at most PACK.
+"""
+
+n_concurrent_help = """
+With --submit --pack, number of configurations run at the same time in each job (Default=1).
+"""
+
+local_help = """
+With --run, run calculations in separate processes, --n_jobs at a time, from a work queue file in the project's .casm directory, so that an interrupted run continues where it stopped.
+"""
+
+ncpus_help = """
+With --run --local, number of CPUs used by each calculation, if 'ncpus' is not set in calc.json. Default=number of CPUs / --n_jobs.
+"""
+
+status_help = """
+Print the status, current task, number of runs, and last energy of the calculation for all selected configurations, without writing anything.
+"""
+
+n_jobs_help = """
+Number of workers used by --status, --report, and --run --local (Default=1). If -1, one per CPU is used.
+"""
+
+executor_help = """
+How --status workers are run: 'thread' (Default) or 'process'.
+"""
+
 available_calculators = {
     "vasp": {
         "relax": vaspwrapper.Relax
@@ -90,6 +122,30 @@ def main(argv=None):
                         help=report_help,
                         action="store_true",
                         default=False)
+    parser.add_argument('--db_index',
+                        help=db_index_help,
+                        action="store_true",
+                        default=False)
+    parser.add_argument('--pack', help=pack_help, type=float, default=None)
+    parser.add_argument('--n_concurrent',
+                        help=n_concurrent_help,
+                        type=int,
+                        default=1)
+    parser.add_argument('--local',
+                        help=local_help,
+                        action="store_true",
+                        default=False)
+    parser.add_argument('--ncpus', help=ncpus_help, type=int, default=None)
+    parser.add_argument('--status',
+                        help=status_help,
+                        action="store_true",
+                        default=False)
+    parser.add_argument('--n_jobs', help=n_jobs_help, type=int, default=1)
+    parser.add_argument('--executor',
+                        help=executor_help,
+                        type=str,
+                        default="thread",
+                        choices=["thread", "process"])
     args = parser.parse_args(argv)
 
     if args.path is None:
@@ -118,13 +174,25 @@ def main(argv=None):
             calculator.setup()
 
         elif args.submit:
-            calculator.submit()
+            if args.pack is not None:
+                calculator.submit_packed(args.pack,
+                                         n_concurrent=args.n_concurrent)
+            else:
+                calculator.submit(db_index=args.db_index)
 
         elif args.run:
-            calculator.run()
+            if args.local:
+                calculator.run_local(n_workers=args.n_jobs, ncpus=args.ncpus)
+            else:
+                calculator.run()
 
         elif args.report:
-            calculator.report()
+            calculator.report(n_jobs=args.n_jobs)
+
+        elif args.status:
+            status = calculator.status(n_jobs=args.n_jobs,
+                                       executor=args.executor)
+            print(status.to_string(index=False))
 
     except Exception as e:
         raise e
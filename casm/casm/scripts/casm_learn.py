@@ -309,15 +309,16 @@ def main(argv=None):
       
       
       When you run 'casm-learn' with a new problem specification the first time, 
-      it generates a "problem specs" file that stores the training data, weights, 
-      and cross-validation train/test sets. Then, when running subsequent times,
-      the data can be loaded more quickly, and the cross-validation can be 
-      performed using the same train/test sets. 'casm-learn' will attempt to
-      prevent you from re-running with a different problem specification so that
-      solutions can be compared via their cv score in an "apples-to-apples" 
-      manner. The default name for the "specs" file is determined from the input
-      filename. For example, 'my_input_specs.pkl' is used if the input file is 
-      named 'my_input.json'. See 'casm-learn --settings-format' for more help.
+      it generates a "problem specs" directory that stores the training data, 
+      weights, and cross-validation train/test sets. Then, when running 
+      subsequent times, the data can be loaded more quickly, and the 
+      cross-validation can be performed using the same train/test sets. 
+      'casm-learn' will attempt to prevent you from re-running with a different
+      problem specification so that solutions can be compared via their cv score
+      in an "apples-to-apples" manner. The default name for the "specs" 
+      directory is determined from the input filename. For example, 
+      'my_input_specs' is used if the input file is named 'my_input.json'. See 
+      'casm-learn --settings-format' for more help.
       
       
       The '--checkspecs' option can be used to write output files with the 
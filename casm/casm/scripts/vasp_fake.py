@@ -0,0 +1,77 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import argparse
+import os
+import shutil
+import sys
+import time
+
+import casm.vasp.io
+
+description = """
+Stand-in for the vasp executable, for testing casm.vasp and casm-calc without
+VASP. Run in a VASP job directory, it reads POSCAR, copies it to CONTCAR, and
+writes a complete OUTCAR and OSZICAR with one ionic step and zero forces, so
+that a casm.vasp.Relax converges after two relaxation runs and a final
+constant volume run. Use it by setting "vasp_cmd" to "vasp.fake" in calc.json.
+"""
+
+energy_help = """
+Energy per atom written to OSZICAR (Default=-1.0).
+"""
+
+sleep_help = """
+Seconds to wait before writing output, to simulate run time (Default=0).
+"""
+
+
+def write_output(jobdir, energy_per_atom=-1.0):
+    """Write CONTCAR, OSZICAR, and OUTCAR for the POSCAR in 'jobdir'"""
+    n_atoms = len(casm.vasp.io.Poscar(os.path.join(jobdir, "POSCAR")).basis)
+    shutil.copyfile(os.path.join(jobdir, "POSCAR"),
+                    os.path.join(jobdir, "CONTCAR"))
+
+    energy = energy_per_atom * n_atoms
+    with open(os.path.join(jobdir, "OSZICAR"), 'w') as f:
+        f.write("       N       E                     dE             d eps"
+                "       ncg     rms          rms(c)\n")
+        f.write("DAV:   1    {0:.8E}   {0:.5E}   0.00000E+00   100   0.000E+00"
+                "\n".format(energy))
+        f.write(
+            "   1 F= {0:.8E} E0= {0:.8E}  d E =0.000000E+00\n".format(energy))
+
+    with open(os.path.join(jobdir, "OUTCAR"), 'w') as f:
+        f.write(" vasp.fake\n")
+        f.write("   ISPIN  =      1    spin polarized calculation?\n")
+        f.write("   LORBIT =      0    0 simple, 1 ext, 2 COOP (PROOUT)\n")
+        f.write(" POSITION                                       TOTAL-FORCE "
+                "(eV/Angst)\n")
+        f.write(" " + "-" * 83 + "\n")
+        for i in range(n_atoms):
+            f.write("      0.00000      0.00000      0.00000         0.000000"
+                    "      0.000000      0.000000\n")
+        f.write(" " + "-" * 83 + "\n")
+        f.write("                            Total CPU time used (sec):"
+                "        0.000\n")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--energy', help=energy_help, type=float, default=-1.0)
+    parser.add_argument('--sleep', help=sleep_help, type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    print(" running on    1 total cores (vasp.fake)")
+    sys.stdout.flush()
+    time.sleep(args.sleep)
+    write_output(os.getcwd(), args.energy)
+    print(" writing wavefunctions")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from casm.vasp.error import \
     NoConvergeError,\
     FreezeError,\
     error_check,\
+    ErrorMonitor,\
     crash_check
 from casm.vasp.run import \
     complete_job,\
@@ -23,5 +24,6 @@ __all__ = [
     'io', 'VaspError', 'VaspWarning', 'continue_job', 'IbzkptError',
     'FEXCFError', 'SubSpaceMatrixError', 'InisymError', 'SgrconError',
     'WavecarError', 'NbandsError', 'NoConvergeError', 'FreezeError',
-    'error_check', 'crash_check', 'complete_job', 'run', 'Relax', 'Converge'
+    'error_check', 'ErrorMonitor', 'crash_check', 'complete_job', 'run',
+    'Relax', 'Converge'
 ]
@@ -105,6 +105,15 @@ class Converge(object):
             self.settings["compress"] = []
         if "err_types" not in self.settings:
             self.settings["err_types"] = ['SubSpaceMatrixError']
+        if "supervisor" not in self.settings or self.settings[
+                "supervisor"] is None:
+            self.settings["supervisor"] = "poll"
+        if "compresslevel" not in self.settings or self.settings[
+                "compresslevel"] is None:
+            self.settings["compresslevel"] = 9
+        if "compress_threads" not in self.settings or self.settings[
+                "compress_threads"] is None:
+            self.settings["compress_threads"] = 1
 
         print("VASP Converge object constructed\n")
         sys.stdout.flush()
@@ -177,7 +186,7 @@ class Converge(object):
         outcarfile = os.path.join(self.finaldir, "OUTCAR")
         if not os.path.isfile(outcarfile):
             return False
-        if not io.Outcar(outcarfile).complete():
+        if not io.outcar_complete(outcarfile):
             return False
         return True
 
@@ -197,10 +206,10 @@ class Converge(object):
             if self.settings["nrg_convergence"] != None:
                 if io.job_complete(self.rundir[-1]) and io.job_complete(
                         self.rundir[-2]):
-                    osz_1 = io.Oszicar(os.path.join(self.rundir[-1],
-                                                    "OSZICAR"))
-                    osz_2 = io.Oszicar(os.path.join(self.rundir[-2],
-                                                    "OSZICAR"))
+                    osz_1 = io.cached_parse(
+                        io.Oszicar, os.path.join(self.rundir[-1], "OSZICAR"))
+                    osz_2 = io.cached_parse(
+                        io.Oszicar, os.path.join(self.rundir[-2], "OSZICAR"))
                     if abs(osz_1.E[-1] -
                            osz_2.E[-1]) < self.settings["nrg_convergence"]:
                         return True
@@ -285,7 +294,8 @@ class Converge(object):
                              command=self.settings["vasp_cmd"],
                              ncpus=self.settings["ncpus"],
                              kpar=self.settings["kpar"],
-                             err_types=self.settings["err_types"])
+                             err_types=self.settings["err_types"],
+                             supervisor=self.settings["supervisor"])
 
                 # if no errors, continue
                 if result is None or self.not_converging():
@@ -298,7 +308,8 @@ class Converge(object):
                                 # This is an error but I'm not sure what to do about it
                                 pass
                             else:
-                                init_outcar = io.Outcar(outcarfile)
+                                init_outcar = io.Outcar(
+                                    outcarfile, fields=["complete", "ngx"])
                                 if not init_outcar.complete:
                                     # This is an error but I'm not sure what to do about it
                                     pass
@@ -396,10 +407,9 @@ class Converge(object):
         if io.job_complete(self.rundir[-1]):
 
             # if it is a final constant volume run
-            if io.get_incar_tag("SYSTEM", self.rundir[-1]) != None:
-                if io.get_incar_tag("SYSTEM",
-                                    self.rundir[-1]).split()[-1].strip().lower(
-                                    ) == "final":
+            system = io.get_incar_tag("SYSTEM", self.rundir[-1])
+            if system != None:
+                if system.split()[-1].strip().lower() == "final":
                     # if io.get_incar_tag("ISIF", self.rundir[-1]) == 2 and \
                     #    io.get_incar_tag("NSW", self.rundir[-1]) == 0 and \
                     #    io.get_incar_tag("ISMEAR", self.rundir[-1]) == -5:
@@ -407,9 +417,8 @@ class Converge(object):
 
             # elif constant volume run (but not the final one)
             if io.get_incar_tag("ISIF", self.rundir[-1]) in [0, 1, 2]:
-                if io.get_incar_tag("NSW", self.rundir[-1]) == len(
-                        io.Oszicar(os.path.join(self.rundir[-1],
-                                                "OSZICAR")).E):
+                if io.get_incar_tag("NSW", self.rundir[-1]) == io.ionic_steps(
+                        self.rundir[-1]):
                     return ("incomplete", "relax"
                             )  # static run hit NSW limit and so isn't "done"
                 else:
@@ -38,6 +38,8 @@ def continue_job(jobdir, contdir, settings):
                     It also copies either CONTCAR, or if that does not exist POSCAR.
          move: Files moved from 'jobdir' to 'contdir'
          keep: Files (along with those in 'copy') to keep in 'jobdir'. The rest are removed.
+         compresslevel: gzip compression level, 1 (fastest) to 9 (default)
+         compress_threads: number of threads used to compress each file (default 1)
 
          Do not include "POSCAR" or "CONTCAR" in 'move' or 'copy'. jobdir/CONTCAR is copied
          to contdir/POSCAR, unless it does not exist, in which case jobdir/POSCAR is copied
@@ -56,6 +58,8 @@ def continue_job(jobdir, contdir, settings):
     remove = list(set(settings['remove']))
     compress = list(set(settings['compress']))
     backup = list(set(settings['backup']))
+    compresslevel = settings.get("compresslevel", 9)
+    compress_threads = settings.get("compress_threads", 1)
 
     # Check that necessary files are being moved/copied: INCAR, POTCAR, KPOINTS
     if not "POTCAR" in (move + copy):
@@ -166,14 +170,14 @@ def continue_job(jobdir, contdir, settings):
     print(" backup:")
     for file in backup:
         if os.path.isfile(os.path.join(jobdir, file)):
-            print(file, end=' ')
-            # Open target file, target file.gz
-            f_in = open(os.path.join(jobdir, file), 'rb')
-            f_out = gzip.open(os.path.join(jobdir, file) + '_BACKUP.gz', 'wb')
-            # Compress, close files
-            f_out.writelines(f_in)
-            f_out.close()
-            f_in.close()
+            print(io.fileops.timing(
+                file,
+                *io.fileops.gzip_file(os.path.join(jobdir, file),
+                                      os.path.join(jobdir, file) +
+                                      '_BACKUP.gz',
+                                      compresslevel=compresslevel,
+                                      threads=compress_threads)),
+                  end=' ')
     print("")
 
     # copy CONTCAR/POSCAR/etc
@@ -194,23 +198,30 @@ def continue_job(jobdir, contdir, settings):
     # move files
     print("  mv:", end=' ')
     for file in move:
-        print(file, end=' ')
         # This prevents a missing file from crashing the vasprun (e.g. a missing WAVECAR)
         if os.path.isfile(os.path.join(jobdir, file)):
-            os.rename(os.path.join(jobdir, file), os.path.join(contdir, file))
+            print(io.fileops.timing(
+                file,
+                *io.fileops.move_file(os.path.join(jobdir, file),
+                                      os.path.join(contdir, file))),
+                  end=' ')
         else:
+            print(file, end=' ')
             print("Could not find file %s, skipping!" % file)
     print("")
 
     # copy files
     print("  cp:", end=' ')
     for file in copy:
-        print(file, end=' ')
         # This prevents a missing file from crashing the vasprun (e.g. a missing WAVECAR)
         if os.path.isfile(os.path.join(jobdir, file)):
-            shutil.copyfile(os.path.join(jobdir, file),
-                            os.path.join(contdir, file))
+            print(io.fileops.timing(
+                file,
+                *io.fileops.copy_file(os.path.join(jobdir, file),
+                                      os.path.join(contdir, file))),
+                  end=' ')
         else:
+            print(file, end=' ')
             print("Could not find file %s, skipping!" % file)
     print("")
 
@@ -226,16 +237,13 @@ def continue_job(jobdir, contdir, settings):
     print(" gzip:", end=' ')
     for file in compress:
         if os.path.isfile(os.path.join(jobdir, file)):
-            print(file, end=' ')
-            # Open target file, target file.gz
-            f_in = open(os.path.join(jobdir, file), 'rb')
-            f_out = gzip.open(os.path.join(jobdir, file) + '.gz', 'wb')
-            # Compress, close files
-            f_out.writelines(f_in)
-            f_out.close()
-            f_in.close()
-            # Remove original target file
-            os.remove(os.path.join(jobdir, file))
+            print(io.fileops.timing(
+                file,
+                *io.fileops.gzip_file(os.path.join(jobdir, file),
+                                      compresslevel=compresslevel,
+                                      threads=compress_threads,
+                                      remove=True)),
+                  end=' ')
     print("")
 
     # check if the run is a neb job and copy the image CONTCAR to POSCAR
@@ -265,8 +273,8 @@ def continue_job(jobdir, contdir, settings):
                 print(file, end='')
                 # This prevents a missing file from crashing the vasprun (e.g. a missing WAVECAR)
                 if os.path.isfile(os.path.join(jobdir, img_dir, file)):
-                    os.rename(os.path.join(jobdir, img_dir, file),
-                              os.path.join(contdir, img_dir, file))
+                    io.fileops.move_file(os.path.join(jobdir, img_dir, file),
+                                         os.path.join(contdir, img_dir, file))
                 elif file not in ["POTCAR"]:
                     print("Could not find file %s, skipping!" % file)
                 print("")
@@ -277,8 +285,8 @@ def continue_job(jobdir, contdir, settings):
                 print(file, end='')
                 # This prevents a missing file from crashing the vasprun (e.g. a missing WAVECAR)
                 if os.path.isfile(os.path.join(jobdir, img_dir, file)):
-                    shutil.copyfile(os.path.join(jobdir, img_dir, file),
-                                    os.path.join(contdir, img_dir, file))
+                    io.fileops.copy_file(os.path.join(jobdir, img_dir, file),
+                                         os.path.join(contdir, img_dir, file))
                 elif file not in ["INCAR", "KPOINTS"]:
                     print("Could not find file %s, skipping!" % file)
             print("")
@@ -295,17 +303,14 @@ def continue_job(jobdir, contdir, settings):
             print(" gzip:", end='')
             for file in compress:
                 if os.path.isfile(os.path.join(jobdir, img_dir, file)):
-                    print(file, end='')
-                    # Open target file, target file.gz
-                    f_in = open(os.path.join(jobdir, img_dir, file), 'rb')
-                    f_out = gzip.open(
-                        os.path.join(jobdir, img_dir, file) + '.gz', 'wb')
-                    # Compress, close files
-                    f_out.writelines(f_in)
-                    f_out.close()
-                    f_in.close()
-                    # Remove original target file
-                    os.remove(os.path.join(jobdir, img_dir, file))
+                    print(io.fileops.timing(
+                        file,
+                        *io.fileops.gzip_file(os.path.join(
+                            jobdir, img_dir, file),
+                                              compresslevel=compresslevel,
+                                              threads=compress_threads,
+                                              remove=True)),
+                          end='')
             print("")
             i += 1
 
@@ -358,7 +363,7 @@ class _FreezeError(object):
     ___metaclass__ = abc.ABCMeta
 
     @abc.abstractmethod
-    def error(self, line=None, jobdir=None):
+    def error(self, line=None, jobdir=None, outcar=None, last_modified=None):
         """ Check for the error in the OUTCAR """
 
     @abc.abstractmethod
@@ -403,7 +408,8 @@ class IbzkptError(_RunError):
 
         if kpt.automode[0].lower() == "a":
             old_kpt = kpt.subdivisions[0]
-            ocr = io.Outcar(os.path.join(err_jobdir, "OUTCAR"))
+            ocr = io.Outcar(os.path.join(err_jobdir, "OUTCAR"),
+                            fields=["kpts"])
             max_k = max(ocr.kpts)
             kpt.automode = "GAMMA"
             kpt.subdivisions = [max_k, max_k, max_k]
@@ -674,34 +680,48 @@ class FreezeError(_FreezeError):
         return "VASP appears to have frozen"
 
     @staticmethod
-    def error(line=None, jobdir=None):  #pylint: disable=unused-argument
+    def error(line=None, jobdir=None, outcar=None, last_modified=None):  #pylint: disable=unused-argument
         """ Check if VASP appears frozen
 
             Returns true if:
             1) no file has been modified for 5 minutes
             2) 'LOOP+' exists in OUTCAR and no output file has been modified
             in 5x the time for the slowest loop
+
+            If 'outcar' is given, it is used for 'complete' and 'slowest_loop'
+            instead of parsing the OUTCAR in 'jobdir', as when it is updated
+            incrementally by ErrorMonitor.
+
+            If 'last_modified' is given, it is used as the (filename, time) of
+            the most recently modified file in 'jobdir', as tracked by
+            io.JobWatcher, instead of checking the modification time of every
+            file in 'jobdir'.
         """
 
         # Check if any files modified in last 300 s
-        most_recent = None
-        most_recent_file = None
-        for f in os.listdir(jobdir):
-            t = time.time() - os.path.getmtime(os.path.join(jobdir, f))
-            if most_recent is None:
-                most_recent = t
-                most_recent_file = f
-            elif t < most_recent:
-                most_recent = t
-                most_recent_file = f
+        if last_modified is None:
+            most_recent_file = None
+            most_recent = None
+            for f in os.listdir(jobdir):
+                t = time.time() - os.path.getmtime(os.path.join(jobdir, f))
+                if most_recent is None or t < most_recent:
+                    most_recent = t
+                    most_recent_file = f
+        else:
+            most_recent_file, t = last_modified
+            most_recent = None if t is None else time.time() - t
 
+        if most_recent is None:
+            return False
         print("Most recent file output (" + most_recent_file + "):",
               most_recent, " seconds ago.")
         sys.stdout.flush()
-        if t < 300:
+        if most_recent < 300:
             return False
 
-        outcar = io.Outcar(os.path.join(jobdir, "OUTCAR"))
+        if outcar is None:
+            outcar = io.Outcar(os.path.join(jobdir, "OUTCAR"),
+                               fields=["complete", "slowest_loop"])
         if outcar.complete:
             print("outcar.complete:", outcar.complete)
             sys.stdout.flush()
@@ -806,12 +826,140 @@ def error_check_neb(jobdir, stdoutfile, err_types):
         return err
 
 
+class ErrorMonitor(object):
+    """ Check a running vasp job for errors, reading only new output
+
+        Equivalent to repeated calls to error_check (or error_check_neb), but
+        the stdout file and OUTCAR are watched with io.FileWatcher, so each
+        call to 'check' only parses the lines appended since the previous
+        call. Errors found in stdout are remembered until the stdout file is
+        truncated or replaced.
+
+        FileWatcher may split OUTCAR between reads at any complete line, so
+        only the single-line OUTCAR fields "complete" and "slowest_loop" are
+        read here, never multi-line blocks such as "forces" or "mag".
+
+        Contains:
+            self.outcar = dict of {freeze check dir: io.Outcar}, with
+                'complete' and 'slowest_loop' updated incrementally
+    """
+    def __init__(self, jobdir, stdoutfile, err_types, is_neb=False):
+        """
+        Args:
+            jobdir: vasp job directory
+            stdoutfile: path to the vasp stdout file
+            err_types: List of error types to check for, as for error_check
+            is_neb: if True, check for freeze errors in each image
+                directory, as for error_check_neb
+        """
+        self.jobdir = jobdir
+
+        err_objs = {}
+        for i_err in _RunError.__subclasses__():
+            err_objs[i_err.__name__] = i_err()
+        if err_types is None:
+            self.possible = [SubSpaceMatrixError()]
+        else:
+            for s in err_types:
+                if s not in err_objs.keys():
+                    raise VaspError('Invalid err_type: %s' % s)
+            self.possible = [err_objs[s] for s in err_types]
+        self.possible_freeze = [
+            i_err() for i_err in _FreezeError.__subclasses__()
+        ]
+
+        if is_neb:
+            self.freeze_dirs = [
+                os.path.join(jobdir,
+                             str(i).zfill(2)) for i in range(1, 100)
+                if os.path.exists(os.path.join(jobdir,
+                                               str(i).zfill(2)))
+            ][:-1]
+        else:
+            self.freeze_dirs = [jobdir]
+
+        self.run_err = dict()
+        self.stdout_watcher = io.FileWatcher(stdoutfile)
+        self.outcar_watcher = dict()
+        self.outcar = dict()
+        for d in self.freeze_dirs:
+            self.outcar_watcher[d] = io.FileWatcher(os.path.join(d, "OUTCAR"))
+            self.outcar[d] = self._new_outcar(d)
+
+    @staticmethod
+    def _new_outcar(d):
+        return io.Outcar(os.path.join(d, "OUTCAR"),
+                         fields=["complete", "slowest_loop"],
+                         read=False)
+
+    def _update(self):
+        """ Parse new output """
+        lines = self.stdout_watcher.read()
+        if self.stdout_watcher.restarted:
+            self.run_err = dict()
+        for line in lines:
+            for p in self.possible:
+                if not p.__class__.__name__ in self.run_err:
+                    if p.error(line=line, jobdir=self.jobdir):
+                        self.run_err[p.__class__.__name__] = p
+
+        for d in self.freeze_dirs:
+            lines = self.outcar_watcher[d].read()
+            if self.outcar_watcher[d].restarted:
+                self.outcar[d] = self._new_outcar(d)
+            self.outcar[d].parse(lines)
+
+    def _freeze_error(self, p, watcher=None, rescan=False):
+        """ Return True if freeze error 'p' is found in every freeze check
+            directory """
+        if len(self.freeze_dirs) == 0:
+            return False
+        for d in self.freeze_dirs:
+            last_modified = None
+            if watcher is not None:
+                last_modified = watcher.last_modified(d, rescan=rescan)
+            if not p.error(line=None,
+                           jobdir=d,
+                           outcar=self.outcar[d],
+                           last_modified=last_modified):
+                return False
+        return True
+
+    def check(self, freeze=True, watcher=None):
+        """ Check for errors, returning a dict of errors found, or None
+
+            Args:
+                freeze: if True (default), also check for freeze errors
+                watcher: optional io.JobWatcher watching the freeze check
+                    directories, used for the time of the most recent output
+        """
+        self._update()
+        err = dict(self.run_err)
+        if not freeze:
+            return err if len(err) else None
+
+        # Error to check for once
+        for p in self.possible_freeze:
+            freeze_error = self._freeze_error(p, watcher)
+            if freeze_error and watcher is not None \
+                    and watcher.backend == "inotify":
+                # writes from other nodes to a network filesystem produce no
+                # inotify events, so confirm with the file modification times
+                freeze_error = self._freeze_error(p, watcher, rescan=True)
+            if freeze_error:
+                err[p.__class__.__name__] = p
+
+        if len(err) == 0:
+            return None
+        else:
+            return err
+
+
 def crash_check(jobdir, stdoutfile, crash_types):
     """ Check vasp stdout for evidence of a crash """
     err = None
     possible = [i_err() for i_err in _CrashError.__subclasses__()]
-    ocar = io.Outcar(os.path.join(jobdir, "OUTCAR"))
-    if ocar.complete:
+    if io.outcar_complete(os.path.join(jobdir, "OUTCAR")):
         return None
     # Error to check line by line, only track most-recent error
     sout = open(stdoutfile, 'r')
@@ -837,7 +985,8 @@ def run(jobdir=None,
         poll_check_time=5.0,
         err_check_time=60.0,
         err_types=None,
-        is_neb=False):
+        is_neb=False,
+        supervisor="poll"):
     """ Run vasp using subprocess.
 
         The 'command' is executed in the directory 'jobdir'.
@@ -858,6 +1007,8 @@ def run(jobdir=None,
             poll_check_time: how frequently to check if the vasp job is completed
             err_check_time: how frequently to parse vasp output to check for errors
             err_types:  List of error types to check for. Supported errors: 'IbzkptError', 'SubSpaceMatrixError', 'NbandsError'. Default: None, in which case only SubSpaceMatrixErrors are checked.
+            is_neb:     If True, check for freeze errors in each image directory
+            supervisor: How to wait on the vasp job: "poll" (default), "inotify", or "auto", as for casm.vasp.run
 
     """
     print("Begin vasp run:")
@@ -911,57 +1062,74 @@ def run(jobdir=None,
     serr = open(os.path.join(jobdir, stderr), 'w')
     err = None
     p = subprocess.Popen(command.split(), stdout=sout, stderr=serr)
+    monitor = ErrorMonitor(jobdir,
+                           os.path.join(jobdir, stdout),
+                           err_types,
+                           is_neb=is_neb)
+    stdoutfile = os.path.abspath(os.path.join(jobdir, stdout))
+    watcher = None
+    if supervisor != "poll":
+        watch_dirs = [jobdir] + [d for d in monitor.freeze_dirs if d != jobdir]
+        watcher = io.JobWatcher(p, watch_dirs, backend=supervisor)
 
     # wait for process to end, and periodically check for errors
     poll = p.poll()
     last_check = time.time()
     stopcar_time = None
     while poll is None:
-        time.sleep(poll_check_time)
+        if watcher is None:
+            time.sleep(poll_check_time)
+            modified = None
+        else:
+            modified = watcher.wait(poll_check_time)
 
+        checked = False
         if time.time() - last_check > err_check_time:
             last_check = time.time()
-            if is_neb:
-                err = error_check_neb(jobdir, os.path.join(jobdir, stdout),
-                                      err_types)
-            else:
-                err = error_check(jobdir, os.path.join(jobdir, stdout),
-                                  err_types)
-            if err != None:
-                # FreezeErrors are fatal and usually not helped with STOPCAR
-                if "FreezeError" in err.keys():
-                    print("  VASP is frozen, killing job")
-                    sys.stdout.flush()
-                    # Sometimes p.kill doesn't work if the process is on multiple nodes
-                    os.kill(p.pid, signal.SIGKILL)
-                    p.kill()
-                    # If the job is re-invoked (e.g. via mpirun or srun) too quickly
-                    #   after the previous job ended, infinitiband clusters can have
-                    #   some issues with resource allocation. A 30s sleep solves this.
-                    time.sleep(30)
-                # Other errors can be killed with STOPCAR, which is safer
-                elif stopcar_time is None:
-                    print("  Found errors:", end='')
-                    for e in err:
-                        print(e, end='')
-                    print("\n  Killing job with STOPCAR")
-                    sys.stdout.flush()
-                    io.write_stopcar('e', jobdir)
-                    stopcar_time = time.time()
-                    time.sleep(30)
-                # If the STOPCAR exists, wait 5 min before manually killing the job
-                elif time.time() - stopcar_time > 300:
-                    print("  VASP is non-responsive, killing job")
-                    sys.stdout.flush()
-                    os.kill(p.pid, signal.SIGKILL)
-                    p.kill()
-                    # If the job is re-invoked (e.g. via mpirun or srun) too quickly
-                    #   after the previous job ended, infinitiband clusters can have
-                    #   some issues with resource allocation. A 30s sleep solves this.
-                    time.sleep(30)
+            err = monitor.check(watcher=watcher)
+            checked = True
+        elif modified is not None and stdoutfile in modified:
+            # with file events, new stdout is checked as soon as it is written
+            err = monitor.check(freeze=False)
+            checked = True
+        if checked and err != None:
+            # FreezeErrors are fatal and usually not helped with STOPCAR
+            if "FreezeError" in err.keys():
+                print("  VASP is frozen, killing job")
+                sys.stdout.flush()
+                # Sometimes p.kill doesn't work if the process is on multiple nodes
+                os.kill(p.pid, signal.SIGKILL)
+                p.kill()
+                # If the job is re-invoked (e.g. via mpirun or srun) too quickly
+                #   after the previous job ended, infinitiband clusters can have
+                #   some issues with resource allocation. A 30s sleep solves this.
+                time.sleep(30)
+            # Other errors can be killed with STOPCAR, which is safer
+            elif stopcar_time is None:
+                print("  Found errors:", end='')
+                for e in err:
+                    print(e, end='')
+                print("\n  Killing job with STOPCAR")
+                sys.stdout.flush()
+                io.write_stopcar('e', jobdir)
+                stopcar_time = time.time()
+                time.sleep(30)
+            # If the STOPCAR exists, wait 5 min before manually killing the job
+            elif time.time() - stopcar_time > 300:
+                print("  VASP is non-responsive, killing job")
+                sys.stdout.flush()
+                os.kill(p.pid, signal.SIGKILL)
+                p.kill()
+                # If the job is re-invoked (e.g. via mpirun or srun) too quickly
+                #   after the previous job ended, infinitiband clusters can have
+                #   some issues with resource allocation. A 30s sleep solves this.
+                time.sleep(30)
 
         poll = p.poll()
 
+    if watcher is not None:
+        watcher.close()
+
     # close output files
     sout.close()
     serr.close()
@@ -980,12 +1148,7 @@ def run(jobdir=None,
         else:
             err = crash_check(jobdir, os.path.join(jobdir, stdout), err_types)
         if err is None:
-            if is_neb:
-                err = error_check_neb(jobdir, os.path.join(jobdir, stdout),
-                                      err_types)
-            else:
-                err = error_check(jobdir, os.path.join(jobdir, stdout),
-                                  err_types)
+            err = monitor.check()
     if err != None:
         print("  Found errors:", end='')
         for e in err:
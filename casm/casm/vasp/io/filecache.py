@@ -0,0 +1,78 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import os
+from collections import OrderedDict
+
+
+class ParsedFileCache(object):
+    """Cache of parsed files, keyed on (parser, path) and validated by the file
+       (mtime, size, inode)
+
+       Objects returned from the cache are shared, so they should be treated
+       as read-only.
+
+       Contains:
+           self.maxsize = maximum number of parsed files kept
+           self.hits = number of times a cached parse was returned
+           self.misses = number of times a file was parsed
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, parser, filename):
+        """Return parser(filename), parsing the file only if it has not already
+           been parsed by 'parser' or has changed since.
+
+           If 'filename' can not be stat'd, parser(filename) is returned
+           without caching, so that the parser raises its usual error.
+        """
+        path = os.path.abspath(filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return parser(filename)
+        sig = (getattr(st, 'st_mtime_ns', st.st_mtime), st.st_size, st.st_ino)
+        key = (parser, path)
+
+        entry = self._data.get(key)
+        if entry is not None and entry[0] == sig:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        value = parser(filename)
+        self.misses += 1
+        self._data[key] = (sig, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Remove all cached parsed files"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# cache used by casm.vasp.io functions
+FILE_CACHE = ParsedFileCache()
+
+
+def cached_parse(parser, filename):
+    """Return parser(filename), using casm.vasp.io.filecache.FILE_CACHE
+
+       The returned object is shared, and should be treated as read-only.
+       Example: cached_parse(casm.vasp.io.Oszicar, "run.0/OSZICAR")
+    """
+    return FILE_CACHE.get(parser, filename)
+
+
+def clear_file_cache():
+    """Clear casm.vasp.io.filecache.FILE_CACHE"""
+    FILE_CACHE.clear()
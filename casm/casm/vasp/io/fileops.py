@@ -0,0 +1,146 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import collections
+import concurrent.futures
+import errno
+import gzip
+import os
+import shutil
+import time
+
+from casm.vasp.io.io import VaspIOError
+
+# size of the blocks read, compressed and written by gzip_file and copy_file
+CHUNKSIZE = 1 << 24
+
+
+def gzip_file(src,
+              dst=None,
+              compresslevel=9,
+              threads=1,
+              chunksize=CHUNKSIZE,
+              remove=False):
+    """Compress a file with gzip, reading it in large fixed-size chunks
+
+       Args:
+           src: path to the file to compress
+           dst: path of the compressed file. Default is src + ".gz".
+           compresslevel: gzip compression level, 1 (fastest) to 9 (smallest).
+               Default (or None) is 9.
+           threads: number of threads used to compress. If greater than 1,
+               each chunk is compressed in parallel as a separate gzip member
+               and the members are written in order, which gzip and
+               gzip.open read as a single file.
+           chunksize: size, in bytes, of the chunks read from src
+           remove: if True, remove src after compressing it
+
+       Returns:
+           (nbytes, seconds): the size of src and the time taken
+    """
+    start = time.time()
+    if dst is None:
+        dst = src + ".gz"
+    if compresslevel is None:
+        compresslevel = 9
+    nbytes = os.path.getsize(src)
+    with open(src, 'rb') as f_in:
+        if threads is None or threads <= 1:
+            with gzip.open(dst, 'wb', compresslevel=compresslevel) as f_out:
+                shutil.copyfileobj(f_in, f_out, chunksize)
+        else:
+            with open(dst, 'wb') as f_out, \
+                    concurrent.futures.ThreadPoolExecutor(threads) as pool:
+                # zlib releases the GIL while compressing, and at most
+                # 2*threads chunks are held in memory at once
+                pending = collections.deque()
+                for chunk in iter(lambda: f_in.read(chunksize), b""):
+                    pending.append(
+                        pool.submit(gzip.compress, chunk, compresslevel))
+                    if len(pending) >= 2 * threads:
+                        f_out.write(pending.popleft().result())
+                while pending:
+                    f_out.write(pending.popleft().result())
+                if nbytes == 0:
+                    f_out.write(gzip.compress(b"", compresslevel))
+    if remove:
+        os.remove(src)
+    return (nbytes, time.time() - start)
+
+
+def copy_file(src, dst, chunksize=CHUNKSIZE):
+    """Copy the contents of a file
+
+       os.copy_file_range is used where it is available, so that the copy is
+       done by the kernel, or as a reflink or server-side copy on filesystems
+       that support them. Otherwise, shutil.copyfile is used.
+
+       Args:
+           src: path to the file to copy
+           dst: path of the copy
+           chunksize: maximum size, in bytes, copied by each system call
+
+       Returns:
+           (nbytes, seconds): the size of src and the time taken
+    """
+    start = time.time()
+    nbytes = os.path.getsize(src)
+    if not hasattr(os, "copy_file_range") or not _copy_file_range(
+            src, dst, nbytes, chunksize):
+        shutil.copyfile(src, dst)
+    return (nbytes, time.time() - start)
+
+
+def _copy_file_range(src, dst, nbytes, chunksize):
+    """Copy with os.copy_file_range, returning False if it is not supported
+       for these files, before anything is copied, and raising VaspIOError if
+       the copy stops before 'nbytes' are copied"""
+    with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+        offset = 0
+        while offset < nbytes:
+            try:
+                n = os.copy_file_range(f_in.fileno(), f_out.fileno(),
+                                       min(chunksize, nbytes - offset))
+            except OSError as e:
+                if offset == 0 and e.errno in (errno.EXDEV, errno.ENOSYS,
+                                               errno.EINVAL, errno.EOPNOTSUPP,
+                                               errno.EBADF):
+                    return False
+                raise
+            if n == 0:
+                # some filesystems return 0 rather than raising if copying
+                # between these files is not supported
+                if offset == 0:
+                    return False
+                raise VaspIOError("Copying '" + src + "' to '" + dst +
+                                  "' stopped after " + str(offset) + " of " +
+                                  str(nbytes) + " bytes")
+            offset += n
+    return True
+
+
+def move_file(src, dst, chunksize=CHUNKSIZE):
+    """Move a file, with os.replace, or by copy_file and removing src if src
+       and dst are on different filesystems
+
+       Returns:
+           (nbytes, seconds): the size of src and the time taken
+    """
+    start = time.time()
+    nbytes = os.path.getsize(src)
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy_file(src, dst, chunksize)
+        shutil.copystat(src, dst)
+        os.remove(src)
+    return (nbytes, time.time() - start)
+
+
+def timing(filename, nbytes, seconds):
+    """Return 'filename (size, time)', for logging file operations"""
+    return "{0} ({1:.1f} MB, {2:.2f} s)".format(filename, nbytes / 1e6,
+                                                seconds)
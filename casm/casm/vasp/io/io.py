@@ -10,6 +10,7 @@ import sys
 from casm.vasp.io import oszicar, outcar, species, poscar
 from casm.vasp.io import kpoints as kp
 from casm.vasp.io import incar as inc
+from casm.vasp.io.filecache import cached_parse
 from casm.project.structure import StructureInfo
 
 VASP_INPUT_FILE_LIST = [
@@ -36,23 +37,30 @@ class VaspIOError(Exception):
 
 
 def job_complete(jobdir=None):
-    """Return True if vasp job at path 'jobdir' is complete"""
+    """Return True if vasp job at path 'jobdir' is complete
+
+       Only the end of the OUTCAR (or OUTCAR.gz) is read, see
+       casm.vasp.io.outcar.outcar_complete, and the result is cached until
+       the file changes.
+    """
     if jobdir is None:
         jobdir = os.getcwd()
     outcarfile = os.path.join(jobdir, "OUTCAR")
-    if (not os.path.isfile(outcarfile)) and (
-            not os.path.isfile(outcarfile + ".gz")):
-        return False
-    if outcar.Outcar(outcarfile).complete:
-        return True
-    return False
+    if not os.path.isfile(outcarfile):
+        outcarfile += ".gz"
+        if not os.path.isfile(outcarfile):
+            return False
+    return cached_parse(outcar.outcar_complete, outcarfile)
 
 
 def get_incar_tag(key, jobdir=None):
-    """Opens INCAR in 'jobdir' and returns 'key' value."""
+    """Opens INCAR in 'jobdir' and returns 'key' value.
+
+       The parsed INCAR is cached until the file changes.
+    """
     if jobdir is None:
         jobdir = os.getcwd()
-    tincar = inc.Incar(os.path.join(jobdir, "INCAR"))
+    tincar = cached_parse(inc.Incar, os.path.join(jobdir, "INCAR"))
     for k in tincar.tags:
         if key.lower() == k.lower():
             return tincar.tags[k]
@@ -86,40 +94,76 @@ def set_incar_tag(tag_dict, jobdir=None, name=None):
 
 
 def ionic_steps(jobdir=None):
-    """Find the number of ionic steps completed in 'jobdir'"""
+    """Find the number of ionic steps completed in 'jobdir'
+
+       The parsed OSZICAR is cached until the file changes.
+    """
     try:
-        toszicar = oszicar.Oszicar(os.path.join(jobdir, "OSZICAR"))
+        toszicar = cached_parse(oszicar.Oszicar,
+                                os.path.join(jobdir, "OSZICAR"))
         return len(toszicar.E)
     except:
         raise VaspIOError("Could not read number of ionic steps from " +
                           os.path.join(jobdir, "OSZICAR"))
 
 
+def _read_potcar(filename):
+    """Return the contents of a POTCAR file, as bytes"""
+    with open(filename, 'rb') as f:
+        return f.read()
+
+
+def potcar_dirs(poscar, species, sort=True):
+    """Return the list of species potcardir, in the order their POTCAR are
+       written by write_potcar"""
+    if sort == False:
+        return [species[name].potcardir for name in poscar.type_atoms]
+
+    # dict: key = alias, value = list of Sites
+    pos = poscar.basis_dict()
+
+    dirs = []
+    # for each alias
+    for alias in sorted(pos.keys()):
+        # find matching IndividualSpecies with write_potcar == True
+        for name in species:
+            if species[name].alias == alias and species[name].write_potcar:
+                dirs.append(species[name].potcardir)
+                break
+    return dirs
+
+
+# dict: key = tuple of POTCAR paths, value = (tuple of POTCAR bytes, POTCAR)
+_ASSEMBLED_POTCAR = dict()
+_ASSEMBLED_POTCAR_MAXSIZE = 256
+
+
+def assemble_potcar(potcardirs):
+    """Return the concatenated POTCAR files in the 'potcardirs', as bytes
+
+       Each POTCAR is read through casm.vasp.io.cached_parse, so it is only
+       read again if it changes, and the concatenated POTCAR is kept for each
+       sequence of POTCAR paths, so that calculations with the same species
+       reuse it.
+    """
+    paths = tuple(os.path.join(d, 'POTCAR') for d in potcardirs)
+    parts = tuple(cached_parse(_read_potcar, path) for path in paths)
+    entry = _ASSEMBLED_POTCAR.get(paths)
+    if entry is not None and len(entry[0]) == len(parts) and all(
+            a is b for a, b in zip(entry[0], parts)):
+        return entry[1]
+    if len(_ASSEMBLED_POTCAR) >= _ASSEMBLED_POTCAR_MAXSIZE:
+        _ASSEMBLED_POTCAR.clear()
+    potcar = b"".join(parts)
+    _ASSEMBLED_POTCAR[paths] = (parts, potcar)
+    return potcar
+
+
 def write_potcar(filename, poscar, species, sort=True):
     """ Write an appropriate POTCAR """
-    if sort == False:
-        with open(filename, 'w') as file:
-            for name in poscar.type_atoms:
-                with open(os.path.join(species[name].potcardir,
-                                       'POTCAR')) as potcar:
-                    file.write(potcar.read())
-    else:
-        # dict: key = alias, value = list of Sites
-        pos = poscar.basis_dict()
-
-        with open(filename, 'w') as file:
-            # for each alias
-            for alias in sorted(pos.keys()):
-                # find matching IndividualSpecies with write_potcar == True
-                for name in species:
-                    if species[name].alias == alias and species[
-                            name].write_potcar:
-                        # add to POTCAR file
-                        with open(
-                                os.path.join(species[name].potcardir,
-                                             'POTCAR')) as potcar:
-                            file.write(potcar.read())
-                        break
+    potcar = assemble_potcar(potcar_dirs(poscar, species, sort))
+    with open(filename, 'wb') as file:
+        file.write(potcar)
 
 
 def write_stopcar(mode='e', jobdir=None):
@@ -169,11 +213,13 @@ def write_vasp_input(dirpath,
     print("Setting up VASP input files:", dirpath)
 
     # read reference structure and kpoints
+    # settings files shared by many configurations are only read again if
+    # they change; the objects are not modified here
     print("  Reading reference KPOINTS:", ref_kpointsfile)
-    ref_kpoints = kp.Kpoints(ref_kpointsfile)
+    ref_kpoints = cached_parse(kp.Kpoints, ref_kpointsfile)
     if ref_structurefile != None:
         print("  Reading reference POSCAR:", ref_structurefile)
-        ref_structure = poscar.Poscar(ref_structurefile)
+        ref_structure = cached_parse(poscar.Poscar, ref_structurefile)
     else:
         ref_structure = None
 
@@ -181,7 +227,7 @@ def write_vasp_input(dirpath,
     # structure.json/POS, and use to construct incar and kpoints for
     # the to-be-calculated structure
     print("  Reading SPECIES:", speciesfile)
-    species_settings = species.species_settings(speciesfile)
+    species_settings = cached_parse(species.species_settings, speciesfile)
     if structurefile != None:
         print("  Reading structure:", structurefile)
         structure = poscar.Poscar(structurefile, species_settings)
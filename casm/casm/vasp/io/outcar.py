@@ -4,9 +4,11 @@ from builtins import *
 
 from casm.vasp.io.orbital_occupation import OrbitalOccupation
 
+import collections
 import os
 import re
 import gzip
+import zlib
 
 
 class OutcarError(Exception):
@@ -17,18 +19,179 @@ class OutcarError(Exception):
         return self.msg
 
 
-# TODO update documentation here
+def tail(filename, size=65536):
+    """Return the last 'size' bytes of a file.
+
+       Plain files are read by seeking to the end. Gzipped files (filename
+       ending in '.gz') can not be seeked, see _gzip_tail.
+    """
+    if filename.split(".")[-1].lower() == "gz":
+        return _gzip_tail(filename, size)
+    with open(filename, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - size))
+        return f.read()
+
+
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+
+
+def _gzip_tail(filename, size, window=1 << 22):
+    """Return the last 'size' bytes of the decompressed contents of a gzipped
+       file, without line splitting or parsing.
+
+       Only the last 'window' bytes of the file are read and decompressed if
+       the end of the file is made of complete gzip members, as written by
+       casm.vasp.io.gzip_file with threads > 1, and they contain at least
+       'size' bytes. Otherwise, such as for a single-member file larger than
+       'window', the whole file is decompressed, in blocks, keeping only the
+       last 'size' bytes. Use casm.vasp.io.job_complete to avoid repeating
+       this for files that have not changed.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        start = max(0, f.tell() - window)
+        f.seek(start)
+        data = f.read()
+
+    # find complete members by trying each possible gzip member header,
+    # starting nearest the end
+    members = collections.deque()
+    n = 0
+    i = end = len(data)
+    while i > 0:
+        i = data.rfind(_GZIP_MAGIC, 0, i)
+        if i < 0:
+            break
+        member = _gunzip_members(memoryview(data)[i:end])
+        if member is None:
+            continue
+        members.appendleft(member)
+        n += len(member)
+        end = i
+        if n >= size or start + i == 0:
+            return b"".join(members)[-size:]
+
+    blocks = collections.deque()
+    n = 0
+    with gzip.open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            blocks.append(block)
+            n += len(block)
+            while n - len(blocks[0]) >= size:
+                n -= len(blocks.popleft())
+    return b"".join(blocks)[-size:]
+
+
+def _gunzip_members(data):
+    """Return the decompressed contents of 'data' if it is one or more
+       complete gzip members, else None"""
+    decompressed = []
+    while len(data):
+        d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            decompressed.append(d.decompress(data))
+        except zlib.error:
+            return None
+        if not d.eof:
+            return None
+        data = d.unused_data
+    return b"".join(decompressed)
+
+
+def outcar_complete(filename, tail_size=65536):
+    """Return True if an OUTCAR file is complete.
+
+       Equivalent to Outcar(filename).complete, but only checks the last
+       'tail_size' bytes of the file for "Total CPU time used", which VASP
+       writes in the timing summary at the end of a completed run. If
+       'filename' does not exist, but 'filename.gz' does, it is used.
+    """
+    if not os.path.isfile(filename):
+        if os.path.isfile(filename + ".gz"):
+            filename += ".gz"
+        else:
+            raise OutcarError("file not found: " + filename)
+    return b"Total CPU time used" in tail(filename, tail_size)
+
+
+# Fields that can be parsed by Outcar, and the substring that must be found on
+# a line before any further parsing of that line is attempted for the field
+FIELDS = {
+    "complete": "Total CPU time used",
+    "slowest_loop": "LOOP",
+    "kpts": "generate k-points for:",
+    "lorbit": "LORBIT",
+    "ispin": "ISPIN",
+    "mag": "magnetization (x)",
+    "ngx": "NGX",
+    "forces": "TOTAL-FORCE",
+    "orbital_occupations": "type ="
+}
+
+_NGX_RE = re.compile(
+    r"\s*dimension x,y,z\s*NGX\s*=\s*([0-9]*)\s*NGY\s*=\s*([0-9]*)\s*NGZ\s*=\s*([0-9]*)\s*"
+)
+_ORBITAL_OCCUPATION_RE = re.compile(
+    "atom = *[0-9]+ *type = * [0-9]+  *l = *[0-9]+")
+
+
+def _open(filename):
+    """Open an OUTCAR file for reading text, using 'filename.gz' if 'filename'
+       does not exist."""
+    if not os.path.isfile(filename):
+        if os.path.isfile(filename + ".gz"):
+            filename += ".gz"
+        else:
+            raise OutcarError("file not found: " + filename)
+    if filename.split(".")[-1].lower() == "gz":
+        return gzip.open(filename, 'rt')
+    return open(filename)
+
+
 class Outcar(object):
     """Parse OUTCAR files.
 
-       Currently, just contains:
+       Contains:
            self.complete = True/False
            self.slowest_loop = float
-           self.kpoints = list of int, or none
+           self.kpts = list of int, or None
+           self.lorbit = int (LORBIT value from INCAR)
+           self.ispin = int (ISPIN value from INCAR)
+           self.mag = list of float, magnetization of each atom from last step (if LORBIT = 1, 2, 11, 12), or None
+           self.ngx, self.ngy, self.ngz = int, from first "dimension x,y,z" line, or None
+           self.forces = list of [fx, fy, fz], total forces on each atom from last ionic step
            self.orbital_occupations = dict of OrbitalOccupation objects, from last step (only available when LDAUPRINT = 1 or 2). Keys are indices of only those sites for which occupation was printed.
+
+       The file is read in a single pass. Each line is only parsed for a field
+       if it contains the substring given for that field in
+       casm.vasp.io.outcar.FIELDS, so parsing only the fields that are needed,
+       using the 'fields' argument, is faster. Fields that are not parsed keep
+       their default values.
+
+       With read=False, the file is not read on construction, and 'parse' can
+       be used to update fields incrementally from lines as they are appended
+       to a running job's OUTCAR.
     """
-    def __init__(self, filename):
+    def __init__(self, filename, fields=None, read=True):
+        """
+        Args:
+            filename: path to OUTCAR file. If it does not exist, but
+                'filename.gz' does, that is read instead.
+            fields: iterable of field names, from casm.vasp.io.outcar.FIELDS,
+                to parse. Default (None) parses all fields.
+            read: if True (default), read the file on construction.
+        """
         self.filename = filename
+        if fields is None:
+            fields = FIELDS.keys()
+        self.fields = set(fields)
+        for field in self.fields:
+            if field not in FIELDS:
+                raise OutcarError("Unknown Outcar field: '" + str(field) +
+                                  "'. Options are: " +
+                                  str(sorted(FIELDS.keys())))
+
         self.complete = False
         self.slowest_loop = None
         self.kpts = None
@@ -42,132 +205,132 @@ class Outcar(object):
         self.forces = []
         self.orbital_occupations = None
 
-        self.read()
+        if read:
+            self.read()
 
     def read(self):
-        """Parse OUTCAR file.  Currently checks for:
-                completion
-                loop time
-                kpoints
-                lorbit (LORBIT value from INCAR)
-                ispin (ISPIN value from INCAR)
-                magnetization (if LORBIT = 1, 2, 11, 12)
-                orbital_occupations
-        """
+        """Parse OUTCAR file for the requested fields"""
         self.kpts = None
-        if os.path.isfile(self.filename):
-            if self.filename.split(".")[-1].lower() == "gz":
-                f = gzip.open(self.filename)
-            else:
-                f = open(self.filename)
-        elif os.path.isfile(self.filename + ".gz"):
-            f = gzip.open(self.filename + ".gz")
-        else:
-            raise OutcarError("file not found: " + self.filename)
+        with _open(self.filename) as f:
+            self.parse(f)
 
-        force_index = False
-        for line in f:
-            try:
-                if re.search("generate k-points for:", line):
-                    self.kpts = list(map(int, line.split()[-3:]))
-            except:
-                pass
+    def parse(self, lines):
+        """Update the requested fields from an iterable of OUTCAR lines.
 
-            try:
-                if re.search("Total CPU time used", line):
+           May be called repeatedly with successive lines of a file, as long
+           as the multi-line blocks read for "mag", "forces", and
+           "orbital_occupations" are not split between calls.
+        """
+        checks = [(field, FIELDS[field]) for field in FIELDS
+                  if field in self.fields]
+        f = iter(lines)
+        for line in f:
+            for field, key in checks:
+                if key not in line:
+                    continue
+                if field == "complete":
                     self.complete = True
-            except:
-                raise OutcarError(
-                    "Error reading 'Total CPU time used' from line: '" + line +
-                    "'\nIn file: '" + self.filename + "'")
+                elif field == "slowest_loop":
+                    try:
+                        t = float(line.split()[-1])
+                        if self.slowest_loop is None or t > self.slowest_loop:
+                            self.slowest_loop = t
+                    except (ValueError, IndexError):
+                        pass
+                elif field == "kpts":
+                    try:
+                        self.kpts = list(map(int, line.split()[-3:]))
+                    except ValueError:
+                        pass
+                elif field == "lorbit":
+                    try:
+                        self.lorbit = int(line.split()[2])
+                    except (ValueError, IndexError):
+                        pass
+                elif field == "ispin":
+                    try:
+                        self.ispin = int(line.split()[2])
+                    except (ValueError, IndexError):
+                        pass
+                elif field == "mag":
+                    self._read_mag(f)
+                elif field == "ngx":
+                    self._read_ngx(line)
+                elif field == "forces":
+                    self._read_forces(f)
+                elif field == "orbital_occupations":
+                    self._read_orbital_occupation(f, line)
 
-            try:
-                if re.search("LOOP", line):
-                    t = float(line.split()[-1])
-                    if self.slowest_loop is None:
-                        self.slowest_loop = t
-                    elif t > self.slowest_loop:
-                        self.slowest_loop = t
-            except:
-                pass
+            # stop early if only the first NGX is needed
+            if self.found_ngx and self.fields == set(["ngx"]):
+                break
 
-            try:
-                if re.search("LORBIT", line):
-                    self.lorbit = int(line.split()[2])
-            except:
-                pass
-
-            try:
-                if re.search("ISPIN", line):
-                    self.ispin = int(line.split()[2])
-            except:
-                pass
-
-            try:
-                if re.search(r"magnetization \(x\)", line):
-                    self.mag = []
-                    for line in f:
-                        try:
-                            if re.match("[0-9]+", line.split()[0]):
-                                self.mag.append(float(line.split()[-1]))
-                            if re.match("tot", line.split()[0]):
-                                break
-                        except:
-                            pass
-            except:
-                pass
+    def _read_mag(self, f):
+        """Read atomic magnetizations, from the lines following
+           'magnetization (x)' up to the 'tot' line"""
+        self.mag = []
+        for line in f:
+            s = line.split()
+            if not s:
+                continue
+            if s[0][0].isdigit():
+                try:
+                    self.mag.append(float(s[-1]))
+                except ValueError:
+                    pass
+            if s[0].startswith("tot"):
+                break
 
+    def _read_ngx(self, line):
+        """Read NGX, NGY, NGZ from the first 'dimension x,y,z' line"""
+        if self.found_ngx:
+            return
+        r = _NGX_RE.match(line)
+        if r:
             try:
-                r = re.match(
-                    r"\s*dimension x,y,z\s*NGX\s*=\s*([0-9]*)\s*NGY\s*=\s*([0-9]*)\s*NGZ\s*=\s*([0-9]*)\s*",
-                    line)
-                # if r:
-                if r and not self.found_ngx:
-                    self.ngx = int(r.group(1))
-                    self.ngy = int(r.group(2))
-                    self.ngz = int(r.group(3))
-                    self.found_ngx = True
-            except:
+                self.ngx = int(r.group(1))
+                self.ngy = int(r.group(2))
+                self.ngz = int(r.group(3))
+                self.found_ngx = True
+            except ValueError:
                 pass
 
-            if force_index:
-                if '--' in line and len(self.forces) > 0:
-                    force_index = False
-                elif '--' not in line:
-                    self.forces.append(list(map(float, line.split()[-3:])))
-
-            try:
-                if re.search("TOTAL-FORCE", line):
-                    force_index = True
-            except:
-                pass
+    def _read_forces(self, f):
+        """Read the block of forces following a 'TOTAL-FORCE' line, replacing
+           forces read from previous ionic steps"""
+        forces = []
+        for line in f:
+            if '--' in line:
+                if len(forces) > 0:
+                    break
+            else:
+                forces.append(list(map(float, line.split()[-3:])))
+        self.forces = forces
 
-            # TODO: will this work for single-spin channel?
+    # TODO: will this work for single-spin channel?
+    def _read_orbital_occupation(self, f, line):
+        """Read the occupation matrices following an 'atom = ... type = ...
+           l = ...' line"""
+        if not _ORBITAL_OCCUPATION_RE.search(line):
+            return
+        if not self.orbital_occupations:
+            self.orbital_occupations = dict()
+        i = int(line.split()[2])
+        l = int(line.split()[8])
+        occupation_matrix_a = []
+        occupation_matrix_b = []
+        for inner_line in f:
             try:
-                if re.search("atom = *[0-9]+ *type = * [0-9]+  *l = *[0-9]+",
-                             line):
-                    if not self.orbital_occupations:
-                        self.orbital_occupations = dict()
-                    i = int(line.split()[2])
-                    l = int(line.split()[8])
-                    occupation_matrix_a = []
-                    occupation_matrix_b = []
-                    for inner_line in f:
-                        try:
-                            s = [float(x) for x in inner_line.split()]
-                            if len(s) == 2 * l + 1:
-                                if len(occupation_matrix_a) < 2 * l + 1:
-                                    occupation_matrix_a.append(s)
-                                else:
-                                    occupation_matrix_b.append(s)
-                        except:
-                            pass
-
-                        if len(occupation_matrix_b) == 2 * l + 1:
-                            break
-                    self.orbital_occupations[i - 1] = OrbitalOccupation(
-                        occupation_matrix_a, occupation_matrix_b)
-            except:
+                s = [float(x) for x in inner_line.split()]
+                if len(s) == 2 * l + 1:
+                    if len(occupation_matrix_a) < 2 * l + 1:
+                        occupation_matrix_a.append(s)
+                    else:
+                        occupation_matrix_b.append(s)
+            except ValueError:
                 pass
 
-        f.close()
+            if len(occupation_matrix_b) == 2 * l + 1:
+                break
+        self.orbital_occupations[i - 1] = OrbitalOccupation(
+            occupation_matrix_a, occupation_matrix_b)
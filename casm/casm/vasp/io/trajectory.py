@@ -0,0 +1,150 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import os
+import numpy as np
+
+from casm.vasp.io import vasprun
+from casm.vasp.io.vasprun import VasprunError, etree
+
+
+def run_dirs(calcdir, include_final=False):
+    """Return the list of 'run.i' directories in 'calcdir', in order
+
+       Args:
+           calcdir: calculation directory, containing 'run.0', 'run.1', etc.
+           include_final: if True, and 'run.final' exists, it is included last
+    """
+    dirs = []
+    i = 0
+    while os.path.isdir(os.path.join(calcdir, "run." + str(i))):
+        dirs.append(os.path.join(calcdir, "run." + str(i)))
+        i += 1
+    if include_final and os.path.isdir(os.path.join(calcdir, "run.final")):
+        dirs.append(os.path.join(calcdir, "run.final"))
+    return dirs
+
+
+def count_ionic_steps(filename, blocksize=1 << 20):
+    """Return the number of '<calculation>' elements started in a vasprun.xml
+       file, by scanning the raw bytes without parsing"""
+    key = b"<calculation>"
+    count = 0
+    prev = b""
+    with vasprun._open(filename) as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            data = prev + block
+            count += data.count(key)
+            # keep enough of the end of the block to find a split key, but not
+            # enough to count a key twice
+            prev = data[-(len(key) - 1):]
+    return count
+
+
+def read_trajectory(calcdir=None, rundirs=None, include_final=False):
+    """Read every ionic step of a relaxation into contiguous arrays
+
+       Each run directory's vasprun.xml (or vasprun.xml.gz) is streamed, as by
+       casm.vasp.io.iter_ionic_steps, and the data for each ionic step is
+       copied into arrays preallocated for the number of ionic steps found by
+       scanning the files, so neither the XML tree nor per-step lists are
+       kept. An incomplete final ionic step, as in an interrupted run, is
+       skipped.
+
+       Args:
+           calcdir: calculation directory, containing 'run.0', 'run.1', etc.
+           rundirs: list of run directories to read, in order. Default uses
+               run_dirs(calcdir, include_final).
+           include_final: if True, and rundirs is None, include 'run.final'
+
+       Returns:
+           trajectory: dict of:
+               "energy": array of shape (n_steps,), 'e_wo_entrp'
+               "free_energy": array of shape (n_steps,), 'e_fr_energy'
+               "lattice": array of shape (n_steps, 3, 3), lattice vectors as rows
+               "basis": array of shape (n_steps, n_atoms, 3), direct coordinates
+               "forces": array of shape (n_steps, n_atoms, 3)
+               "stress": array of shape (n_steps, 3, 3)
+               "run": array of int of shape (n_steps,), index into 'rundirs'
+               "step": array of int of shape (n_steps,), ionic step in run
+               "atom_type": array of str of shape (n_types,)
+               "atoms_per_type": array of int of shape (n_types,)
+    """
+    if rundirs is None:
+        if calcdir is None:
+            raise VasprunError(
+                "Error in read_trajectory: calcdir and rundirs are None")
+        rundirs = run_dirs(calcdir, include_final)
+
+    # run directories without output yet are skipped
+    files = [os.path.join(d, "vasprun.xml") for d in rundirs]
+    files = [
+        f if os.path.isfile(f) or os.path.isfile(f + ".gz") else None
+        for f in files
+    ]
+    n_alloc = sum(count_ionic_steps(f) for f in files if f is not None)
+
+    fields = set(["energy", "forces", "stress", "structure"])
+    atom_type, atoms_per_type = [], []
+    traj = None
+    n = 0
+    for run_index, filename in enumerate(files):
+        if filename is None:
+            continue
+        step_index = 0
+        try:
+            for elem in vasprun._iterparse(filename):
+                if elem.tag == 'atominfo':
+                    atom_type, atoms_per_type = vasprun._read_atominfo(elem)
+                if elem.tag != 'calculation':
+                    continue
+                step = vasprun._read_calculation(elem, fields)
+                if traj is None:
+                    traj = _allocate(n_alloc, step["forces"].shape[0])
+                traj["energy"][n] = step["e_wo_entrp"]
+                traj["free_energy"][n] = step["e_fr_energy"]
+                traj["lattice"][n] = step["lattice"]
+                traj["basis"][n] = step["basis"]
+                traj["forces"][n] = step["forces"]
+                traj["stress"][n] = step["stress"]
+                traj["run"][n] = run_index
+                traj["step"][n] = step_index
+                step_index += 1
+                n += 1
+        except etree.ParseError:
+            # interrupted run, keep the completed ionic steps
+            pass
+
+    if traj is None:
+        traj = _allocate(0, 0)
+    else:
+        for key in traj:
+            traj[key] = traj[key][:n]
+    traj["atom_type"] = np.array(atom_type, dtype=str)
+    traj["atoms_per_type"] = np.array(atoms_per_type, dtype=int)
+    return traj
+
+
+def _allocate(n_steps, n_atoms):
+    return {
+        "energy": np.empty(n_steps),
+        "free_energy": np.empty(n_steps),
+        "lattice": np.empty((n_steps, 3, 3)),
+        "basis": np.empty((n_steps, n_atoms, 3)),
+        "forces": np.empty((n_steps, n_atoms, 3)),
+        "stress": np.empty((n_steps, 3, 3)),
+        "run": np.empty(n_steps, dtype=int),
+        "step": np.empty(n_steps, dtype=int)
+    }
+
+
+def write_trajectory(filename, trajectory):
+    """Write a trajectory, as from read_trajectory, to a compressed .npz file"""
+    np.savez_compressed(filename, **trajectory)
+
+
+def load_trajectory(filename):
+    """Load a trajectory written by write_trajectory, as a dict of arrays"""
+    with np.load(filename) as data:
+        return {key: data[key] for key in data.files}
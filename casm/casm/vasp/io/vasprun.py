@@ -2,7 +2,10 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from builtins import *
 
-import xml.etree.cElementTree as etree
+try:
+    import xml.etree.cElementTree as etree
+except ImportError:
+    import xml.etree.ElementTree as etree
 import os, gzip
 import numpy as np
 
@@ -15,6 +18,216 @@ class VasprunError(Exception):
         return self.msg
 
 
+# Data that can be read for each ionic step ('calculation' element):
+#   "energy": 'e_fr_energy', 'e_wo_entrp', and 'e_0_energy' of the ionic step
+#   "scsteps": 'e_0_energy' of each electronic step
+#   "forces": forces on atoms
+#   "stress": stress tensor
+#   "structure": lattice, reciprocal lattice, and basis
+#   "dos": fermi level, total DOS, and l or lm-projected DOS
+#   "eigenvalues": eigenvalues
+FIELDS = ("energy", "scsteps", "forces", "stress", "structure", "dos",
+          "eigenvalues")
+
+
+def _open(filename):
+    """Open a vasprun.xml file for reading, using 'filename.gz' if 'filename'
+       does not exist."""
+    if os.path.isfile(filename):
+        if filename.split(".")[-1].lower() == "gz":
+            return gzip.open(filename, 'rb')
+        return open(filename, 'rb')
+    elif os.path.isfile(filename + ".gz"):
+        return gzip.open(filename + ".gz", 'rb')
+    raise VasprunError("file not found: " + filename)
+
+
+def _decode(elem, tag, shape=None):
+    """Decode the text of all 'tag' elements in 'elem' into one array.
+
+       The text is joined and converted in a single pass, rather than element
+       by element. If 'shape' is given, the result is reshaped, with '-1'
+       allowed for one dimension; else, the result has one row per 'tag'
+       element.
+    """
+    rows = [e.text for e in elem.iter(tag)]
+    if len(rows) == 0:
+        return np.zeros((0, 0))
+    values = np.fromstring(" ".join(rows), sep=" ")
+    if shape is None:
+        shape = (len(rows), -1)
+    try:
+        return values.reshape(shape)
+    except ValueError:
+        raise VasprunError("Error decoding '" + str(elem.tag) +
+                           "': could not read " + str(len(rows)) + " '" + tag +
+                           "' rows as an array of shape " + str(shape))
+
+
+def _find_named(elem, tag, name):
+    """Return the first child of 'elem' with the given tag and name attribute"""
+    for child in elem.findall(tag):
+        if child.attrib.get('name') == name:
+            return child
+    return None
+
+
+def _set_shape(array_elem):
+    """Return the shape of the nested 'set' elements in an 'array' element,
+       ending with the number of 'r' rows in the innermost set"""
+    shape = []
+    node = array_elem.find('set')
+    while node is not None:
+        children = node.findall('set')
+        if len(children) == 0:
+            shape.append(len(node.findall('r')))
+            break
+        shape.append(len(children))
+        node = children[0]
+    return shape
+
+
+def _read_array(array_elem):
+    """Decode an 'array' element of nested 'set' elements into an array of
+       shape (n_set_0, n_set_1, ..., n_r, n_field)"""
+    shape = _set_shape(array_elem)
+    return _decode(array_elem.find('set'), 'r', shape + [-1])
+
+
+def _read_structure(elem):
+    """Return dict with "lattice", "rec_lat", and "basis" arrays from a
+       'structure' element"""
+    crystal = elem.find('crystal')
+    return {
+        "lattice": _decode(_find_named(crystal, 'varray', 'basis'), 'v'),
+        "rec_lat": _decode(_find_named(crystal, 'varray', 'rec_basis'), 'v'),
+        "basis": _decode(_find_named(elem, 'varray', 'positions'), 'v')
+    }
+
+
+def _read_atominfo(elem):
+    """Return lists 'atom_type' and 'atoms_per_type' from an 'atominfo' element"""
+    atomtypes = _find_named(elem, 'array', 'atomtypes')
+    atom_type = []
+    atoms_per_type = []
+    for child in atomtypes.find('set').findall('rc'):
+        atom_type.append(child[1].text)
+        atoms_per_type.append(int(child[0].text))
+    return atom_type, atoms_per_type
+
+
+def _read_calculation(elem, fields):
+    """Return dict of the requested data from a 'calculation' element"""
+    step = dict()
+
+    if "energy" in fields:
+        energy = elem.findall('energy')
+        if len(energy):
+            for child in energy[-1]:
+                name = child.attrib.get('name')
+                if name in ['e_fr_energy', 'e_wo_entrp', 'e_0_energy']:
+                    step[name] = float(child.text)
+
+    if "scsteps" in fields:
+        step["e_0_scsteps"] = [
+            float(i.text)
+            for i in elem.findall("./scstep/energy/i[@name='e_0_energy']")
+        ]
+
+    if "forces" in fields:
+        forces = _find_named(elem, 'varray', 'forces')
+        if forces is not None:
+            step["forces"] = _decode(forces, 'v')
+
+    if "stress" in fields:
+        stress = _find_named(elem, 'varray', 'stress')
+        if stress is not None:
+            step["stress"] = _decode(stress, 'v')
+
+    if "structure" in fields:
+        structure = elem.find('structure')
+        if structure is not None:
+            step.update(_read_structure(structure))
+
+    if "dos" in fields:
+        dos = elem.find('dos')
+        if dos is not None:
+            efermi = _find_named(dos, 'i', 'efermi')
+            if efermi is not None:
+                step["efermi"] = float(efermi.text)
+            # total: [spins, points, fields]
+            step["dos"] = _read_array(dos.find('total').find('array'))
+            # partial: [ions, spins, points, fields]
+            partial = dos.find('partial')
+            if partial is not None:
+                step["dos_lm"] = _read_array(partial.find('array'))
+
+    if "eigenvalues" in fields:
+        eigenvalues = elem.find('eigenvalues')
+        if eigenvalues is not None:
+            # [spins, kpoints, bands, (eigene, occ)]
+            step["eigenvalues"] = _read_array(eigenvalues.find('array'))
+
+    return step
+
+
+def _iterparse(filename):
+    """Yield top-level elements of a vasprun.xml file as they are completed.
+
+       After each element is yielded, all completed top-level elements are
+       cleared, so memory use does not grow with the number of ionic steps.
+    """
+    with _open(filename) as f:
+        root = None
+        depth = 0
+        for event, elem in etree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield elem
+                root.clear()
+
+
+def iter_ionic_steps(filename, fields=None):
+    """Yield data for each ionic step in a vasprun.xml file, one at a time.
+
+       Args:
+           filename: path to vasprun.xml file. If it does not exist, but
+               'filename.gz' does, that is read instead.
+           fields: iterable of data to read, from
+               casm.vasp.io.vasprun.FIELDS. Default (None) reads "energy",
+               "scsteps", "forces", "stress", and "structure", but not "dos"
+               or "eigenvalues".
+
+       Yields:
+           step: dict, which may include:
+               "e_fr_energy", "e_wo_entrp", "e_0_energy": float ("energy")
+               "e_0_scsteps": list of float ("scsteps")
+               "forces": array of shape (n_atoms, 3) ("forces")
+               "stress": array of shape (3, 3) ("stress")
+               "lattice", "rec_lat": array of shape (3, 3), "basis": array of
+                   shape (n_atoms, 3) ("structure")
+               "efermi": float, "dos": array of shape (spins, points, fields),
+                   "dos_lm": array of shape (ions, spins, points, fields) ("dos")
+               "eigenvalues": array of shape (spins, kpoints, bands, 2)
+                   ("eigenvalues")
+    """
+    if fields is None:
+        fields = ("energy", "scsteps", "forces", "stress", "structure")
+    fields = set(fields)
+    for field in fields:
+        if field not in FIELDS:
+            raise VasprunError("Unknown Vasprun field: '" + str(field) +
+                               "'. Options are: " + str(list(FIELDS)))
+    for elem in _iterparse(filename):
+        if elem.tag == 'calculation':
+            yield _read_calculation(elem, fields)
+
+
 class Vasprun:
     """ An object containing values read from vasprun.xml
 
@@ -34,6 +247,10 @@ class Vasprun:
             self.eigenvalues: eigenvalues and energies for doing band structure plots (list of 2d list of double)
             self.all_e_0: energy (e_0_energy) for each electronic step of each ionic step
             self.nelm: NELM (max. number of electronic steps)
+
+        The file is streamed, and array data is decoded one array at a time.
+        To read data for every ionic step, without keeping it all, use
+        casm.vasp.io.iter_ionic_steps.
     """
     def __init__(self, filename, DOS=False, Band=False):
         """ Create a Vasprun object from a vasprun.xml file with name 'filename' """
@@ -96,134 +313,46 @@ class Vasprun:
         return self.is_complete
 
     def iter_read(self):
-        """ Create a Vasprun object from a vasprun.xml file with name 'filename' """
-        if os.path.isfile(self.filename):
-            if self.filename.split(".")[-1].lower() == "gz":
-                f = gzip.open(self.filename)
-            else:
-                f = open(self.filename)
-        elif os.path.isfile(self.filename + ".gz"):
-            f = gzip.open(self.filename + ".gz")
-        else:
-            raise VasprunError("file not found: " + self.filename)
-
-        for event, elem in etree.iterparse(f):
+        """ Create a Vasprun object from a vasprun.xml file with name 'filename'
+
+            The file is streamed, and each top-level element is released as
+            soon as it is read, so memory use does not grow with the number
+            of ionic steps. The DOS is only read if 'DOS' is True, and the
+            eigenvalues only if 'Band' is True.
+        """
+        fields = ["energy", "scsteps", "forces"]
+        if self.DOS:
+            fields.append("dos")
+        if self.Band:
+            fields.append("eigenvalues")
+
+        for elem in _iterparse(self.filename):
             if elem.tag == 'parameters':
                 self.nelm = int(elem.find(".//i[@name='NELM']").text)
 
-            if elem.tag == 'calculation':
+            elif elem.tag == 'calculation':
+                step = _read_calculation(elem, fields)
 
                 #finding the energy of the relaxation
-                self.total_energy = None
-                energy = elem.findall('energy')
-                for child in energy[-1]:
-                    if child.attrib['name'] == 'e_wo_entrp':
-                        self.total_energy = float(child.text)
-                        break
-                    child.clear()
+                self.total_energy = step.get("e_wo_entrp")
 
                 #finding the forces on the atoms
-                varray = elem.findall('varray')
-                forces = None
-                for v in varray:
-                    if v.attrib['name'] == 'forces':
-                        forces = v
-                self.forces = []
-                for child in forces:
-                    self.forces.append(
-                        [float(i) for i in child.text.strip().split()])
-                    child.clear()
-                v.clear()
+                self.forces = step["forces"].tolist()
 
                 # find energy (e_0_energy) for each electronic step in this ionic step
-                self.all_e_0.append([])
-                for i in elem.findall("./scstep/energy/i[@name='e_0_energy']"):
-                    self.all_e_0[-1].append(float(i.text))
+                self.all_e_0.append(step["e_0_scsteps"])
 
                 if self.DOS:
-
                     # gather the DOS, if calculated and warranted
-                    self.dos = None
-                    self.dos_lm = None
-                    self.efermi = None
-
-                    is_dos = elem.find('dos')
-                    if is_dos != None:
-                        for child in is_dos:
-                            if child.attrib['name'] == 'efermi':
-                                self.efermi = float(child.text)
-                                child.clear()
-                                break
-                            else:
-                                child.clear()
-
-                        total = is_dos.find('total').find('array')
-
-                        spins = len(total.find('set').findall('set'))
-                        points = len(
-                            total.find('set').findall('set')[0].findall('r'))
-                        fields = len(total.findall('field'))
-
-                        total_array = np.zeros([spins, points, fields])
-
-                        for s in range(spins):
-                            my_set = total.find('set').findall(
-                                'set')[s].findall('r')
-                            for r in range(points):
-                                total_array[s,
-                                            r] = map(float,
-                                                     my_set[r].text.split())
-
-                        self.dos = total_array
-
-                        partial = is_dos.find('partial')
-                        if partial != None:
-                            partial = partial.find('array')
-                        else:
-                            partial = None
-
-                        if partial:
-                            ions = len(partial.find('set').findall('set'))
-                            spins = len(
-                                partial.find('set').findall('set')[0].findall(
-                                    'set'))
-                            points = len(
-                                partial.find('set').findall('set')[0].findall(
-                                    'set')[0].findall('r'))
-                            fields = len(partial.findall('field'))
-
-                            partial_array = np.zeros(
-                                [ions, spins, points, fields])
-
-                            for i in range(ions):
-                                i_set = partial.find('set').findall(
-                                    'set')[i].findall('set')
-                                for s in range(spins):
-                                    my_set = i_set[s].findall('r')
-                                    for r in range(points):
-                                        partial_array[i, s, r] = map(
-                                            float, my_set[r].text.split())
-
-                            self.dos_lm = partial_array
+                    self.efermi = step.get("efermi")
+                    self.dos = step.get("dos")
+                    self.dos_lm = step.get("dos_lm")
 
                 if self.Band:
-                    eig_parse_vals = elem.find('eigenvalues').find(
-                        'array').find('set')
-                    num_kpoints = len(
-                        eig_parse_vals.find('set').findall('set'))
-                    num_bands = len(
-                        eig_parse_vals.find('set').find('set').findall('r'))
+                    eig = step["eigenvalues"]
                     self.eigenvalues = [
-                        np.empty([num_kpoints, num_bands]),
-                        np.empty([num_kpoints, num_bands])
+                        eig[spin, :, :, 0] for spin in range(eig.shape[0])
                     ]
-                    for spin_ctr, spin in enumerate(eig_parse_vals):
-                        for kpoint_ctr, kpoint in enumerate(spin):
-                            for band_ctr, band in enumerate(kpoint):
-                                self.eigenvalues[spin_ctr][
-                                    kpoint_ctr,
-                                    band_ctr] = band.text.strip().split()[0]
-                    eig_parse_vals.clear()
 
             elif elem.tag == 'kpoints':
                 if self.Band:
@@ -231,18 +360,11 @@ class Vasprun:
                     if self.num_divisions != None:
                         self.num_divisions = int(
                             self.num_divisions.text.strip())
-                        kp_parse_vals = elem.find('varray') if elem.find(
-                            'varray').attrib['name'] == 'kpointlist' else None
+                        kp_parse_vals = _find_named(elem, 'varray',
+                                                    'kpointlist')
                         if kp_parse_vals != None:
-                            num_paths = len(kp_parse_vals.findall(
-                                'v')) / self.num_divisions
-                            kpoint_list = np.zeros(
-                                [self.num_divisions * num_paths, 3])
-                            for i, row in enumerate(kp_parse_vals):
-                                kpoint_list[i, :] = [
-                                    float(val)
-                                    for val in row.text.strip().split()
-                                ]
+                            kpoint_list = _decode(kp_parse_vals, 'v')
+                            num_paths = len(kpoint_list) // self.num_divisions
                             self.kpoint_divisions = np.empty(
                                 [2 * num_paths, 3])
                             for i in range(num_paths):
@@ -250,59 +372,20 @@ class Vasprun:
                                     i * self.num_divisions, :]
                                 self.kpoint_divisions[2 * i + 1] = kpoint_list[
                                     (i + 1) * self.num_divisions - 1, :]
-                            kp_parse_vals.clear()
                     else:
                         self.kpoint_divisions = False
 
             elif elem.tag == 'atominfo':
 
                 #finding the atom_type and atoms_per_type
-                temp_node = elem.findall('array')
-                for child in temp_node:
-                    if child.attrib['name'] == 'atomtypes':
-                        child_node = child
-                        break
-                t_atom_info = child_node.findall('set')[0].findall('rc')
-                self.atom_type = []
-                self.atoms_per_type = []
-                for child in t_atom_info:
-                    self.atom_type.append(child[1].text)
-                    self.atoms_per_type.append(int(child[0].text))
+                self.atom_type, self.atoms_per_type = _read_atominfo(elem)
 
             elif elem.tag == 'structure':
                 self.is_complete = False
-                if 'name' in elem.attrib:
-                    if elem.attrib['name'] == 'finalpos':
-                        #finding the final structure
-                        finalpos = elem
-                        self.is_complete = True
-
-                        # collect the final lattice
-                        self.lattice = []
-                        for i in range(3):
-                            self.lattice.append([
-                                float(x) for x in finalpos[0][0]
-                                [i].text.strip().split()
-                            ])
-
-                        # Collect the reciprocal lattice
-                        self.rec_lat = []
-                        for i in range(3):
-                            self.rec_lat.append([
-                                float(x) for x in finalpos[0][2]
-                                [i].text.strip().split()
-                            ])
-
-                        # collect the final basis
-                        self.basis = []
-                        for i, basis_atom in enumerate(finalpos[1]):
-                            self.basis.append([
-                                float(x)
-                                for x in basis_atom.text.strip().split()
-                            ])
-                        finalpos.clear()
-
-            else:
-                pass
-        elem.clear()
-        f.close()
+                if elem.attrib.get('name') == 'finalpos':
+                    #finding the final structure
+                    self.is_complete = True
+                    structure = _read_structure(elem)
+                    self.lattice = structure["lattice"].tolist()
+                    self.rec_lat = structure["rec_lat"].tolist()
+                    self.basis = structure["basis"].tolist()
@@ -0,0 +1,253 @@
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from casm.vasp.io.io import VaspIOError
+
+
+class FileWatcher(object):
+    """Read lines appended to a file since the last read.
+
+       The offset of the end of the last complete line read is remembered, so
+       that each call to 'read' only reads bytes appended since the previous
+       call. If the file is replaced (its inode changes) or truncated (its size
+       is less than the offset), it is read again from the beginning and
+       'restarted' is set to True.
+
+       Contains:
+           self.filename = path to the file being watched
+           self.offset = byte offset of the end of the last complete line read
+           self.restarted = True if the last call to 'read' restarted from the
+               beginning of the file
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.offset = 0
+        self.restarted = False
+        self._inode = None
+
+    def read(self):
+        """Return a list of the complete lines appended since the last read.
+
+           A final line without a newline is not returned until it is
+           completed. If the file does not exist, an empty list is returned.
+        """
+        self.restarted = False
+        try:
+            f = open(self.filename, 'rb')
+        except (IOError, OSError):
+            return []
+        with f:
+            st = os.fstat(f.fileno())
+            if (self._inode is not None and st.st_ino != self._inode) \
+                    or st.st_size < self.offset:
+                self.offset = 0
+                self.restarted = True
+            self._inode = st.st_ino
+            if st.st_size == self.offset:
+                return []
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return data[:end].decode('utf-8', 'replace').splitlines(True)
+
+
+# inotify event masks, from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_EVENT = struct.Struct(str("iIII"))
+
+
+def _libc():
+    """Return libc, as a ctypes.CDLL, if it provides inotify, else None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library(str("c")) or "libc.so.6",
+                           use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def inotify_available():
+    """Return True if inotify can be used by JobWatcher"""
+    return _libc() is not None
+
+
+class JobWatcher(object):
+    """Wait for a process to exit or for files in job directories to be
+       modified.
+
+       With the "poll" backend, 'wait' sleeps for the full timeout, and
+       'last_modified' lists each directory and checks the modification time of
+       every file in it, which is how vasp jobs were always supervised.
+
+       With the "inotify" backend (Linux only), 'wait' returns as soon as the
+       process exits or a file is written, and returns the files written while
+       waiting. The time of the most recent write to each directory is tracked
+       from inotify events, so no stat calls are needed after construction.
+       Writes from other hosts to a network filesystem produce no inotify
+       events, so a stale time can be confirmed with 'rescan'.
+
+       Contains:
+           self.process = the subprocess.Popen being watched
+           self.dirs = list of directories being watched
+           self.backend = "poll" or "inotify"
+    """
+    def __init__(self, process, dirs, backend="auto"):
+        """
+        Args:
+            process: subprocess.Popen to wait on
+            dirs: list of directories to watch for file modifications
+            backend: "poll", "inotify", or "auto" (default), which uses
+                "inotify" if it is available and "poll" otherwise.
+        """
+        self.process = process
+        self.dirs = [os.path.abspath(d) for d in dirs]
+        if backend == "auto":
+            backend = "inotify" if inotify_available() else "poll"
+        if backend not in ["poll", "inotify"]:
+            raise VaspIOError("Unknown JobWatcher backend: '" + str(backend) +
+                              "'. Options are: 'poll', 'inotify', 'auto'")
+        self.backend = backend
+        self._fd = None
+        self._exit_r = None
+
+        if backend == "inotify":
+            self._start_inotify()
+
+    def _start_inotify(self):
+        libc = _libc()
+        if libc is None:
+            raise VaspIOError("inotify is not available")
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise VaspIOError("inotify_init1 failed: " +
+                              os.strerror(ctypes.get_errno()))
+        self._wd = dict()
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        for d in self.dirs:
+            wd = libc.inotify_add_watch(self._fd, d.encode('utf-8'), mask)
+            if wd < 0:
+                self.close()
+                raise VaspIOError("inotify_add_watch failed for '" + d +
+                                  "': " + os.strerror(ctypes.get_errno()))
+            self._wd[wd] = d
+
+        # initial modification times, from one directory scan
+        self._last_modified = dict()
+        for d in self.dirs:
+            self._last_modified[d] = _scan(d)
+
+        # a thread waits on the process, and signals exit through a pipe, so
+        # that process exit and file events can be waited on together
+        self._exit_r, exit_w = os.pipe()
+
+        def wait_for_exit():
+            self.process.wait()
+            try:
+                os.write(exit_w, b"x")
+            except (IOError, OSError):
+                pass
+            os.close(exit_w)
+
+        t = threading.Thread(target=wait_for_exit)
+        t.daemon = True
+        t.start()
+
+    def wait(self, timeout):
+        """Wait up to 'timeout' seconds for the process to exit or, with the
+           "inotify" backend, for a file to be written.
+
+           Returns:
+               modified: set of paths of files written while waiting, or None
+                   if unknown (the "poll" backend)
+        """
+        if self.backend == "poll":
+            time.sleep(timeout)
+            return None
+        if self.process.poll() is None:
+            select.select([self._exit_r, self._fd], [], [], timeout)
+        return self._read_events()
+
+    def _read_events(self):
+        """Read pending inotify events, returning the set of modified paths"""
+        modified = set()
+        now = time.time()
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except (IOError, OSError) as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not buf:
+                break
+            i = 0
+            while i < len(buf):
+                wd, mask, cookie, length = _IN_EVENT.unpack_from(buf, i)
+                i += _IN_EVENT.size
+                name = buf[i:i + length].rstrip(b"\0").decode(
+                    'utf-8', 'replace')
+                i += length
+                if wd in self._wd and name:
+                    d = self._wd[wd]
+                    modified.add(os.path.join(d, name))
+                    self._last_modified[d] = (name, now)
+        return modified
+
+    def last_modified(self, d, rescan=False):
+        """Return (filename, time) of the most recently modified file in
+           directory 'd', or (None, None) if it is empty
+
+           If 'rescan' is True, the modification time of every file in 'd' is
+           checked even with the "inotify" backend, as when writes from other
+           hosts may not have produced events.
+        """
+        d = os.path.abspath(d)
+        if self.backend == "poll":
+            return _scan(d)
+        self._read_events()
+        if rescan:
+            name, t = _scan(d)
+            if t is not None and (self._last_modified[d][1] is None
+                                  or t > self._last_modified[d][1]):
+                self._last_modified[d] = (name, t)
+        return self._last_modified[d]
+
+    def close(self):
+        """Stop watching"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._exit_r is not None:
+            os.close(self._exit_r)
+            self._exit_r = None
+
+
+def _scan(d):
+    """Return (filename, mtime) of the most recently modified file in 'd'"""
+    most_recent = (None, None)
+    for f in os.listdir(d):
+        t = os.path.getmtime(os.path.join(d, f))
+        if most_recent[1] is None or t > most_recent[1]:
+            most_recent = (f, t)
+    return most_recent
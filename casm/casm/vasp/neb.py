@@ -168,7 +168,7 @@ class Neb(object):
                                       str(img).zfill(2), "OUTCAR")
             if not os.path.isfile(outcarfile):
                 return False
-            if not io.Outcar(outcarfile).complete():  ## check this
+            if not io.outcar_complete(outcarfile):
                 return False
         return True
 
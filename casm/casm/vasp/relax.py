@@ -107,6 +107,15 @@ class Relax(object):
             self.settings["final"] = None
         if not "err_types" in self.settings:
             self.settings["err_types"] = ['SubSpaceMatrixError']
+        if not "supervisor" in self.settings or self.settings[
+                "supervisor"] is None:
+            self.settings["supervisor"] = "poll"
+        if not "compresslevel" in self.settings or self.settings[
+                "compresslevel"] is None:
+            self.settings["compresslevel"] = 9
+        if not "compress_threads" in self.settings or self.settings[
+                "compress_threads"] is None:
+            self.settings["compress_threads"] = 1
         if "subdir" in self.settings:
             self.subdir = self.settings["subdir"]
 
@@ -188,7 +197,7 @@ class Relax(object):
         outcarfile = os.path.join(self.finaldir, "OUTCAR")
         if not os.path.isfile(outcarfile):
             return False
-        if not io.Outcar(outcarfile).complete():
+        if not io.outcar_complete(outcarfile):
             return False
         return True
 
@@ -208,8 +217,10 @@ class Relax(object):
             if self.settings["nrg_convergence"] != None:
                 if io.job_complete(self.rundir[-1]) and io.job_complete(
                         self.rundir[-2]):
-                    o1 = io.Oszicar(os.path.join(self.rundir[-1], "OSZICAR"))
-                    o2 = io.Oszicar(os.path.join(self.rundir[-2], "OSZICAR"))
+                    o1 = io.cached_parse(
+                        io.Oszicar, os.path.join(self.rundir[-1], "OSZICAR"))
+                    o2 = io.cached_parse(
+                        io.Oszicar, os.path.join(self.rundir[-2], "OSZICAR"))
                     if abs(o1.E[-1] -
                            o2.E[-1]) < self.settings["nrg_convergence"]:
                         return True
@@ -297,7 +308,8 @@ class Relax(object):
                                        command=self.settings["vasp_cmd"],
                                        ncpus=self.settings["ncpus"],
                                        kpar=self.settings["kpar"],
-                                       err_types=self.settings["err_types"])
+                                       err_types=self.settings["err_types"],
+                                       supervisor=self.settings["supervisor"])
 
                 # if no errors, continue
                 if result is None or self.not_converging():
@@ -310,7 +322,8 @@ class Relax(object):
                                 # This is an error but I'm not sure what to do about it
                                 pass
                             else:
-                                init_outcar = io.Outcar(outcarfile)
+                                init_outcar = io.Outcar(
+                                    outcarfile, fields=["complete", "ngx"])
                                 if not init_outcar.complete:
                                     # This is an error but I'm not sure what to do about it
                                     pass
@@ -407,10 +420,9 @@ class Relax(object):
         if io.job_complete(self.rundir[-1]):
 
             # if it is a final constant volume run
-            if io.get_incar_tag("SYSTEM", self.rundir[-1]) != None:
-                if io.get_incar_tag("SYSTEM",
-                                    self.rundir[-1]).split()[-1].strip().lower(
-                                    ) == "final":
+            system = io.get_incar_tag("SYSTEM", self.rundir[-1])
+            if system != None:
+                if system.split()[-1].strip().lower() == "final":
                     # if io.get_incar_tag("ISIF", self.rundir[-1]) == 2 and \
                     #    io.get_incar_tag("NSW", self.rundir[-1]) == 0 and \
                     #    io.get_incar_tag("ISMEAR", self.rundir[-1]) == -5:
@@ -418,9 +430,8 @@ class Relax(object):
 
             # elif constant volume run (but not the final one)
             if io.get_incar_tag("ISIF", self.rundir[-1]) in [0, 1, 2]:
-                if io.get_incar_tag("NSW", self.rundir[-1]) == len(
-                        io.Oszicar(os.path.join(self.rundir[-1],
-                                                "OSZICAR")).E):
+                if io.get_incar_tag("NSW", self.rundir[-1]) == io.ionic_steps(
+                        self.rundir[-1]):
                     return ("incomplete", "relax"
                             )  # static run hit NSW limit and so isn't "done"
                 else:
@@ -9,11 +9,11 @@ import re
 import subprocess
 import sys
 import time
-import gzip
 import warnings
 import signal
 
-from casm.vasp.error import VaspError, VaspWarning, error_check, crash_check
+from casm.vasp.error import VaspError, VaspWarning, error_check, crash_check, \
+    ErrorMonitor
 from casm.vasp import io
 
 
@@ -28,6 +28,8 @@ def complete_job(jobdir, settings):
          compress: Compresses listed files
          backup: Does nothing
          remove: Deletes listed files
+         compresslevel: gzip compression level, 1 (fastest) to 9 (default)
+         compress_threads: number of threads used to compress each file (default 1)
     """
 
     print("Complete VASP job: " + jobdir)
@@ -51,16 +53,14 @@ def complete_job(jobdir, settings):
     print(" gzip:", end=' ')
     for file in settings["compress"]:
         if os.path.isfile(os.path.join(jobdir, file)):
-            print(file, end=' ')
-            # Open target file, target file.gz
-            f_in = open(os.path.join(jobdir, file), 'rb')
-            f_out = gzip.open(os.path.join(jobdir, file) + '.gz', 'wb')
-            # Compress, close files
-            f_out.writelines(f_in)
-            f_out.close()
-            f_in.close()
-            # Remove original target file
-            os.remove(os.path.join(jobdir, file))
+            print(io.fileops.timing(
+                file,
+                *io.fileops.gzip_file(
+                    os.path.join(jobdir, file),
+                    compresslevel=settings.get("compresslevel", 9),
+                    threads=settings.get("compress_threads", 1),
+                    remove=True)),
+                  end=' ')
     print("")
     print("")
     sys.stdout.flush()
@@ -76,7 +76,8 @@ def run(jobdir=None,
         kpar=None,
         poll_check_time=5.0,
         err_check_time=60.0,
-        err_types=None):
+        err_types=None,
+        supervisor="poll"):
     """ Run vasp using subprocess.
 
         The 'command' is executed in the directory 'jobdir'.
@@ -97,6 +98,10 @@ def run(jobdir=None,
             poll_check_time: how frequently to check if the vasp job is completed
             err_check_time: how frequently to parse vasp output to check for errors
             err_types:  List of error types to check for. Supported errors: 'IbzkptError', 'SubSpaceMatrixError', 'NbandsError'. Default: None, in which case only SubSpaceMatrixErrors are checked.
+            supervisor: How to wait on the vasp job. One of:
+                        "poll" (default): sleep 'poll_check_time' between checks for completion, and check the modification time of every file in 'jobdir' for freeze errors
+                        "inotify": return as soon as vasp exits, check new stdout for errors every 'poll_check_time', and use inotify file events to detect freeze errors without stat calls (Linux only)
+                        "auto": use "inotify" if available, else "poll"
 
     """
     print("Begin vasp run:")
@@ -145,52 +150,70 @@ def run(jobdir=None,
     serr = open(os.path.join(jobdir, stderr), 'w')
     err = None
     p = subprocess.Popen(command.split(), stdout=sout, stderr=serr)
+    monitor = ErrorMonitor(jobdir, os.path.join(jobdir, stdout), err_types)
+    stdoutfile = os.path.abspath(os.path.join(jobdir, stdout))
+    watcher = None
+    if supervisor != "poll":
+        watcher = io.JobWatcher(p, [jobdir], backend=supervisor)
 
     # wait for process to end, and periodically check for errors
     poll = p.poll()
     last_check = time.time()
     stopcar_time = None
     while poll is None:
-        time.sleep(poll_check_time)
+        if watcher is None:
+            time.sleep(poll_check_time)
+            modified = None
+        else:
+            modified = watcher.wait(poll_check_time)
 
+        checked = False
         if time.time() - last_check > err_check_time:
             last_check = time.time()
-            err = error_check(jobdir, os.path.join(jobdir, stdout), err_types)
-            if err != None:
-                # FreezeErrors are fatal and usually not helped with STOPCAR
-                if "FreezeError" in err.keys():
-                    print("  VASP is frozen, killing job")
-                    sys.stdout.flush()
-                    # Sometimes p.kill doesn't work if the process is on multiple nodes
-                    os.kill(p.pid, signal.SIGKILL)
-                    p.kill()
-                    # If the job is re-invoked (e.g. via mpirun or srun) too quickly
-                    #   after the previous job ended, infinitiband clusters can have
-                    #   some issues with resource allocation. A 30s sleep solves this.
-                    time.sleep(30)
-                # Other errors can be killed with STOPCAR, which is safer
-                elif stopcar_time is None:
-                    print("  Found errors:", end=' ')
-                    for e in err:
-                        print(e, end=' ')
-                    print("\n  Killing job with STOPCAR")
-                    sys.stdout.flush()
-                    io.write_stopcar('e', jobdir)
-                    stopcar_time = time.time()
-                    time.sleep(30)
-                # If the STOPCAR exists, wait 5 min before manually killing the job
-                elif time.time() - stopcar_time > 300:
-                    print("  VASP is non-responsive, killing job")
-                    sys.stdout.flush()
-                    os.kill(p.pid, signal.SIGKILL)
-                    p.kill()
-                    # If the job is re-invoked (e.g. via mpirun or srun) too quickly
-                    #   after the previous job ended, infinitiband clusters can have
-                    #   some issues with resource allocation. A 30s sleep solves this.
-                    time.sleep(30)
+            err = monitor.check(watcher=watcher)
+            checked = True
+        elif modified is not None and stdoutfile in modified:
+            # with file events, new stdout is checked as soon as it is written
+            err = monitor.check(freeze=False)
+            checked = True
+        if checked and err != None:
+            # FreezeErrors are fatal and usually not helped with STOPCAR
+            if "FreezeError" in err.keys():
+                print("  VASP is frozen, killing job")
+                sys.stdout.flush()
+                # Sometimes p.kill doesn't work if the process is on multiple nodes
+                os.kill(p.pid, signal.SIGKILL)
+                p.kill()
+                # If the job is re-invoked (e.g. via mpirun or srun) too quickly
+                #   after the previous job ended, infinitiband clusters can have
+                #   some issues with resource allocation. A 30s sleep solves this.
+                time.sleep(30)
+            # Other errors can be killed with STOPCAR, which is safer
+            elif stopcar_time is None:
+                print("  Found errors:", end=' ')
+                for e in err:
+                    print(e, end=' ')
+                print("\n  Killing job with STOPCAR")
+                sys.stdout.flush()
+                io.write_stopcar('e', jobdir)
+                stopcar_time = time.time()
+                time.sleep(30)
+            # If the STOPCAR exists, wait 5 min before manually killing the job
+            elif time.time() - stopcar_time > 300:
+                print("  VASP is non-responsive, killing job")
+                sys.stdout.flush()
+                os.kill(p.pid, signal.SIGKILL)
+                p.kill()
+                # If the job is re-invoked (e.g. via mpirun or srun) too quickly
+                #   after the previous job ended, infinitiband clusters can have
+                #   some issues with resource allocation. A 30s sleep solves this.
+                time.sleep(30)
 
         poll = p.poll()
 
+    if watcher is not None:
+        watcher.close()
+
     # close output files
     sout.close()
     serr.close()
@@ -205,7 +228,7 @@ def run(jobdir=None,
         # Crash-type errors take priority over any other error that may show up
         err = crash_check(jobdir, os.path.join(jobdir, stdout), err_types)
         if err is None:
-            err = error_check(jobdir, os.path.join(jobdir, stdout), err_types)
+            err = monitor.check()
     if err != None:
         print("  Found errors:", end=' ')
         for e in err:
@@ -87,7 +87,7 @@ class Relax(VaspCalculatorBase):
         """Setus up folders and writes structure files"""
         args = "query -c " + self.selection.path + " --write-structure"
         self.selection.proj.capture(args)
-        for index, config_data in self.selection.data.iterrows():
+        for config_data in self.config_records():
             os.makedirs(config_data["calcdir"], exist_ok=True)
 
     def config_setup(self, config_data):
@@ -113,17 +113,17 @@ class Relax(VaspCalculatorBase):
         """Setup initial relaxation run for the selection"""
         super(Relax, self).setup()
 
-    def submit(self):
+    def submit(self, db_index=False):
         """Submit a job for each configuration"""
-        super(Relax, self).submit()
+        super(Relax, self).submit(db_index=db_index)
 
     def run(self):
         """Runs the calcutation on the selection"""
         super(Relax, self).run()
 
-    def report(self):
+    def report(self, n_jobs=1):
         """Reports results for the selection"""
-        super(Relax, self).report()
+        super(Relax, self).report(n_jobs=n_jobs)
 
     @staticmethod
     def run_cmd(configdir, calctype):
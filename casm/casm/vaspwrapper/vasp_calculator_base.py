@@ -3,6 +3,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from builtins import *
 
+import concurrent.futures
+import contextlib
+import copy
 import json
 import math
 import numpy as np
@@ -38,6 +41,410 @@ def complete_job(jobid=None):
         print(str(e))
         sys.stdout.flush()
 
+
+def _n_workers(n_jobs):
+    """Number of workers for 'n_jobs', where -1 means one per CPU"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def parallel_map(func,
+                 args_list,
+                 n_jobs=1,
+                 executor="thread",
+                 label=None,
+                 out=None):
+    """Return [func(*args) for args in args_list], evaluated in parallel
+
+    Arguments
+    ---------
+    func: callable
+        Function to evaluate. For executor="process" it must be picklable, for
+        example a module-level function.
+    args_list: list of tuple
+        Arguments for each evaluation
+    n_jobs: int, optional, default=1
+        Number of workers. If 1, evaluations are done sequentially in this
+        process. If -1, one worker per CPU is used.
+    executor: str, optional, default="thread"
+        One of "thread" (concurrent.futures.ThreadPoolExecutor) or "process"
+        (concurrent.futures.ProcessPoolExecutor)
+    label: str, optional
+        If given, progress is printed as "label: n_done/n_total"
+    out: file-like, optional, default=sys.stdout
+        Where progress is printed
+
+    Returns
+    -------
+    results: list
+        func(*args) for each args in args_list, in order
+    """
+    if out is None:
+        out = sys.stdout
+    n_total = len(args_list)
+    step = max(1, n_total // 20)
+
+    def progress(n_done):
+        if label is not None and (n_done % step == 0 or n_done == n_total):
+            print("{0}: {1}/{2}".format(label, n_done, n_total), file=out)
+            out.flush()
+
+    n_workers = _n_workers(n_jobs)
+    if n_workers == 1 or n_total <= 1:
+        results = []
+        for args in args_list:
+            results.append(func(*args))
+            progress(len(results))
+        return results
+
+    if executor == "thread":
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+    elif executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=n_workers)
+    else:
+        raise VaspWrapperError("Unknown executor: '" + str(executor) +
+                               "'. Options are 'thread' or 'process'.")
+    with pool:
+        futures = [pool.submit(func, *args) for args in args_list]
+        for n_done, _ in enumerate(concurrent.futures.as_completed(futures)):
+            progress(n_done + 1)
+        return [f.result() for f in futures]
+
+
+def config_status(calculator, calcdir, settings):
+    """Return (status, task, n_runs, energy) of the calculation in 'calcdir'
+
+    Arguments
+    ---------
+    calculator: class
+        Calculation class, such as casm.vasp.Relax, constructed as
+        calculator(calcdir, settings) and providing 'status()' and 'rundir'
+    calcdir: str
+        Calculation directory
+    settings: dict
+        Calculation settings
+
+    Returns
+    -------
+    (status, task, n_runs, energy):
+        'status' and 'task' are from calculation.status(), 'n_runs' is the
+        number of 'run.i' directories, and 'energy' is the last E0 in the
+        OSZICAR of 'run.final', if it exists, or else the last 'run.i'
+        directory, or NaN if not available. Output files are read through
+        casm.vasp.io.cached_parse, and nothing is written.
+    """
+    calculation = calculator(calcdir, settings)
+    (status, task) = calculation.status()
+    energy = float('nan')
+    rundirs = list(calculation.rundir)
+    if os.path.isdir(calculation.finaldir):
+        rundirs.append(calculation.finaldir)
+    for rundir in reversed(rundirs):
+        try:
+            oszicar = vasp.io.cached_parse(vasp.io.Oszicar,
+                                           os.path.join(rundir, "OSZICAR"))
+            energy = oszicar.E[-1]
+            break
+        except Exception:  #pylint: disable=broad-except
+            continue
+    return (status, task, len(calculation.rundir), energy)
+
+
+def _config_status_from_settings_file(cls, calculator, setfile, calcdir):
+    """config_status, reading settings from 'setfile' with 'cls' methods"""
+    try:
+        settings = cls.run_settings(cls.read_settings(setfile))
+        return config_status(calculator, calcdir, settings)
+    except Exception as e:  #pylint: disable=broad-except
+        return ("error", str(e), 0, float('nan'))
+
+
+def job_index(db, calcdirs, packed_jobs_dir=None):
+    """Return the jobs in a prisms_jobs JobDB, indexed by calculation directory
+
+    Arguments
+    ---------
+    db: prisms_jobs.JobDB
+        Job database, which should already be updated with db.update()
+    calcdirs: list of str
+        Calculation directories
+    packed_jobs_dir: str, optional
+        If given, jobs run in a subdirectory of 'packed_jobs_dir' containing a
+        PACKED_CALCDIRS file, as by VaspCalculatorBase.submit_packed, are also
+        indexed under each calcdir listed in that file.
+
+    Returns
+    -------
+    index: dict
+        For each calcdir with jobs, a list of dict with keys "jobid",
+        "jobstatus", and "taskstatus", for the jobs run in calcdir or one of
+        its subdirectories, in database order. This is read with one query,
+        rather than one 'db.select_regex_id("rundir", calcdir)' per calcdir.
+    """
+    calcdirs = set(calcdirs)
+    index = dict()
+    db.curs.execute("SELECT jobid, rundir, jobstatus, taskstatus FROM jobs")
+    for r in db.curs.fetchall():
+        job = {
+            "jobid": r["jobid"],
+            "jobstatus": r["jobstatus"],
+            "taskstatus": r["taskstatus"]
+        }
+        d = r["rundir"]
+        while d:
+            if d in calcdirs:
+                index.setdefault(d, []).append(job)
+            parent = os.path.dirname(d)
+            if parent == d:
+                break
+            d = parent
+        if packed_jobs_dir is not None:
+            _index_packed_job(index, calcdirs, r, packed_jobs_dir)
+    return index
+
+
+def packed_job_index(db, calcdirs, packed_jobs_dir):
+    """Return the jobs of packed bundles, indexed by calculation directory
+
+    Only the jobs run in 'packed_jobs_dir' are read from the database.
+
+    Arguments
+    ---------
+    db: prisms_jobs.JobDB
+        Job database, which should already be updated with db.update()
+    calcdirs: list of str
+        Calculation directories
+    packed_jobs_dir: str
+        Directory containing the run directories of packed jobs, as from
+        VaspCalculatorBase.packed_jobs_dir
+
+    Returns
+    -------
+    index: dict
+        For each calcdir listed in the PACKED_CALCDIRS file of a packed job, a
+        list of dict with keys "jobid", "jobstatus", "taskstatus", and
+        "packed" (True), as in job_index
+    """
+    calcdirs = set(calcdirs)
+    index = dict()
+    db.curs.execute(
+        "SELECT jobid, rundir, jobstatus, taskstatus FROM jobs "
+        "WHERE rundir LIKE ?", (os.path.join(packed_jobs_dir, "%"), ))
+    for r in db.curs.fetchall():
+        _index_packed_job(index, calcdirs, r, packed_jobs_dir)
+    return index
+
+
+def _index_packed_job(index, calcdirs, r, packed_jobs_dir):
+    """Add a packed job database row to 'index' under each of its calcdirs"""
+    if os.path.dirname(r["rundir"]) != packed_jobs_dir:
+        return
+    job = {
+        "jobid": r["jobid"],
+        "jobstatus": r["jobstatus"],
+        "taskstatus": r["taskstatus"],
+        "packed": True
+    }
+    try:
+        with open(os.path.join(r["rundir"], PACKED_CALCDIRS)) as f:
+            for calcdir in f.read().splitlines():
+                if calcdir in calcdirs:
+                    index.setdefault(calcdir, []).append(job)
+    except IOError:
+        pass
+
+
+def complete_packed_job(rundir):
+    """Mark the packed job run in 'rundir' complete, or errored, in the job db
+
+    Called once, by the job, after every configuration of the bundle has run.
+    The job is complete if every calcdir listed in the PACKED_CALCDIRS file
+    has status "complete" in its status.json file.
+    """
+    with open(os.path.join(rundir, PACKED_CALCDIRS)) as f:
+        calcdirs = f.read().splitlines()
+    n_incomplete = 0
+    for calcdir in calcdirs:
+        try:
+            with open(os.path.join(calcdir, "status.json")) as f:
+                status = json.load(f)["status"]
+        except (IOError, ValueError, KeyError):
+            status = None
+        if status != "complete":
+            n_incomplete += 1
+    if n_incomplete:
+        error_job("{0} of {1} packed configurations not complete".format(
+            n_incomplete, len(calcdirs)))
+    else:
+        complete_job()
+
+
+# file in a packed job's run directory listing the calcdirs it runs
+PACKED_CALCDIRS = "calcdirs"
+
+# environment variable set for the configurations run by a packed job, whose
+# job database record is completed once for the whole bundle
+PACKED_JOB_ENV = "CASM_PACKED_JOB"
+
+
+def estimate_cost(calcdir):
+    """Return the estimated cost, number of atoms times number of k-points, of
+    the calculation set up in 'calcdir'
+
+    The number of k-points is the product of the KPOINTS subdivisions, or 1
+    for fully automatic KPOINTS.
+    """
+    n_atoms = len(vasp.io.Poscar(os.path.join(calcdir, "POSCAR")).basis)
+    kpoints = vasp.io.Kpoints(os.path.join(calcdir, "KPOINTS"))
+    n_kpoints = 1
+    if kpoints.automode[0].lower() != 'a':
+        for n in kpoints.subdivisions:
+            n_kpoints *= n
+    return n_atoms * n_kpoints
+
+
+def pack_bundles(costs, max_cost):
+    """Group items into bundles with total cost of at most 'max_cost'
+
+    Items are placed in order of decreasing cost into the first bundle with
+    room for them (first-fit decreasing). An item with cost greater than
+    'max_cost' is placed in a bundle by itself.
+
+    Arguments
+    ---------
+    costs: list of number
+        Cost of each item
+    max_cost: number
+        Maximum total cost of a bundle
+
+    Returns
+    -------
+    bundles: list of list of int
+        Indices of the items in each bundle, each in increasing order
+    """
+    bundles = []
+    totals = []
+    for i in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        for b, total in enumerate(totals):
+            if total + costs[i] <= max_cost:
+                bundles[b].append(i)
+                totals[b] += costs[i]
+                break
+        else:
+            bundles.append([i])
+            totals.append(costs[i])
+    return [sorted(bundle) for bundle in bundles]
+
+
+def packed_cmd(cmds, logfiles, n_concurrent=1, ncpus=None):
+    """Return a shell command running several commands
+
+    Arguments
+    ---------
+    cmds: list of str
+        Commands to run, such as from 'run_cmd'
+    logfiles: list of str
+        File that the output of each command is written to, if run
+        concurrently
+    n_concurrent: int, optional, default=1
+        If 1, run the commands one after another. Otherwise, run up to
+        'n_concurrent' at a time, in the background, and wait for each group
+        to finish before starting the next.
+    ncpus: int, optional
+        If given, CASM_NCPUS is set to 'ncpus', so that each command uses
+        'ncpus' CPUs rather than the whole job (see run_settings).
+    """
+    packed = ""
+    if ncpus is not None:
+        packed += "export CASM_NCPUS={0}\n".format(int(ncpus))
+    if n_concurrent is None or n_concurrent <= 1:
+        return packed + "".join(cmd.rstrip("\n") + "\n" for cmd in cmds)
+    for i, (cmd, logfile) in enumerate(zip(cmds, logfiles)):
+        packed += "({0}) > {1} 2>&1 &\n".format(cmd.rstrip("\n"), logfile)
+        if (i + 1) % n_concurrent == 0 or i + 1 == len(cmds):
+            packed += "wait\n"
+    return packed
+
+
+def _walltime_seconds(walltime):
+    """Return the number of seconds in a "[D-]HH:MM:SS" walltime"""
+    days = 0
+    if "-" in walltime:
+        days, walltime = walltime.split("-", 1)
+    seconds = 0
+    for field in walltime.split(":"):
+        seconds = 60 * seconds + int(field)
+    return 86400 * int(days) + seconds
+
+
+def packed_walltime(walltimes, n_rounds):
+    """Return the walltime of a job running 'n_rounds' groups of
+    calculations one after another, as "HH:MM:SS"
+
+    Each group is allowed the longest of 'walltimes', the walltimes of the
+    individual calculations.
+    """
+    seconds = n_rounds * max(_walltime_seconds(str(w)) for w in walltimes)
+    return "{0}:{1:02d}:{2:02d}".format(seconds // 3600, seconds % 3600 // 60,
+                                        seconds % 60)
+
+
+def config_paths(casm_directories, names, clex, calc_subdir=""):
+    """
+    derive the configuration, calculation, and settings file paths of many
+    configurations at once
+
+    The directory paths are built with vectorized string operations on the
+    column of configuration names, rather than one configuration at a time.
+
+    Parameters
+    ----------
+    casm_directories: casm.project.DirectoryStructure
+    names: list-like of str
+        Configuration names, with format SCELV_A_B_C_D_E_F/I
+    clex: casm.project.ClexDescription
+        Used to specify the calctype
+    calc_subdir: str, optional, default=""
+
+    Returns
+    -------
+    paths: dict of numpy.ndarray
+        With keys "configdir", "calcdir", and "setfile", as from
+        'configuration_dir', 'calctype_dir', and 'settings_path_crawl' for
+        "calc.json"
+    """
+    names = pandas.Series(np.asarray(names, dtype=object)).astype(str)
+    prefix = casm_directories.configuration_dir("", calc_subdir)
+    calctype = os.path.basename(
+        casm_directories.calctype_dir("", clex, calc_subdir))
+    configdir = prefix + names
+    calcdir = configdir + (os.sep + calctype)
+    setfile = np.array([
+        casm_directories.settings_path_crawl(
+            "calc.json", name, clex, calc_subdir) for name in names.values
+    ],
+                       dtype=object)
+    return {
+        "configdir": configdir.values,
+        "calcdir": calcdir.values,
+        "setfile": setfile
+    }
+
+
+def config_records(data):
+    """
+    return the rows of selection data as a list of dict
+
+    Much faster than DataFrame.iterrows, which constructs a pandas.Series for
+    each row, and each dict can be used in place of the row in
+    'config_setup', 'finalize', etc.
+    """
+    return data.to_dict("records")
+
+
 class VaspCalculatorBase(object):
     """
     Base class containing all the basic functions that method classes can inherit
@@ -112,18 +519,34 @@ class VaspCalculatorBase(object):
         return config_dict
 
     def append_selection_data(self):
-        """append configproperties to selection.data"""
-        config_dicts = []
-        for index, config_data in self.selection.data.iterrows():
-            config_dicts.append(self.config_properties(config_data))
-        for key in config_dicts[0].keys():
+        """append configproperties to selection.data
+
+        The paths from 'config_properties' are derived for all configurations
+        at once, with 'config_paths', unless a subclass overrides
+        'config_properties', in which case it is called for each configuration.
+        """
+        if type(self).config_properties is not \
+                VaspCalculatorBase.config_properties:
+            config_dicts = [
+                self.config_properties(config_data)
+                for config_data in self.config_records()
+            ]
+            paths = dict()
+            for key in config_dicts[0].keys():
+                paths[key] = [config_dict[key] for config_dict in config_dicts]
+        else:
+            paths = config_paths(self.casm_directories,
+                                 self.selection.data["name"], self.clex,
+                                 self.calc_subdir)
+        for key, values in paths.items():
             if key in self.selection.data.columns:
                 continue
-            values = []
-            for config_dict in config_dicts:
-                values.append(config_dict[key])
             self.selection.add_data(key, values)
 
+    def config_records(self):
+        """return the selection data as a list of dict, one per configuration"""
+        return config_records(self.selection.data)
+
     def pre_setup(self):
         """has to be overloaded in the child class"""
         pass
@@ -131,7 +554,7 @@ class VaspCalculatorBase(object):
     def setup(self):
         """Setup initial relaxation run for the selection"""
         self.pre_setup()
-        for index, config_data in self.selection.data.iterrows():
+        for config_data in self.config_records():
             self.config_setup(config_data)
 
     def config_setup(self, config_data):
@@ -208,9 +631,14 @@ class VaspCalculatorBase(object):
 
     @staticmethod
     def read_settings(setfile):
-        """ Read settings from a settings calc.json file"""
+        """ Read settings from a settings calc.json file
+
+        The file is only parsed again if it changes (see
+        casm.vasp.io.cached_parse), and a copy of the settings is returned, so
+        it may be modified.
+        """
 
-        settings = read_settings(setfile)
+        settings = copy.deepcopy(vasp.io.cached_parse(read_settings, setfile))
         # set default settings if not present
         if not "ncore" in settings:
             settings["ncore"] = None
@@ -315,70 +743,139 @@ class VaspCalculatorBase(object):
 
         return True
 
-    def submit(self):
-        """ submit jobs for a selection"""
-
-        import prisms_jobs as jobs
-        print("queue software:", jobs.config.software().NAME)
-
-        self.pre_setup()
-        db = jobs.JobDB()
-        for index, config_data in self.selection.data.iterrows():
-            print("Submitting...")
-            print("Configuration:", config_data["name"])
-            #first, check if the job has already been submitted and is not completed
-            print("Calculation directory:", config_data["calcdir"])
+    def _submit_needed(self, config_data, db, db_jobs=None, packed_jobs=None):
+        """
+        check if a job should be submitted for a configuration
+
+        Parameters
+        ----------
+        config_data: pandas.Series
+            Row of self.selection.data
+        db: prisms_jobs.JobDB
+            Job database
+        db_jobs: dict, optional
+            Jobs indexed by calcdir, as from job_index. If None, the job
+            database is searched and updated for this configuration.
+        packed_jobs: dict, optional
+            Packed jobs indexed by calcdir, as from packed_job_index, used
+            if 'db_jobs' is None
+
+        Returns
+        -------
+        settings: dict or None
+            The calculation settings, if a job should be submitted, else None
+        """
+        print("Submitting...")
+        print("Configuration:", config_data["name"])
+        #first, check if the job has already been submitted and is not completed
+        print("Calculation directory:", config_data["calcdir"])
+        if db_jobs is not None:
+            records = db_jobs.get(config_data["calcdir"], [])
+        else:
+            records = []
             id = db.select_regex_id("rundir", config_data["calcdir"])
-            print("JobID:", id)
+            if id != []:
+                db.update()
+                records = [db.select_job(j) for j in id]
+            if packed_jobs is not None:
+                records += packed_jobs.get(config_data["calcdir"], [])
+        print("JobID:", [job["jobid"] for job in records])
+        sys.stdout.flush()
+        for job in records:
+            if job["jobstatus"] != "C":
+                print("JobID:", job["jobid"], "  Jobstatus:", job["jobstatus"],
+                      "  Not submitting.")
+                sys.stdout.flush()
+                return None
+        settings = self.read_settings(config_data["setfile"])
+        # construct the Relax object
+        calculation = self.calculator(config_data["calcdir"],
+                                      self.run_settings(settings))
+        # check the current status
+        (status, task) = calculation.status()
+
+        if status == "complete":
+            print("Status:", status, "  Not submitting.")
             sys.stdout.flush()
-            try:
-                if id != []:
-                    db.update()
-                    for j in id:
-                        job = db.select_job(j)
-                        if job["jobstatus"] != "C":
-                            print("JobID:", job["jobid"], "  Jobstatus:",
-                                  job["jobstatus"], "  Not submitting.")
-                            sys.stdout.flush()
-                            raise BreakException
-            except BreakException:
-                continue
-            settings = self.read_settings(config_data["setfile"])
-            # construct the Relax object
-            calculation = self.calculator(config_data["calcdir"],
-                                          self.run_settings(settings))
-            # check the current status
-            (status, task) = calculation.status()
 
-            if status == "complete":
-                print("Status:", status, "  Not submitting.")
-                sys.stdout.flush()
+            # ensure job marked as complete in db; packed jobs are completed
+            # by the job itself, once for the whole bundle
+            if self.auto:
+                for job in records:
+                    if job["taskstatus"] == "Incomplete" and \
+                            not job.get("packed", False):
+                        complete_job(jobid=job["jobid"])
+
+            # ensure results report written
+            if not os.path.isfile(
+                    os.path.join(config_data["calcdir"],
+                                 "properties.calc.json")):
+                if self.is_converged(calculation):
+                    self.finalize(config_data)
 
-                # ensure job marked as complete in db
-                if self.auto:
-                    for j in id:
-                        job = db.select_job(j)
-                        if job["taskstatus"] == "Incomplete":
-                            complete_job(jobid=j)
+            return None
 
-                # ensure results report written
-                if not os.path.isfile(
-                        os.path.join(config_data["calcdir"],
-                                     "properties.calc.json")):
-                    if self.is_converged(calculation):
-                        self.finalize(config_data)
+        elif status == "not_converging":
+            print("Status:", status, "  Not submitting.")
+            sys.stdout.flush()
+            return None
 
-                continue
+        elif status != "incomplete":
+            raise VaspWrapperError("unexpected relaxation status: '" + status +
+                                   "' and task: '" + task + "'")
 
-            elif status == "not_converging":
-                print("Status:", status, "  Not submitting.")
-                sys.stdout.flush()
-                continue
+        return settings
 
-            elif status != "incomplete":
-                raise VaspWrapperError("unexpected relaxation status: '" +
-                                       status + "' and task: '" + task + "'")
-                sys.stdout.flush()
+    def _job_cmd(self, settings, config_data, run_cmd):
+        """return 'run_cmd' with the preamble, prerun, and postrun commands"""
+        cmd = ""
+        if settings["preamble"] is not None:
+            # Append any instructions given in the 'preamble' file, if given
+            preamble = self.casm_directories.settings_path_crawl(
+                settings["preamble"], config_data["name"], self.clex,
+                self.calc_subdir)
+            with open(preamble) as my_preamble:
+                cmd += "".join(my_preamble)
+        # Or just execute a single prerun line, if given
+        if settings["prerun"] is not None:
+            cmd += settings["prerun"] + "\n"
+        cmd += run_cmd
+        if settings["postrun"] is not None:
+            cmd += settings["postrun"] + "\n"
+        return cmd
+
+    def submit(self, db_index=False):
+        """
+        submit jobs for a selection
+
+        Parameters
+        ----------
+        db_index: bool, optional, default=False
+            If True, the job database is updated from the queue once, and the
+            jobs for every calcdir are found with one query (see job_index),
+            instead of searching the database and updating it from the queue
+            for each configuration.
+        """
+
+        import prisms_jobs as jobs
+        print("queue software:", jobs.config.software().NAME)
+
+        self.pre_setup()
+        db = jobs.JobDB()
+        db_jobs = None
+        packed_jobs = None
+        if db_index:
+            db.update()
+            db_jobs = job_index(db, self.selection.data["calcdir"],
+                                self.packed_jobs_dir())
+        elif os.path.isdir(self.packed_jobs_dir()):
+            db.update()
+            packed_jobs = packed_job_index(db, self.selection.data["calcdir"],
+                                           self.packed_jobs_dir())
+        for config_data in self.config_records():
+            settings = self._submit_needed(config_data, db, db_jobs,
+                                           packed_jobs)
+            if settings is None:
                 continue
 
             print("Preparing to submit a VASP relaxation PBS job")
@@ -392,20 +889,9 @@ class VaspCalculatorBase(object):
             nodes, ppn = self._calc_submit_node_info(settings, config_data)
 
             # construct command to be run
-            cmd = ""
-            if settings["preamble"] is not None:
-                # Append any instructions given in the 'preamble' file, if given
-                preamble = self.casm_directories.settings_path_crawl(
-                    settings["preamble"], config_data["name"], self.clex,
-                    self.calc_subdir)
-                with open(preamble) as my_preamble:
-                    cmd += "".join(my_preamble)
-            # Or just execute a single prerun line, if given
-            if settings["prerun"] is not None:
-                cmd += settings["prerun"] + "\n"
-            cmd += self.run_cmd(config_data["configdir"], self.calctype)
-            if settings["postrun"] is not None:
-                cmd += settings["postrun"] + "\n"
+            cmd = self._job_cmd(
+                settings, config_data,
+                self.run_cmd(config_data["configdir"], self.calctype))
 
             print("Constructing a PBS job")
             sys.stdout.flush()
@@ -436,6 +922,138 @@ class VaspCalculatorBase(object):
             print("CASM VASPWrapper relaxation PBS job submission complete\n")
             sys.stdout.flush()
 
+    def packed_jobs_dir(self):
+        """return the directory containing the run directories of packed jobs"""
+        return os.path.join(self.casm_directories.casm_dir(), "packed_jobs")
+
+    def submit_packed(self, max_cost, n_concurrent=1):
+        """
+        submit jobs that each run several configurations of a selection
+
+        Configurations that need to be submitted are set up, and grouped into
+        bundles with a total estimated cost (see estimate_cost) of at most
+        'max_cost' (see pack_bundles). One job is submitted for each bundle,
+        which runs the configurations one after another, or 'n_concurrent' at
+        a time. Each configuration's status.json is written as for 'submit'.
+
+        The job's run directory is in packed_jobs_dir() and contains a
+        "calcdirs" file listing the calculation directories of the bundle, so
+        that configurations in queued or running bundles are not submitted
+        again. The job settings (queue, preamble, etc.) are taken from the
+        first configuration in each bundle. Each configuration is given the
+        largest 'nodes' and 'ppn' of any configuration in the bundle, so the
+        job requests that many nodes for each concurrent configuration, and
+        CASM_NCPUS is set so that each runs on its share of the job (see
+        run_settings). The job walltime is the longest walltime of any
+        configuration in the bundle times the number of groups of
+        'n_concurrent' configurations run one after another.
+
+        The configurations are run with the PACKED_JOB_ENV environment
+        variable set, so that they do not complete the job in the job
+        database. With 'auto', the job is completed, or marked as errored,
+        once, after the whole bundle has run (see complete_packed_job).
+
+        Parameters
+        ----------
+        max_cost: number
+            Maximum total estimated cost of the configurations in a bundle
+        n_concurrent: int, optional, default=1
+            Number of configurations of a bundle run at the same time. Each
+            concurrent configuration's output is written to "packed.out" in its
+            calcdir.
+        """
+
+        import prisms_jobs as jobs
+        print("queue software:", jobs.config.software().NAME)
+
+        self.pre_setup()
+        db = jobs.JobDB()
+        db.update()
+        db_jobs = job_index(db, self.selection.data["calcdir"],
+                            self.packed_jobs_dir())
+
+        members = []
+        currdir = os.getcwd()
+        for config_data in self.config_records():
+            settings = self._submit_needed(config_data, db, db_jobs)
+            if settings is None:
+                continue
+            os.chdir(config_data["calcdir"])
+            self.config_setup(config_data)
+            os.chdir(currdir)
+            members.append(
+                (config_data, settings, estimate_cost(config_data["calcdir"])))
+
+        bundles = pack_bundles([cost for _, _, cost in members], max_cost)
+        print("Packing", len(members), "configurations into", len(bundles),
+              "jobs")
+        sys.stdout.flush()
+
+        for bundle in bundles:
+            config_data, settings, _ = members[bundle[0]]
+            name = "packed." + jobname(config_data["name"])
+            rundir = os.path.join(self.packed_jobs_dir(), name)
+            if not os.path.isdir(rundir):
+                os.makedirs(rundir)
+            with open(os.path.join(rundir, PACKED_CALCDIRS), 'w') as f:
+                for i in bundle:
+                    f.write(members[i][0]["calcdir"] + "\n")
+
+            nodes, ppn = 0, 0
+            for i in bundle:
+                n, p = self._calc_submit_node_info(members[i][1],
+                                                   members[i][0])
+                nodes, ppn = max(nodes, n), max(ppn, p)
+
+            n_jobs = max(1, min(n_concurrent or 1, len(bundle)))
+            n_rounds = int(math.ceil(float(len(bundle)) / n_jobs))
+            walltime = packed_walltime(
+                [members[i][1]["walltime"] for i in bundle], n_rounds)
+            ncpus = None
+            if n_jobs > 1:
+                ncpus = nodes * ppn
+                nodes *= n_jobs
+
+            cmds = [
+                self.run_cmd(members[i][0]["configdir"], self.calctype)
+                for i in bundle
+            ]
+            logfiles = [
+                os.path.join(members[i][0]["calcdir"], "packed.out")
+                for i in bundle
+            ]
+            run_cmd = "export " + PACKED_JOB_ENV + "=1\n" + packed_cmd(
+                cmds, logfiles, n_concurrent, ncpus)
+            if self.auto:
+                run_cmd += "python -c \"from casm.vaspwrapper.vasp_calculator_base import complete_packed_job; complete_packed_job('{0}')\"\n".format(
+                    rundir)
+            cmd = self._job_cmd(settings, config_data, run_cmd)
+
+            print("Constructing a packed PBS job:", name)
+            sys.stdout.flush()
+            job = jobs.Job(name=name,
+                           account=settings["account"],
+                           nodes=nodes,
+                           ppn=ppn,
+                           walltime=walltime,
+                           pmem=settings["pmem"],
+                           qos=settings["qos"],
+                           queue=settings["queue"],
+                           message=settings["message"],
+                           email=settings["email"],
+                           priority=settings["priority"],
+                           command=cmd,
+                           auto=self.auto)
+
+            os.chdir(rundir)
+            job.submit()
+            os.chdir(currdir)
+            for i in bundle:
+                self.report_status(members[i][0]["calcdir"], "submitted")
+
+            print("CASM VASPWrapper packed PBS job submission complete\n")
+            sys.stdout.flush()
+
     def run_cmd(self, configdir, calctype):
         """has to be overloaded in the method class"""
         return None
@@ -492,7 +1110,10 @@ class VaspCalculatorBase(object):
             settings["ncore"] = None
 
         if settings["ncpus"] is None or settings["ncpus"] == "CASM_DEFAULT":
-            if "PBS_NP" in os.environ:
+            if "CASM_NCPUS" in os.environ:
+                # set by run_local
+                settings["ncpus"] = int(os.environ["CASM_NCPUS"])
+            elif "PBS_NP" in os.environ:
                 settings["ncpus"] = int(os.environ["PBS_NP"])
             elif "SLURM_NTASKS" in os.environ:
                 settings["ncpus"] = int(os.environ["SLURM_NTASKS"])
@@ -507,7 +1128,9 @@ class VaspCalculatorBase(object):
 
     def run(self):
         """run the job of a selection"""
-        for index, config_data in self.selection.data.iterrows():
+        # configurations of a packed job leave the job database to the bundle
+        auto = self.auto and PACKED_JOB_ENV not in os.environ
+        for config_data in self.config_records():
             settings = self.read_settings(config_data["setfile"])
             calculation = self.calculator(config_data["calcdir"],
                                           self.run_settings(settings))
@@ -520,7 +1143,7 @@ class VaspCalculatorBase(object):
                 sys.stdout.flush()
 
                 # mark job as complete in db
-                if self.auto:
+                if auto:
                     complete_job()
 
                 # write results to properties.calc.json
@@ -552,7 +1175,7 @@ class VaspCalculatorBase(object):
             if status == "not_converging":
 
                 # mark error
-                if self.auto:
+                if auto:
                     error_job("Not converging")
 
                 print("Not Converging!")
@@ -572,6 +1195,7 @@ class VaspCalculatorBase(object):
                     pass
                 settingsfile = os.path.join(config_set_dir, "calc.json")
                 write_settings(settings, settingsfile)
+                self.casm_directories.refresh_settings()
 
                 print("Writing:", settingsfile)
                 print("Edit the 'run_limit' property if you wish to continue.")
@@ -581,7 +1205,7 @@ class VaspCalculatorBase(object):
             elif status == "complete":
 
                 # mark job as complete in db
-                if self.auto:
+                if auto:
                     complete_job()
 
                 # write results to properties.calc.json
@@ -595,6 +1219,53 @@ class VaspCalculatorBase(object):
                     status + "' and task: '" + task + "'")
             sys.stdout.flush()
 
+    def run_local(self, n_workers=1, ncpus=None, queue_file=None):
+        """
+        run the calculations of a selection locally, several at a time
+
+        Each configuration is run in its own process, with 'run_cmd', as by a
+        submitted job. The configurations are kept in a work queue file, so
+        that if this is interrupted, running it again continues with the
+        configurations that were not finished.
+
+        Parameters
+        ----------
+        n_workers: int, optional, default=1
+            Number of calculations run at the same time. If -1, one per CPU.
+        ncpus: int, optional
+            Number of CPUs for each calculation, used for the 'ncpus' setting
+            if it is not set in calc.json (through the CASM_NCPUS environment
+            variable). Default is the number of CPUs divided by 'n_workers'.
+        queue_file: str, optional
+            Path to the work queue file. Default is
+            ".casm/local_run/<calctype>.json" in the project.
+
+        Returns
+        -------
+        n_failed: int
+            Number of configurations whose run failed
+        """
+        from casm.wrapper import local
+
+        n_workers = _n_workers(n_workers)
+        if ncpus is None:
+            ncpus = max(1, (os.cpu_count() or 1) // n_workers)
+        if queue_file is None:
+            queue_file = os.path.join(self.casm_directories.casm_dir(),
+                                      "local_run", self.calctype + ".json")
+
+        queue = local.WorkQueue(queue_file)
+        for config_data in self.config_records():
+            queue.add(config_data["name"],
+                      self.run_cmd(config_data["configdir"], self.calctype),
+                      config_data["calcdir"],
+                      os.path.join(config_data["calcdir"], "local_run.out"))
+
+        env = dict(os.environ)
+        env["CASM_NCPUS"] = str(ncpus)
+        print("Work queue:", queue.filename)
+        return local.run_queue(queue, n_workers, env)
+
     def report_status(self, calcdir, status, failure_type=None):
         """Report calculation status to status.json file in configuration directory.
 
@@ -624,15 +1295,63 @@ class VaspCalculatorBase(object):
         print("Wrote " + outputfile)
         sys.stdout.flush()
 
-    def report(self):
+    def status(self, n_jobs=1, executor="thread", verbose=True):
+        """
+        read the status of each calculation in the selection
+
+        Nothing is written, so this can be used while calculations are running.
+
+        Parameters
+        ----------
+        n_jobs: int, optional, default=1
+            Number of workers. If -1, one per CPU is used.
+        executor: str, optional, default="thread"
+            One of "thread" or "process"
+        verbose: bool, optional, default=True
+            If True, print progress
+
+        Returns
+        -------
+        status: pandas.DataFrame
+            With columns "configname", "status", "task", "n_runs", and "energy",
+            the last E0 read from OSZICAR, or NaN if not available
+        """
+        args_list = [(type(self), self.calculator, config_data["setfile"],
+                      config_data["calcdir"])
+                     for config_data in self.config_records()]
+        # calculation objects print as they are constructed; sys.stdout is
+        # redirected once here, not in each worker thread, so that it is
+        # always restored
+        out = sys.stdout
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull):
+            results = parallel_map(_config_status_from_settings_file,
+                                   args_list,
+                                   n_jobs=n_jobs,
+                                   executor=executor,
+                                   label="status" if verbose else None,
+                                   out=out)
+        df = pandas.DataFrame(results,
+                              columns=["status", "task", "n_runs", "energy"])
+        df.insert(0, "configname", list(self.selection.data["name"]))
+        return df
+
+    def report(self, n_jobs=1):
         """
         report status for the selection
+
+        Parameters
+        ----------
+        n_jobs: int, optional, default=1
+            Number of threads used to check for convergence and write the
+            properties files. If -1, one per CPU is used.
+
         Notes
         -----
         checks for convergence
         calls the finalize function to write the approprite properties files.
         """
-        for index, config_data in self.selection.data.iterrows():
+        def config_report(config_data):
             try:
                 settings = self.read_settings(config_data["setfile"])
                 calculation = self.calculator(config_data["calcdir"],
@@ -646,6 +1365,12 @@ class VaspCalculatorBase(object):
                     .format(config_data["configdir"]))
                 raise
 
+        args_list = [(config_data, ) for config_data in self.config_records()]
+        parallel_map(config_report,
+                     args_list,
+                     n_jobs=n_jobs,
+                     label="report" if _n_workers(n_jobs) > 1 else None)
+
     def finalize(self, config_data):
         # write properties.calc.json
         vaspdir = os.path.join(config_data["calcdir"], "run.final")
@@ -675,7 +1400,8 @@ class VaspCalculatorBase(object):
         output = dict()
         # load the OSZICAR and OUTCAR
         zcar = vasp.io.Oszicar(os.path.join(vaspdir, "OSZICAR"))
-        ocar = vasp.io.Outcar(os.path.join(vaspdir, "OUTCAR"))
+        ocar = vasp.io.Outcar(os.path.join(vaspdir, "OUTCAR"),
+                              fields=["forces", "ispin", "lorbit", "mag"])
 
         # the calculation is run on the 'sorted' POSCAR, need to report results 'unsorted'
 
@@ -42,8 +42,8 @@ def read_settings(filename):
         "npar": vasp incar setting (default None)
         "ncore": vasp incar setting (default None)
         "kpar": vasp incar setting (default None)
-        "vasp_cmd": vasp execution command (default is "vasp" (ncpus=1) or "mpirun -np {NCPUS} vasp" (ncpus!=1))
-        "ncpus": number of cpus (cores) to run on (default $PBS_NP)
+        "vasp_cmd": vasp execution command (default is "vasp" (ncpus=1) or "mpirun -np {NCPUS} vasp" (ncpus!=1)). Use "vasp.fake" to test without VASP.
+        "ncpus": number of cpus (cores) to run on (default $CASM_NCPUS, as set by 'casm-calc --run --local', else $PBS_NP)
         "run_limit": number of vasp runs until "not_converging" (default 10)
         "nrg_convergence": converged if last two runs complete and differ in energy by less than this amount (default None)
         "move": files to move at the end of a run (ex. ["POTCAR", "WAVECAR"], default ["POTCAR"])
@@ -55,6 +55,9 @@ def read_settings(filename):
         "initial" : location of INCAR with tags for the initial run, if desired (e.g. to generate a PBE WAVECAR for use with M06-L)
         "final" : location of INCAR with tags for the final run, if desired (e.g. "ISMEAR = -5", etc). Otherwise, the settings enforced are ("ISMEAR = -5", "NSW = 0", "IBRION = -1", "ISIF = 2")
         "err_types" : list of errors to check for. Allowed entries are "IbzkptError" and "SubSpaceMatrixError". Default: ["SubSpaceMatrixError"]
+        "compresslevel" : gzip compression level, from 1 (fastest) to 9 (smallest), for files in "compress" and "backup". Default: 9
+        "compress_threads" : number of threads used to compress each file in "compress" and "backup". Default: 1
+        "supervisor" : how to wait on running vasp jobs: "poll", "inotify" (Linux only), or "auto". See casm.vasp.run. Default: "poll"
         "preamble" : a text file containing anything that MUST be run before python is invoked (e.g. module.txt which contains "module load python", or "source foo")
         "prerun" : bash commands to run before vasp.Relax.run (default None)
         "postrun" : bash commands to run after vasp.Relax.run completes (default None)
@@ -82,10 +85,11 @@ def read_settings(filename):
         "npar", "ncore", "kpar", "ncpus", "vasp_cmd", "run_limit",
         "nrg_convergence", "encut", "kpoints", "extra_input_files", "move",
         "copy", "remove", "compress", "backup", "initial", "final",
-        "strict_kpoints", "err_types", "preamble", "prerun", "postrun", "prop",
-        "prop_start", "prop_stop", "prop_step", "tol", "tol_amount", "name",
-        "fine_ngx", "CI_neb", "n_images", "software", "method",
-        "endstate_calctype", "initial_deformation"
+        "strict_kpoints", "err_types", "compresslevel", "compress_threads",
+        "supervisor", "preamble", "prerun", "postrun", "prop", "prop_start",
+        "prop_stop", "prop_step", "tol", "tol_amount", "name", "fine_ngx",
+        "CI_neb", "n_images", "software", "method", "endstate_calctype",
+        "initial_deformation"
     ]
 
     for key in required:
@@ -0,0 +1,206 @@
+"""Run jobs locally, several at a time, from a persistent work queue"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from builtins import *
+
+import concurrent.futures
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+
+class WorkQueue(object):
+    """A list of shell commands to run, saved to a JSON file as they run
+
+       Each task is a dict with keys:
+           "id": unique name of the task
+           "cmd": shell command to run
+           "cwd": directory to run 'cmd' in
+           "logfile": file that stdout and stderr of 'cmd' are written to
+           "status": "pending", "running", "done", or "failed"
+           "returncode": exit status of 'cmd', or None
+
+       If the queue file exists, tasks are read from it, and tasks that were
+       "running" when the previous run was interrupted are reset to "pending".
+       Tasks that "failed" are run again if they are added again.
+
+       Contains:
+           self.filename = path to the JSON file the queue is saved in
+           self.tasks = list of task dict
+    """
+    def __init__(self, filename):
+        self.filename = os.path.abspath(filename)
+        self.tasks = []
+        self._lock = threading.Lock()
+        if os.path.isfile(self.filename):
+            with open(self.filename) as f:
+                self.tasks = json.load(f)["tasks"]
+            for task in self.tasks:
+                if task["status"] == "running":
+                    task["status"] = "pending"
+
+    def add(self, id, cmd, cwd, logfile=None):
+        """Add a task, unless a task with the same 'id' exists, in which case
+           its 'cmd', 'cwd', and 'logfile' are updated, and its status is reset
+           to "pending" if it "failed", or else kept"""
+        with self._lock:
+            for task in self.tasks:
+                if task["id"] == id:
+                    task.update({"cmd": cmd, "cwd": cwd, "logfile": logfile})
+                    if task["status"] == "failed":
+                        task["status"] = "pending"
+                        task["returncode"] = None
+                    return
+            self.tasks.append({
+                "id": id,
+                "cmd": cmd,
+                "cwd": cwd,
+                "logfile": logfile,
+                "status": "pending",
+                "returncode": None
+            })
+
+    def pending(self):
+        """Return the list of pending tasks"""
+        with self._lock:
+            return [task for task in self.tasks if task["status"] == "pending"]
+
+    def set_status(self, task, status, returncode=None):
+        """Set a task's status, and save the queue"""
+        with self._lock:
+            task["status"] = status
+            task["returncode"] = returncode
+            self._save()
+
+    def save(self):
+        """Save the queue"""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        dirname = os.path.dirname(self.filename)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        tmpfile = self.filename + ".tmp"
+        with open(tmpfile, 'w') as f:
+            json.dump({"tasks": self.tasks}, f, indent=2)
+        os.replace(tmpfile, self.filename)
+
+
+def run_task(task, env=None, procs=None):
+    """Run a WorkQueue task in a subprocess, and return its exit status
+
+       Args:
+           task: a WorkQueue task
+           env: environment for the task. Default uses os.environ.
+           procs: optional set that the subprocess.Popen is added to while it
+               runs, so that it can be terminated from another thread. The
+               task is started in a new session, so that terminate_task
+               stops it and any processes it started.
+    """
+    log = None
+    if task["logfile"] is not None:
+        log = open(task["logfile"], 'a')
+    try:
+        p = subprocess.Popen(task["cmd"],
+                             shell=True,
+                             cwd=task["cwd"],
+                             env=env,
+                             stdout=log,
+                             stderr=None if log is None else subprocess.STDOUT,
+                             start_new_session=procs is not None)
+        if procs is not None:
+            procs.add(p)
+        try:
+            return p.wait()
+        finally:
+            if procs is not None:
+                procs.discard(p)
+    finally:
+        if log is not None:
+            log.close()
+
+
+def terminate_task(p):
+    """Terminate a task started by run_task with 'procs', and its children"""
+    try:
+        os.killpg(p.pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+def run_queue(queue, n_workers=1, env=None, out=None):
+    """Run the pending tasks of a WorkQueue, 'n_workers' at a time
+
+       Each task is run in its own process. The queue file is updated as each
+       task starts and finishes, so that if this is interrupted, running it
+       again with the same queue file runs only the tasks that did not finish.
+
+       On KeyboardInterrupt, tasks not yet started are cancelled, running
+       tasks are terminated, both are left "pending" in the queue file, and
+       the KeyboardInterrupt is raised again.
+
+       Args:
+           queue: a WorkQueue
+           n_workers: number of tasks run at the same time
+           env: environment for the tasks. Default uses os.environ.
+           out: where progress is printed. Default is sys.stdout.
+
+       Returns:
+           n_failed: number of tasks with non-zero exit status
+    """
+    if out is None:
+        out = sys.stdout
+    tasks = queue.pending()
+    queue.save()
+    n_total = len(tasks)
+    print("Running", n_total, "tasks with", n_workers, "workers", file=out)
+    out.flush()
+
+    interrupted = threading.Event()
+    procs = set()
+
+    def work(task):
+        if interrupted.is_set():
+            return task
+        queue.set_status(task, "running")
+        try:
+            returncode = run_task(task, env, procs)
+        except Exception:
+            queue.set_status(task, "pending")
+            raise
+        if returncode != 0 and interrupted.is_set():
+            # killed by the interrupt, run it again next time
+            queue.set_status(task, "pending")
+        else:
+            queue.set_status(task, "done" if returncode == 0 else "failed",
+                             returncode)
+        return task
+
+    n_failed = 0
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+    try:
+        futures = [pool.submit(work, task) for task in tasks]
+        for n_done, future in enumerate(
+                concurrent.futures.as_completed(futures)):
+            task = future.result()
+            if task["status"] == "failed":
+                n_failed += 1
+            print("{0}/{1}: {2} {3}".format(n_done + 1, n_total, task["id"],
+                                            task["status"]),
+                  file=out)
+            out.flush()
+    except KeyboardInterrupt:
+        interrupted.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        for p in list(procs):
+            terminate_task(p)
+        pool.shutdown(wait=True)
+        print("Interrupted,", len(queue.pending()), "tasks pending", file=out)
+        out.flush()
+        raise
+    pool.shutdown(wait=True)
+    return n_failed
@@ -0,0 +1,60 @@
+"""Time parsing OUTCAR files with casm.vasp.io.Outcar
+
+Usage: python benchmark_outcar.py OUTCAR [OUTCAR ...] [--fields forces ...]
+"""
+import argparse
+import time
+
+from casm.vasp.io.outcar import Outcar, _open
+
+
+def benchmark(filename, fields=None, repeat=3):
+    """Time parsing an OUTCAR file.
+
+       Args:
+           filename: path to OUTCAR file
+           fields: iterable of field names to parse, as for Outcar. Default
+               (None) parses all fields.
+           repeat: number of times to parse the file. The fastest is reported.
+
+       Returns:
+           dict with "size" (bytes), "time" (s), and "throughput" (MB/s)
+    """
+    f = _open(filename)
+    size = 0
+    for block in iter(lambda: f.read(1 << 20), ""):
+        size += len(block)
+    f.close()
+
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        Outcar(filename, fields=fields)
+        t = time.time() - start
+        if best is None or t < best:
+            best = t
+    return {
+        "size": size,
+        "time": best,
+        "throughput": size / 1.0e6 / best if best > 0 else float('inf')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('filenames', nargs='+', help="OUTCAR files")
+    parser.add_argument('--fields',
+                        nargs='*',
+                        default=None,
+                        help="Outcar fields to parse (Default=all)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for filename in args.filenames:
+        result = benchmark(filename, args.fields, args.repeat)
+        print("{0}: {1:.1f} MB, {2:.3f} s, {3:.1f} MB/s".format(
+            filename, result["size"] / 1.0e6, result["time"],
+            result["throughput"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Time deriving the paths of, and iterating over, a synthetic selection
+
+Compares casm.vaspwrapper.vasp_calculator_base.config_paths and
+config_records, as used by VaspCalculatorBase.append_selection_data and the
+setup/run/submit/report loops, with deriving the paths one row at a time and
+iterating with DataFrame.iterrows.
+
+Usage: python benchmark_selection_data.py [--n_configs 100000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas
+
+import casm.project
+from casm.vaspwrapper.vasp_calculator_base import config_paths, \
+    config_records
+
+
+def benchmark(casm_directories, clex, n_configs=100000, repeat=1):
+    """
+    time deriving the paths of, and iterating over, a synthetic selection
+
+    Parameters
+    ----------
+    casm_directories: casm.project.DirectoryStructure
+    clex: casm.project.ClexDescription
+    n_configs: int, optional, default=100000
+        Number of configurations, spread over supercells of 100
+        configurations each
+    repeat: int, optional, default=1
+        Number of times to time each method. The fastest is reported.
+
+    Returns
+    -------
+    result: dict
+        With "n_configs", "time" (s) using 'config_paths' and
+        'config_records', and "time_iterrows" (s) deriving the paths one row
+        at a time and iterating with DataFrame.iterrows
+    """
+    names = [
+        "SCEL{0}_1_1_{0}_0_0_0/{1}".format(i // 100 + 1, i % 100)
+        for i in range(n_configs)
+    ]
+    data = pandas.DataFrame({"name": names, "selected": 1})
+
+    def column_wise():
+        casm_directories.refresh_settings()
+        paths = config_paths(casm_directories, data["name"], clex)
+        df = data.copy()
+        for key, values in paths.items():
+            df.loc[:, key] = values
+        for config_data in config_records(df):
+            config_data["calcdir"]
+
+    def row_wise():
+        casm_directories.refresh_settings()
+        config_dicts = []
+        for index, config_data in data.iterrows():
+            config_dict = dict(config_data)
+            config_dict["configdir"] = casm_directories.configuration_dir(
+                config_data["name"])
+            config_dict["calcdir"] = casm_directories.calctype_dir(
+                config_data["name"], clex)
+            config_dict["setfile"] = casm_directories.settings_path_crawl(
+                "calc.json", config_data["name"], clex)
+            config_dicts.append(config_dict)
+        df = data.copy()
+        for key in ["configdir", "calcdir", "setfile"]:
+            df.loc[:, key] = [config_dict[key] for config_dict in config_dicts]
+        for index, config_data in df.iterrows():
+            config_data["calcdir"]
+
+    result = {"n_configs": n_configs}
+    for key, func in [("time", column_wise), ("time_iterrows", row_wise)]:
+        best = None
+        for i in range(repeat):
+            start = time.time()
+            func()
+            t = time.time() - start
+            if best is None or t < best:
+                best = t
+        result[key] = best
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n_configs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    # an empty project, without settings directories
+    path = tempfile.mkdtemp(prefix="casm_benchmark_")
+    try:
+        os.mkdir(os.path.join(path, ".casm"))
+        casm_directories = casm.project.DirectoryStructure(path)
+        clex = casm.project.ClexDescription("formation_energy",
+                                            "formation_energy", "default",
+                                            "default", "default", "default")
+        result = benchmark(casm_directories, clex, args.n_configs, args.repeat)
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+    print(
+        "{0} configurations: {1:.2f} s column-wise, {2:.2f} s iterrows".format(
+            result["n_configs"], result["time"], result["time_iterrows"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+
+import deap.base
+import numpy as np
+
+from casm.learn.evolve import FitnessCache, ProcessPoolMap
+
+
+def test_fitness_cache(tmpdir):
+    rng = np.random.RandomState(0)
+    X = rng.rand(10, 4)
+    y = rng.rand(10)
+    filename = os.path.join(str(tmpdir), "fitness_cache.pkl")
+
+    cache = FitnessCache(maxsize=2, filename=filename)
+    cache.bind(X, y, penalty=0.0)
+    cache.set([True, False, False, False], (1.0, ))
+    cache.set([False, True, False, False], (2.0, ))
+    assert cache.get([True, False, False, False]) == (1.0, )
+
+    # least recently used is evicted
+    cache.set([False, False, True, False], (3.0, ))
+    assert cache.get([False, True, False, False]) is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.save()
+
+    # reuse for the same problem
+    cache = FitnessCache(filename=filename)
+    cache.bind(X, y, penalty=0.0)
+    assert cache.get([False, False, True, False]) == (3.0, )
+
+    # ignore for a different problem
+    cache = FitnessCache(filename=filename)
+    cache.bind(X, y, penalty=0.1)
+    assert len(cache) == 0
+
+
+def _fitness(X, indiv, y=None, penalty=0.0):
+    """ least squares residual of the selected features """
+    X = X[:, np.array(indiv, dtype=bool)]
+    if X.shape[1] == 0:
+        return (float(np.sum(y**2)), )
+    coef = np.linalg.lstsq(X, y, rcond=None)[0]
+    return (float(np.sum((X.dot(coef) - y)**2)) + penalty * X.shape[1], )
+
+
+def test_process_pool_map():
+    rng = np.random.RandomState(0)
+    X = rng.rand(20, 6)
+    y = rng.rand(20)
+    toolbox = deap.base.Toolbox()
+    toolbox.register("evaluate", _fitness, X, y=y, penalty=0.1)
+    pop = [[bool(b) for b in rng.randint(2, size=6)] for i in range(8)]
+    pop[0] = [False] * 6
+    expected = list(map(toolbox.evaluate, pop))
+
+    pool_map = ProcessPoolMap(toolbox, X, y, n_jobs=2)
+    tmpdir = pool_map._tmpdir
+    assert sorted(os.listdir(tmpdir)) == ["X.npy", "y.npy"]
+    try:
+        result = pool_map(toolbox.evaluate, pop)
+        assert np.allclose(result, expected)
+        # other functions use the serial map
+        assert pool_map(len, pop) == [6] * len(pop)
+    finally:
+        pool_map.close()
+    assert not os.path.exists(tmpdir)
@@ -0,0 +1,103 @@
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas
+
+import casm.learn
+from casm.learn.fit import make_fitting_data, set_input_defaults
+
+
+def _input(tmpdir, weight):
+    rng = np.random.RandomState(0)
+    data = pandas.DataFrame({"configname": ["c" + str(i) for i in range(20)]})
+    for i in range(4):
+        data["corr(" + str(i) + ")"] = rng.rand(20)
+    data["formation_energy"] = rng.rand(20)
+    filename = os.path.join(str(tmpdir), "train.csv")
+    data.to_csv(filename, index=False)
+    input = {
+        "problem_specs": {
+            "data": {
+                "filename": filename,
+                "filetype": "csv"
+            },
+            "weight": weight,
+            "cv": {
+                "method": "KFold",
+                "kwargs": {
+                    "n_splits": 5
+                },
+                "penalty": 0.0
+            },
+            "specs_filename": os.path.join(str(tmpdir), "test_specs")
+        },
+        "estimator": {
+            "method": "LinearRegression"
+        },
+        "feature_selection": {
+            "method": "SelectFromModel",
+            "kwargs": None
+        }
+    }
+    return set_input_defaults(input)
+
+
+def test_fitting_data_roundtrip(tmpdir):
+    for weight in [{
+            "method": "wEmin",
+            "kwargs": {
+                "A": 2.0
+            }
+    }, {
+            "method": None
+    }]:
+        specs_dir = os.path.join(str(tmpdir), "test_specs")
+        input = _input(tmpdir, weight)
+        fdata = make_fitting_data(input, verbose=False)
+        assert os.path.isfile(os.path.join(specs_dir, "manifest.json"))
+
+        loaded = make_fitting_data(input, verbose=False)
+        assert isinstance(loaded.weighted_X, np.memmap)
+        assert np.allclose(loaded.weighted_X, fdata.weighted_X)
+        assert np.allclose(loaded.weighted_y, fdata.weighted_y)
+        assert np.allclose(loaded.W.toarray(), fdata.W.toarray())
+        assert [list(test) for train, test in loaded.cv.split(loaded.X)] == \
+            [list(test) for train, test in fdata.cv.split(fdata.X)]
+        assert loaded.data.equals(fdata.data)
+
+        # re-save, and read as 'fdata' pickle written by earlier versions
+        casm.learn.save_fitting_data(loaded, specs_dir)
+        assert np.allclose(
+            casm.learn.open_fitting_data(specs_dir).weighted_X,
+            fdata.weighted_X)
+        os.rename(specs_dir, specs_dir + "_new")
+        with open(specs_dir + ".pkl", 'wb') as f:
+            pickle.dump(fdata, f, protocol=2)
+        legacy = make_fitting_data(input, verbose=False)
+        assert np.allclose(legacy.weighted_X, fdata.weighted_X)
+        os.remove(specs_dir + ".pkl")
+        shutil.rmtree(specs_dir + "_new")
+
+
+def test_legacy_specs_filename(tmpdir):
+    # "specs_filename" set to a pickle file name, as for previous versions
+    specs_dir = os.path.join(str(tmpdir), "test_specs")
+    input = _input(tmpdir, {"method": None})
+    input["problem_specs"]["specs_filename"] = specs_dir + ".pkl"
+    fdata = make_fitting_data(input, verbose=False)
+    assert not os.path.exists(specs_dir + ".pkl")
+    assert os.path.isfile(os.path.join(specs_dir, "manifest.json"))
+
+    loaded = make_fitting_data(input, verbose=False)
+    assert isinstance(loaded.weighted_X, np.memmap)
+    assert np.allclose(loaded.weighted_X, fdata.weighted_X)
+
+    # an existing pickle file is still read
+    shutil.rmtree(specs_dir)
+    with open(specs_dir + ".pkl", 'wb') as f:
+        pickle.dump(fdata, f, protocol=2)
+    legacy = make_fitting_data(input, verbose=False)
+    assert np.allclose(legacy.weighted_X, fdata.weighted_X)
+    assert not os.path.exists(specs_dir)
@@ -0,0 +1,41 @@
+import numpy as np
+from scipy.optimize import linprog
+
+from casm.learn.hull import LowerHull, hull_dist
+
+
+def test_hull_dist_binary():
+    x = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 0.5])
+    E = np.array([0.0, -0.1, -0.3, -0.1, 0.0, -0.2])
+    comp = np.column_stack([x, 1.0 - x])
+    assert np.allclose(hull_dist(comp, E), [0.0, 0.05, 0.0, 0.05, 0.0, 0.1])
+    assert LowerHull(comp, E).vertices == [0, 2, 4]
+
+    # hull of a subset
+    hull_points = np.array([True, False, False, False, True, False])
+    assert np.allclose(hull_dist(comp, E, hull_points=hull_points),
+                       [0.0, -0.1, -0.3, -0.1, 0.0, -0.2])
+
+
+def test_hull_dist_ternary():
+    rng = np.random.RandomState(0)
+    comp = np.vstack([np.eye(3), rng.dirichlet([1, 1, 1], 50)])
+    E = -rng.rand(53) * np.prod(comp, axis=1) * 10
+    hull = LowerHull(comp, E)
+
+    # compare to the lower hull as a linear program
+    test_comp = rng.dirichlet([1, 1, 1], 10)
+    expected = [
+        linprog(E, A_eq=comp.T, b_eq=c, bounds=(0, None)).fun
+        for c in test_comp
+    ]
+    assert np.allclose(hull.hull_energy(test_comp), expected)
+    assert np.min(hull.dist(comp, E)) > -1e-12
+
+
+def test_hull_dist_degenerate():
+    # single composition
+    assert np.allclose(hull_dist(np.ones((3, 1)), [1.0, 2.0, 0.5]),
+                       [0.5, 1.5, 0.0])
+    # hull points only at the end members
+    assert np.allclose(hull_dist(np.eye(3), [0.0, 0.0, 0.0]), 0.0)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from casm.learn.linear_model import LinearRegressionForLOOCV, SingleFlipLOOCV, \
+  PopulationLOOCV
+
+
+def _direct_loocv(X, y, selected):
+    estimator = LinearRegressionForLOOCV()
+    estimator.fit(X[:, selected], y)
+    return estimator.score(X[:, selected], y)
+
+
+def test_single_flip_loocv():
+    rng = np.random.RandomState(0)
+    X = rng.rand(40, 12)
+    y = X[:, :4].dot(rng.rand(4)) + 0.01 * rng.rand(40)
+    parent = [
+        True, True, False, True, False, False, True, False, False, False, True,
+        False
+    ]
+
+    scores = SingleFlipLOOCV(X, y).scores(parent)
+
+    for j in range(len(parent)):
+        child = list(parent)
+        child[j] = not child[j]
+        selected = [i for i in range(len(child)) if child[i]]
+        assert np.isclose(scores[j], _direct_loocv(X, y, selected))
+
+
+def test_single_flip_loocv_dependent_columns():
+    rng = np.random.RandomState(1)
+    X = rng.rand(30, 6)
+    X[:, 5] = X[:, 0] + X[:, 1]
+    y = rng.rand(30)
+    parent = [True, True, False, False, False, False]
+
+    scores = SingleFlipLOOCV(X, y).scores(parent)
+
+    # adding a linearly dependent feature does not change the hat matrix
+    assert np.isclose(scores[5], _direct_loocv(X, y, [0, 1]))
+    for j in [2, 3, 4]:
+        selected = [0, 1, j]
+        assert np.isclose(scores[j], _direct_loocv(X, y, selected))
+
+
+def test_loocv_without_hat_matrix():
+    rng = np.random.RandomState(2)
+    X = rng.rand(50, 8)
+    y = X.dot(rng.rand(8)) + 0.01 * rng.rand(50)
+
+    for pinv in [True, False]:
+        expected = LinearRegressionForLOOCV(pinv=pinv)
+        expected.fit(X, y)
+
+        estimator = LinearRegressionForLOOCV(pinv=pinv, hat_matrix=False)
+        estimator.fit(X, y)
+        assert not hasattr(estimator, "H_")
+        assert np.allclose(estimator.coef_, expected.coef_)
+        assert np.allclose(estimator.h_, np.diag(expected.H_))
+        assert np.isclose(estimator.score(X, y), expected.score(X, y))
+
+        estimator = LinearRegressionForLOOCV(pinv=pinv,
+                                             hat_matrix=False,
+                                             dtype="float32")
+        estimator.fit(X, y)
+        assert estimator.coef_.dtype == np.float32
+        assert np.isclose(estimator.score(X, y),
+                          expected.score(X, y),
+                          rtol=1e-3)
+
+
+def test_population_loocv():
+    rng = np.random.RandomState(3)
+    X = rng.rand(40, 10)
+    X[:, 9] = X[:, 0] - X[:, 2]
+    y = X[:, :3].dot(rng.rand(3)) + 0.01 * rng.rand(40)
+    population = [rng.rand(10) < 0.4 for i in range(20)]
+    population.append([True, False, True] + [False] * 6 + [True])
+
+    scores = PopulationLOOCV(X, y, max_block_size=200).scores(population)
+
+    for indiv, score in zip(population, scores):
+        selected = [i for i in range(len(indiv)) if indiv[i]]
+        if len(selected):
+            assert np.isclose(score, _direct_loocv(X, y, selected))
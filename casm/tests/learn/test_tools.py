@@ -0,0 +1,31 @@
+import numpy as np
+
+from casm.learn.tools import set_sample_weight
+
+
+def test_set_sample_weight_diagonal():
+    rng = np.random.RandomState(0)
+    X = rng.rand(20, 5)
+    y = rng.rand(20)
+    w = rng.rand(20) + 0.5
+
+    weighted_y, weighted_X, W, L = set_sample_weight(w, X=X, y=y)
+    W_dense = np.diag(w) * len(w) / np.sum(w)
+    assert np.allclose(W.toarray(), W_dense)
+    assert np.allclose(L.dot(L.T).toarray(), W_dense)
+    assert np.allclose(weighted_X, L.dot(X))
+    assert np.allclose(weighted_y, L.dot(y))
+
+    # same weighted least squares problem as the dense 2d weights
+    y_2d, X_2d, W_2d, L_2d = set_sample_weight(W_dense, X=X, y=y)
+    assert np.allclose(W_2d, W_dense)
+    assert np.allclose(weighted_X.T.dot(weighted_X), X_2d.T.dot(X_2d))
+    assert np.allclose(weighted_X.T.dot(weighted_y), X_2d.T.dot(y_2d))
+
+    # unweighted
+    weighted_y, weighted_X, W, L = set_sample_weight(None,
+                                                     X=X,
+                                                     y=y.reshape(-1, 1))
+    assert np.allclose(weighted_X, X)
+    assert weighted_y.shape == (20, 1)
+    assert np.allclose(W.toarray(), np.identity(20))
@@ -63,3 +63,43 @@ def test_project_init(initialized_ZrO_project):
     assert proj.composition_axes is None
     assert isinstance(proj.all_composition_axes, dict)
     assert len(proj.all_composition_axes) == 0
+
+
+def test_settings_path_crawl(tmpdir, monkeypatch):
+    tmpdir.mkdir(".casm")
+    dir = casm.project.DirectoryStructure(str(tmpdir))
+    clex = casm.project.ClexDescription("formation_energy", "formation_energy",
+                                        "default", "default", "default",
+                                        "default")
+    configname = "SCEL1_1_1_1_0_0_0/0"
+    global_dir = tmpdir.join("training_data", "settings", "calctype.default")
+    global_dir.join("INCAR").write("", ensure=True)
+    global_dir.join("calc.json").write("{}")
+    config_dir = tmpdir.join("training_data", configname, "settings",
+                             "calctype.default")
+    config_dir.join("INCAR").write("", ensure=True)
+
+    listed = []
+    listdir = os.listdir
+
+    def counting_listdir(path):
+        listed.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(os, "listdir", counting_listdir)
+
+    assert dir.settings_path_crawl("INCAR", configname, clex) == \
+        str(config_dir.join("INCAR"))
+    assert dir.settings_path_crawl("calc.json", configname, clex) == \
+        str(global_dir.join("calc.json"))
+    assert dir.settings_path_crawl("SPECIES", configname, clex) is None
+    assert dir.settings_path_crawl("calc.json", "SCEL1_1_1_1_0_0_0/1",
+                                   clex) == str(global_dir.join("calc.json"))
+    # each settings directory is listed once
+    assert len(listed) == len(set(listed)) == 4
+
+    global_dir.join("SPECIES").write("")
+    assert dir.settings_path_crawl("SPECIES", configname, clex) is None
+    dir.refresh_settings()
+    assert dir.settings_path_crawl("SPECIES", configname, clex) == \
+        str(global_dir.join("SPECIES"))
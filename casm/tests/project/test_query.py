@@ -1,3 +1,7 @@
+import os
+import sys
+
+import pandas
 import pytest
 
 import casm.project
@@ -22,3 +26,126 @@ def test_query(ZrO_project_ConfigEnumAllOccupations_max4):
     assert df.dtypes.tolist() == [
         'object', 'int64', 'float64', 'float64', 'float64', 'int64'
     ]
+
+
+def test_query_chunks(ZrO_project_ConfigEnumAllOccupations_max4):
+    proj = ZrO_project_ConfigEnumAllOccupations_max4
+    columns = ["name", "selected", "comp_n", "scel_size"]
+    df = casm.project.query(proj,
+                            columns,
+                            "ALL",
+                            "config",
+                            verbatim=True,
+                            all=True)
+    chunks = list(
+        casm.project.query_chunks(proj,
+                                  columns,
+                                  "ALL",
+                                  "config",
+                                  verbatim=True,
+                                  all=True,
+                                  chunksize=100))
+    assert [chunk.shape[0] for chunk in chunks] == [100, 100, 100, 36]
+    assert pandas.concat(chunks).equals(df)
+
+
+def test_read_query_output(tmpdir):
+    filename = str(tmpdir.join("query.txt"))
+    with open(filename, 'w') as f:
+        f.write("#name  selected  comp_n(Zr)  scel_size\n")
+        f.write("SCEL1_1_1_1_0_0_0/0  1  2.000000  1\n")
+        f.write("SCEL1_1_1_1_0_0_0/1  0  1.500000  1\n")
+        f.write("SCEL2_2_1_1_0_0_0/0  1  2.000000  2\n")
+    df = casm.project.read_query_output(filename)
+    assert df.columns.tolist() == [
+        'name', 'selected', 'comp_n(Zr)', 'scel_size'
+    ]
+    assert df.dtypes.tolist()[1:] == ['int64', 'float64', 'int64']
+    assert df['comp_n(Zr)'].tolist() == [2.0, 1.5, 2.0]
+
+    chunks = list(casm.project.read_query_output(filename, chunksize=2))
+    assert [chunk.shape[0] for chunk in chunks] == [2, 1]
+    assert pandas.concat(chunks).equals(df)
+
+
+def test_query_cache(tmpdir, monkeypatch):
+    tmpdir.mkdir(".casm").mkdir("jsonDB").join("config_list.json").write("{}")
+    eci_dir = tmpdir.join("cluster_expansions", "clex.formation_energy",
+                          "calctype.default", "ref.default", "bset.default",
+                          "eci.default")
+    eci_dir.ensure(dir=True)
+    eci_dir.join("eci.json").write("{}")
+
+    class FakeProject(object):
+        path = str(tmpdir)
+        dir = casm.project.DirectoryStructure(str(tmpdir))
+
+    queried = []
+
+    def fake_query(proj, columns, selection_path, selection_type, **kwargs):
+        queried.append(list(columns))
+        data = dict()
+        for col in columns:
+            if col == "comp":
+                data["comp(a)"] = [0.0, 0.5]
+                data["comp(b)"] = [1.0, 0.5]
+            else:
+                data[col] = [len(queried)] * 2
+        return pandas.DataFrame(data)
+
+    monkeypatch.setattr(sys.modules["casm.project.query"], "query", fake_query)
+
+    cache = casm.project.QueryCache(FakeProject())
+    df = cache.query(["comp", "is_calculated"], "ALL", "config")
+    assert df.columns.tolist() == ["comp(a)", "comp(b)", "is_calculated"]
+
+    # ECI-independent columns are reused, ECI-dependent columns re-queried
+    # when eci.json changes
+    df = cache.query(["clex(formation_energy)", "comp"], "ALL", "config")
+    eci_dir.join("eci.json").write('{"changed": true}')
+    df = cache.query(["clex(formation_energy)", "comp"], "ALL", "config")
+    assert queried == [["comp", "is_calculated"], ["clex(formation_energy)"],
+                       ["clex(formation_energy)"]]
+    assert df["clex(formation_energy)"].tolist() == [3, 3]
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    # all columns re-queried when the project database changes
+    tmpdir.join(".casm", "jsonDB", "config_list.json").write('{"a": 1}')
+    cache.query(["is_calculated"], "ALL", "config")
+    assert queried[-1] == ["is_calculated"]
+
+    # project files are checked once per query, not once per column
+    walked = []
+    walk = os.walk
+
+    def counting_walk(top, *args, **kwargs):
+        walked.append(top)
+        return walk(top, *args, **kwargs)
+
+    monkeypatch.setattr(os, "walk", counting_walk)
+    cache.query(["comp", "is_calculated", "clex(formation_energy)"], "ALL",
+                "config")
+    assert len(walked) == 3
+    monkeypatch.setattr(os, "walk", walk)
+
+    # force re-queries cached columns
+    n_queried = len(queried)
+    cache.query(["is_calculated"], "ALL", "config", force=True)
+    assert len(queried) == n_queried + 1
+
+    # a changed selection file replaces, rather than adds, cached results
+    selfile = tmpdir.join("sel.json")
+    selfile.write('[]')
+    cache.query(["is_calculated"], str(selfile), "config")
+    n_cached = len(cache._data)
+    selfile.write('[{}]')
+    cache.query(["is_calculated"], str(selfile), "config")
+    assert len(cache._data) == n_cached
+    assert queried[-1] == ["is_calculated"]
+
+    # least recently used results are discarded
+    cache = casm.project.QueryCache(FakeProject(), maxsize=2)
+    cache.query(["comp", "is_calculated", "scel_size"], "ALL", "config")
+    assert len(cache._data) == 2
+    cache.query(["scel_size"], "ALL", "config")
+    assert cache.hits == 1
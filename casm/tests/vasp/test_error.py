@@ -0,0 +1,155 @@
+import os
+import subprocess
+import time
+
+import casm.vasp
+import casm.vasp.io
+
+
+def test_file_watcher(tmpdir):
+    filename = str(tmpdir.join("std.out"))
+    watcher = casm.vasp.io.FileWatcher(filename)
+    assert watcher.read() == []
+
+    with open(filename, 'w') as f:
+        f.write("line 1\nline 2\npartial")
+    assert watcher.read() == ["line 1\n", "line 2\n"]
+    assert not watcher.restarted
+    assert watcher.read() == []
+
+    with open(filename, 'a') as f:
+        f.write(" line 3\nline 4\n")
+    assert watcher.read() == ["partial line 3\n", "line 4\n"]
+    assert not watcher.restarted
+
+    # truncated
+    with open(filename, 'w') as f:
+        f.write("new\n")
+    assert watcher.read() == ["new\n"]
+    assert watcher.restarted
+
+
+def test_error_monitor(shared_datadir, tmpdir):
+    jobdir = str(tmpdir)
+    stdoutfile = os.path.join(jobdir, "std.out")
+    monitor = casm.vasp.ErrorMonitor(jobdir, stdoutfile, None)
+    assert monitor.check() is None
+
+    with open(stdoutfile, 'w') as f:
+        f.write(" DAV:   1    -0.1E+02\n")
+    assert monitor.check() is None
+
+    with open(stdoutfile, 'a') as f:
+        f.write(" WARNING: Sub-Space-Matrix is not hermitian in DAV\n")
+    err = monitor.check()
+    assert list(err.keys()) == ["SubSpaceMatrixError"]
+    assert err.keys() == casm.vasp.error_check(jobdir, stdoutfile, None).keys()
+
+    # errors found earlier are remembered
+    with open(stdoutfile, 'a') as f:
+        f.write(" DAV:   2    -0.1E+02\n")
+    assert list(monitor.check().keys()) == ["SubSpaceMatrixError"]
+
+    # OUTCAR is parsed incrementally
+    outcarfile = str(shared_datadir / "LiNiO2/SCEL1_1_1_1_0_0_0/0/OUTCAR")
+    with open(outcarfile, 'r') as f:
+        lines = f.readlines()
+    end = [i for i, line in enumerate(lines) if "General timing" in line][0]
+    with open(os.path.join(jobdir, "OUTCAR"), 'w') as f:
+        f.write("".join(lines[:end // 2]))
+    monitor.check()
+    outcar = monitor.outcar[jobdir]
+    assert not outcar.complete
+    assert outcar.slowest_loop == max(
+        float(line.split()[-1]) for line in lines[:end // 2] if "LOOP" in line)
+
+    with open(os.path.join(jobdir, "OUTCAR"), 'a') as f:
+        f.write("".join(lines[end // 2:]))
+    monitor.check()
+    assert outcar.complete
+    assert outcar.slowest_loop == 202.22
+
+
+def test_job_watcher(tmpdir):
+    jobdir = str(tmpdir)
+    backends = ["poll"]
+    if casm.vasp.io.inotify_available():
+        backends.append("inotify")
+    for backend in backends:
+        p = subprocess.Popen(["sleep", "60"])
+        watcher = casm.vasp.io.JobWatcher(p, [jobdir], backend=backend)
+        assert watcher.backend == backend
+        with open(os.path.join(jobdir, "OUTCAR"), 'w') as f:
+            f.write("output\n")
+        modified = watcher.wait(0.1)
+        if backend == "inotify":
+            assert os.path.join(jobdir, "OUTCAR") in modified
+        name, t = watcher.last_modified(jobdir)
+        assert name == "OUTCAR"
+        assert time.time() - t < 60.0
+
+        # returns as soon as a file is written
+        if backend == "inotify":
+            start = time.time()
+            with open(os.path.join(jobdir, "OSZICAR"), 'w') as f:
+                f.write("output\n")
+            modified = watcher.wait(30.0)
+            assert time.time() - start < 10.0
+            assert os.path.join(jobdir, "OSZICAR") in modified
+
+        # returns as soon as the process exits
+        p.kill()
+        if backend == "inotify":
+            start = time.time()
+            watcher.wait(30.0)
+            assert time.time() - start < 10.0
+        watcher.close()
+        p.wait()
+
+
+def test_freeze_check_rescan(tmpdir):
+    jobdir = str(tmpdir)
+    stdoutfile = os.path.join(jobdir, "std.out")
+    outcarfile = os.path.join(jobdir, "OUTCAR")
+    with open(outcarfile, 'w') as f:
+        f.write("     LOOP+:  cpu time   1.00: real time   1.00\n")
+    with open(stdoutfile, 'w') as f:
+        f.write(" DAV:   1    -0.1E+02\n")
+    old = time.time() - 1000.0
+    for name in ["OUTCAR", "std.out"]:
+        os.utime(os.path.join(jobdir, name), (old, old))
+
+    backends = ["poll"]
+    if casm.vasp.io.inotify_available():
+        backends.append("inotify")
+    for backend in backends:
+        p = subprocess.Popen(["sleep", "60"])
+        watcher = casm.vasp.io.JobWatcher(p, [jobdir], backend=backend)
+        monitor = casm.vasp.ErrorMonitor(jobdir, stdoutfile, None)
+        assert list(monitor.check(watcher=watcher).keys()) == ["FreezeError"]
+
+        # a write that produces no inotify event, as from another node to a
+        # network filesystem, is found before declaring a freeze
+        os.utime(outcarfile, None)
+        assert monitor.check(watcher=watcher) is None
+        os.utime(outcarfile, (old, old))
+
+        p.kill()
+        watcher.close()
+        p.wait()
+
+
+def test_run_supervisor(tmpdir):
+    backends = ["poll", "auto"]
+    for backend in backends:
+        jobdir = str(tmpdir.mkdir(backend))
+        with open(os.path.join(jobdir, "job.sh"), 'w') as f:
+            f.write("echo ' DAV:   1    -0.1E+02'\n"
+                    "echo ' Total CPU time used (sec): 1.0' > OUTCAR\n")
+        err = casm.vasp.run(jobdir,
+                            command="sh job.sh",
+                            poll_check_time=0.1,
+                            supervisor=backend)
+        assert err is None
+        with open(os.path.join(jobdir, "std.out")) as f:
+            assert "DAV" in f.read()
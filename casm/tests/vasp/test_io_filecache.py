@@ -0,0 +1,62 @@
+import os
+
+import casm.vasp
+import casm.vasp.io
+
+INCAR = """SYSTEM = test relax
+ISIF = 2
+NSW = 2
+"""
+
+OSZICAR = """DAV:   1    -0.1E+02
+   1 F= -.10E+02 E0= -.11E+02  d E =-.10E+02
+DAV:   1    -0.1E+02
+   2 F= -.10E+02 E0= -.12E+02  d E =-.10E+02
+"""
+
+
+def test_parsed_file_cache(tmpdir):
+    filename = str(tmpdir.join("INCAR"))
+    with open(filename, 'w') as f:
+        f.write(INCAR)
+
+    cache = casm.vasp.io.ParsedFileCache(maxsize=1)
+    incar = cache.get(casm.vasp.io.Incar, filename)
+    assert incar.tags["NSW"] == 2
+    assert cache.get(casm.vasp.io.Incar, filename) is incar
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # changed files are parsed again
+    with open(filename, 'w') as f:
+        f.write(INCAR.replace("NSW = 2", "NSW = 10"))
+    assert cache.get(casm.vasp.io.Incar, filename).tags["NSW"] == 10
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # least recently used entries are removed
+    other = str(tmpdir.join("OSZICAR"))
+    with open(other, 'w') as f:
+        f.write(OSZICAR)
+    assert cache.get(casm.vasp.io.Oszicar, other).E == [-11.0, -12.0]
+    cache.get(casm.vasp.io.Incar, filename)
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_relax_status_parses_once(shared_datadir, tmpdir):
+    calcdir = str(tmpdir)
+    rundir = tmpdir.mkdir("run.0")
+    rundir.join("INCAR").write(INCAR)
+    rundir.join("OSZICAR").write(OSZICAR)
+    with open(str(shared_datadir / "LiNiO2/SCEL1_1_1_1_0_0_0/0/OUTCAR")) as f:
+        rundir.join("OUTCAR").write(f.read())
+
+    casm.vasp.io.clear_file_cache()
+    relax = casm.vasp.Relax(calcdir)
+    assert relax.status() == ("incomplete", "relax")
+    misses = casm.vasp.io.filecache.FILE_CACHE.misses
+    assert misses == 3
+    assert relax.status() == ("incomplete", "relax")
+    assert casm.vasp.io.filecache.FILE_CACHE.misses == misses
+
+    rundir.join("INCAR").write(INCAR.replace("NSW = 2", "NSW = 10"))
+    assert relax.status() == ("incomplete", "constant")
+    assert casm.vasp.io.filecache.FILE_CACHE.misses == misses + 1
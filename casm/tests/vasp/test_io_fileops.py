@@ -0,0 +1,111 @@
+import gzip
+import os
+
+import pytest
+
+import casm.vasp
+import casm.vasp.io
+from casm.vasp.io import fileops
+
+
+def test_gzip_file(tmpdir):
+    data = b"".join(b"line %d\n" % i for i in range(10000))
+    src = str(tmpdir.join("OUTCAR"))
+    for threads in [1, 4]:
+        with open(src, 'wb') as f:
+            f.write(data)
+        nbytes, seconds = casm.vasp.io.gzip_file(src,
+                                                 compresslevel=1,
+                                                 threads=threads,
+                                                 chunksize=1000,
+                                                 remove=True)
+        assert nbytes == len(data)
+        assert not os.path.exists(src)
+        with gzip.open(src + ".gz", 'rb') as f:
+            assert f.read() == data
+
+
+def test_copy_and_move_file(tmpdir):
+    data = os.urandom(100000)
+    src = str(tmpdir.join("WAVECAR"))
+    with open(src, 'wb') as f:
+        f.write(data)
+
+    assert casm.vasp.io.copy_file(src, src + ".copy", chunksize=4096)[0] == \
+        len(data)
+    with open(src + ".copy", 'rb') as f:
+        assert f.read() == data
+
+    contdir = tmpdir.mkdir("run.1")
+    casm.vasp.io.move_file(src, str(contdir.join("WAVECAR")))
+    assert not os.path.exists(src)
+    with open(str(contdir.join("WAVECAR")), 'rb') as f:
+        assert f.read() == data
+
+
+def test_copy_file_range_returns_zero(tmpdir, monkeypatch):
+    data = os.urandom(100000)
+    src = str(tmpdir.join("WAVECAR"))
+    with open(src, 'wb') as f:
+        f.write(data)
+
+    # not supported: falls back to shutil.copyfile
+    monkeypatch.setattr(os,
+                        "copy_file_range",
+                        lambda src, dst, count: 0,
+                        raising=False)
+    assert casm.vasp.io.copy_file(src, src + ".copy")[0] == len(data)
+    with open(src + ".copy", 'rb') as f:
+        assert f.read() == data
+
+    # stops part way: a truncated copy is an error
+    calls = []
+
+    def copy_file_range(src, dst, count):
+        calls.append(count)
+        if len(calls) > 1:
+            return 0
+        os.write(dst, os.read(src, count))
+        return count
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range)
+    with pytest.raises(casm.vasp.io.VaspIOError):
+        casm.vasp.io.copy_file(src, src + ".copy", chunksize=4096)
+
+
+def test_complete_job_compress(tmpdir):
+    tmpdir.join("OUTCAR").write("OUTCAR contents\n")
+    tmpdir.join("WAVECAR").write("WAVECAR contents\n")
+    settings = {
+        "remove": ["WAVECAR"],
+        "copy": [],
+        "move": [],
+        "compress": ["OUTCAR"],
+        "backup": [],
+        "extra_input_files": [],
+        "compresslevel": 1
+    }
+    casm.vasp.complete_job(str(tmpdir), settings)
+    assert sorted(os.listdir(str(tmpdir))) == ["OUTCAR.gz"]
+    with gzip.open(str(tmpdir.join("OUTCAR.gz")), 'rt') as f:
+        assert f.read() == "OUTCAR contents\n"
+
+
+def test_continue_job(tmpdir):
+    jobdir = tmpdir.mkdir("run.0")
+    for name in ["INCAR", "KPOINTS", "POTCAR", "CONTCAR", "WAVECAR", "OUTCAR"]:
+        jobdir.join(name).write(name + " contents\n")
+    settings = {
+        "remove": [],
+        "copy": [],
+        "move": ["WAVECAR"],
+        "compress": ["OUTCAR"],
+        "backup": ["WAVECAR"],
+        "extra_input_files": []
+    }
+    contdir = str(tmpdir.join("run.1"))
+    casm.vasp.continue_job(str(jobdir), contdir, settings)
+    assert sorted(os.listdir(contdir)) == \
+        ["INCAR", "KPOINTS", "POSCAR", "POTCAR", "WAVECAR"]
+    assert sorted(os.listdir(str(jobdir))) == \
+        ["CONTCAR", "INCAR", "KPOINTS", "OUTCAR.gz", "WAVECAR_BACKUP.gz"]
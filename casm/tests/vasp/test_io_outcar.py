@@ -0,0 +1,100 @@
+import gzip
+import os
+import shutil
+
+import pytest
+
+import casm.vasp.io
+
+
+def test_outcar_complete(shared_datadir, tmpdir):
+    outcarfile = str(shared_datadir / "LiNiO2/SCEL1_1_1_1_0_0_0/0/OUTCAR")
+    assert casm.vasp.io.outcar_complete(outcarfile)
+    assert casm.vasp.io.Outcar(outcarfile).complete
+
+    # gzipped
+    jobdir = tmpdir.mkdir("complete")
+    with open(outcarfile, 'rb') as fin:
+        with gzip.open(str(jobdir.join("OUTCAR.gz")), 'wb') as fout:
+            shutil.copyfileobj(fin, fout)
+    assert casm.vasp.io.outcar_complete(str(jobdir.join("OUTCAR")))
+    assert casm.vasp.io.job_complete(str(jobdir))
+
+    # incomplete: timing summary not written yet
+    jobdir = tmpdir.mkdir("incomplete")
+    with open(outcarfile, 'r') as f:
+        lines = f.readlines()
+    end = [i for i, line in enumerate(lines) if "General timing" in line][0]
+    jobdir.join("OUTCAR").write("".join(lines[:end]))
+    assert not casm.vasp.io.outcar_complete(str(jobdir.join("OUTCAR")))
+    assert not casm.vasp.io.job_complete(str(jobdir))
+    assert not casm.vasp.io.job_complete(str(tmpdir.mkdir("empty")))
+
+
+def test_gzip_tail(tmpdir, monkeypatch):
+    from casm.vasp.io import outcar
+    data = b"".join(b"line %d\n" % i for i in range(200000))
+    src = str(tmpdir.join("OUTCAR"))
+    with open(src, 'wb') as f:
+        f.write(data)
+
+    # single member: the whole file is decompressed
+    casm.vasp.io.gzip_file(src, dst=src + ".1.gz", compresslevel=1)
+    assert outcar.tail(src + ".1.gz", 1000) == data[-1000:]
+    assert outcar.tail(src + ".1.gz", len(data) + 1) == data
+
+    # multiple members: only the end of the file is decompressed
+    casm.vasp.io.gzip_file(src,
+                           dst=src + ".4.gz",
+                           compresslevel=1,
+                           threads=4,
+                           chunksize=100000)
+    assert os.path.getsize(src + ".4.gz") > 2 * 50000
+    with monkeypatch.context() as m:
+        m.setattr(outcar.gzip, "open", None)
+        assert outcar._gzip_tail(src + ".4.gz", 1000, window=50000) == \
+            data[-1000:]
+        assert outcar.tail(src + ".4.gz", len(data) + 1) == data
+    assert outcar._gzip_tail(src + ".4.gz", 200000, window=50000) == \
+        data[-200000:]
+
+
+def test_outcar_fields(shared_datadir, tmpdir):
+    outcarfile = str(shared_datadir / "LiNiO2/SCEL1_1_1_1_0_0_0/0/OUTCAR")
+    outcar = casm.vasp.io.Outcar(outcarfile)
+    assert outcar.kpts == [10, 11, 6]
+    assert (outcar.ngx, outcar.ngy, outcar.ngz) == (24, 24, 40)
+    assert outcar.ispin == 2
+    assert outcar.lorbit == 0
+    assert outcar.slowest_loop == 202.22
+    assert len(outcar.forces) == 4
+    assert outcar.forces[2] == [-0.009077, 0.006239, -0.009528]
+
+    # only requested fields are parsed
+    outcar = casm.vasp.io.Outcar(outcarfile, fields=["forces"])
+    assert len(outcar.forces) == 4
+    assert outcar.complete is False
+    assert outcar.kpts is None
+    assert outcar.ngx is None
+
+    outcar = casm.vasp.io.Outcar(outcarfile, fields=["complete", "ngx"])
+    assert outcar.complete
+    assert (outcar.ngx, outcar.ngy, outcar.ngz) == (24, 24, 40)
+    assert outcar.forces == []
+
+    with pytest.raises(casm.vasp.io.OutcarError):
+        casm.vasp.io.Outcar(outcarfile, fields=["energy"])
+
+    # only the forces from the last ionic step are kept, also when gzipped
+    with open(outcarfile, 'r') as f:
+        lines = f.readlines()
+    begin = [i for i, line in enumerate(lines) if "TOTAL-FORCE" in line][0]
+    block = lines[begin:begin + 7]
+    last = block[:2] + [
+        line.replace("0.000000", "1.000000") for line in block[2:6]
+    ] + block[6:]
+    with gzip.open(str(tmpdir.join("OUTCAR.gz")), 'wt') as f:
+        f.write("".join(lines[:begin + 7] + last + lines[begin + 7:]))
+    outcar = casm.vasp.io.Outcar(str(tmpdir.join("OUTCAR")), fields=["forces"])
+    assert len(outcar.forces) == 4
+    assert outcar.forces[0] == [1.0, -1.0, -1.0]
@@ -0,0 +1,54 @@
+import os
+
+import casm.vasp.io
+
+SPECIES = """POTCAR_DIR_PATH = {0}
+SPECIES    ALIAS    POTCAR  POTCAR_location
+Zr         Zr       1       PAW_PBE/Zr_sv
+O          O        1       PAW_PBE/O_s
+"""
+
+
+def _write_potcars(tmpdir):
+    potcardir = tmpdir.mkdir("potcars")
+    for name in ["Zr_sv", "O_s"]:
+        potcardir.join("PAW_PBE", name,
+                       "POTCAR").write("POTCAR " + name + "\nEnd of Dataset\n",
+                                       ensure=True)
+    speciesfile = tmpdir.join("SPECIES")
+    speciesfile.write(SPECIES.format(str(potcardir)))
+    return casm.vasp.io.species_settings(str(speciesfile))
+
+
+def test_write_potcar(shared_datadir, tmpdir):
+    species = _write_potcars(tmpdir)
+    poscar = casm.vasp.io.Poscar(
+        str(shared_datadir / "ZrO/SCEL1_1_1_1_0_0_0/2/POSCAR"), species)
+
+    casm.vasp.io.clear_file_cache()
+    for i in range(3):
+        filename = str(tmpdir.join("POTCAR." + str(i)))
+        casm.vasp.io.write_potcar(filename, poscar, species, sort=True)
+        with open(filename) as f:
+            assert f.read() == "POTCAR O_s\nEnd of Dataset\n" \
+                "POTCAR Zr_sv\nEnd of Dataset\n"
+    assert casm.vasp.io.filecache.FILE_CACHE.misses == 2
+
+    casm.vasp.io.write_potcar(filename, poscar, species, sort=False)
+    with open(filename) as f:
+        assert f.read() == "POTCAR Zr_sv\nEnd of Dataset\n" \
+            "POTCAR O_s\nEnd of Dataset\n"
+    assert casm.vasp.io.filecache.FILE_CACHE.misses == 2
+
+
+def test_assemble_potcar(tmpdir):
+    species = _write_potcars(tmpdir)
+    dirs = [species["Zr"].potcardir, species["O"].potcardir]
+    potcar = casm.vasp.io.assemble_potcar(dirs)
+    assert casm.vasp.io.assemble_potcar(dirs) is potcar
+
+    # changed POTCAR are read again
+    with open(os.path.join(dirs[1], "POTCAR"), 'w') as f:
+        f.write("POTCAR O\nEnd of Dataset\n")
+    assert casm.vasp.io.assemble_potcar(dirs) == \
+        b"POTCAR Zr_sv\nEnd of Dataset\nPOTCAR O\nEnd of Dataset\n"
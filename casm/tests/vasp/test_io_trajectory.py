@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import numpy as np
+
+import casm.vasp.io
+
+
+def test_trajectory(shared_datadir, tmpdir):
+    vasprunfile = str(shared_datadir / "vasprun/vasprun.xml")
+    with open(vasprunfile, 'r') as f:
+        text = f.read()
+
+    # run.0: complete, run.1: interrupted during the last ionic step,
+    # run.2: no output yet
+    calcdir = str(tmpdir.mkdir("calc"))
+    for i in range(3):
+        os.mkdir(os.path.join(calcdir, "run." + str(i)))
+    shutil.copy(vasprunfile, os.path.join(calcdir, "run.0", "vasprun.xml"))
+    end = text.rfind("<calculation>") + 500
+    with open(os.path.join(calcdir, "run.1", "vasprun.xml"), 'w') as f:
+        f.write(text[:end])
+
+    assert casm.vasp.io.trajectory.count_ionic_steps(os.path.join(
+        calcdir, "run.1", "vasprun.xml"),
+                                                     blocksize=7) == 3
+
+    traj = casm.vasp.io.read_trajectory(calcdir)
+    assert traj["energy"].shape == (5, )
+    assert traj["lattice"].shape == (5, 3, 3)
+    assert traj["basis"].shape == (5, 2, 3)
+    assert traj["forces"].shape == (5, 2, 3)
+    assert traj["stress"].shape == (5, 3, 3)
+    assert traj["forces"].flags['C_CONTIGUOUS']
+    assert traj["run"].tolist() == [0, 0, 0, 1, 1]
+    assert traj["step"].tolist() == [0, 1, 2, 0, 1]
+    assert traj["atom_type"].tolist() == ["Li", "Ni"]
+    assert traj["atoms_per_type"].tolist() == [1, 1]
+
+    steps = list(casm.vasp.io.iter_ionic_steps(vasprunfile))
+    for i, step in enumerate(steps):
+        assert traj["energy"][i] == step["e_wo_entrp"]
+        assert np.allclose(traj["forces"][i], step["forces"])
+        assert np.allclose(traj["lattice"][i], step["lattice"])
+    assert np.allclose(traj["forces"][3:], traj["forces"][:2])
+
+    filename = str(tmpdir.join("traj.npz"))
+    casm.vasp.io.write_trajectory(filename, traj)
+    loaded = casm.vasp.io.load_trajectory(filename)
+    assert sorted(loaded.keys()) == sorted(traj.keys())
+    for key in traj:
+        assert np.array_equal(loaded[key], traj[key])
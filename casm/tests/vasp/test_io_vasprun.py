@@ -0,0 +1,72 @@
+import gzip
+import shutil
+
+import numpy as np
+import pytest
+
+import casm.vasp.io
+
+
+def test_vasprun(shared_datadir):
+    vasprunfile = str(shared_datadir / "vasprun/vasprun.xml")
+    vrun = casm.vasp.io.Vasprun(vasprunfile)
+    assert vrun.is_complete
+    assert vrun.nelm == 4
+    assert vrun.atom_type == ["Li", "Ni"]
+    assert vrun.atoms_per_type == [1, 1]
+    assert vrun.total_energy == -10.2
+    assert len(vrun.all_e_0) == 3
+    assert len(vrun.all_e_0[0]) == vrun.nelm
+    assert np.allclose(vrun.lattice, np.diag([3.06, 3.06, 4.08]))
+    assert np.allclose(vrun.basis, [[0.02, 0.02, 0.02], [0.52, 0.52, 0.52]])
+    assert isinstance(vrun.forces, list)
+    assert len(vrun.forces) == 2
+    assert vrun.dos is None
+
+    vrun = casm.vasp.io.Vasprun(vasprunfile, DOS=True, Band=True)
+    assert vrun.efermi == 3.5
+    assert vrun.dos.shape == (2, 5, 3)
+    assert np.allclose(vrun.dos[1, :, 1], [1.0, 1.1, 1.2, 1.3, 1.4])
+    assert vrun.dos_lm.shape == (2, 2, 5, 4)
+    assert np.allclose(vrun.dos_lm[1, :, :, 1], 0.1)
+    assert len(vrun.eigenvalues) == 2
+    assert vrun.eigenvalues[0].shape == (3, 4)
+    assert np.allclose(vrun.eigenvalues[1][2], [-2.79, -1.79, -0.79, 0.21])
+    assert np.allclose(vrun.kpoint_divisions,
+                       [[0.0, 0.0, 0.0], [0.5, 0.0, 0.0]])
+
+
+def test_iter_ionic_steps(shared_datadir, tmpdir):
+    vasprunfile = str(shared_datadir / "vasprun/vasprun.xml")
+    steps = list(casm.vasp.io.iter_ionic_steps(vasprunfile))
+    assert len(steps) == 3
+    for i, step in enumerate(steps):
+        assert step["e_wo_entrp"] == pytest.approx(-10.0 - 0.1 * i)
+        assert step["e_0_energy"] == pytest.approx(-10.01 - 0.1 * i)
+        assert step["forces"].shape == (2, 3)
+        assert step["stress"].shape == (3, 3)
+        assert np.allclose(step["stress"], step["stress"].transpose())
+        assert np.allclose(step["lattice"],
+                           np.diag([3.0, 3.0, 4.0]) * (1 + 0.01 * i))
+        assert step["basis"].shape == (2, 3)
+        assert "dos" not in step
+        assert "eigenvalues" not in step
+    vrun = casm.vasp.io.Vasprun(vasprunfile)
+    assert np.allclose(steps[-1]["forces"], vrun.forces)
+    assert [step["e_0_scsteps"] for step in steps] == vrun.all_e_0
+
+    # only requested fields, also when gzipped
+    with open(vasprunfile, 'rb') as fin:
+        with gzip.open(str(tmpdir.join("vasprun.xml.gz")), 'wb') as fout:
+            shutil.copyfileobj(fin, fout)
+    steps = list(
+        casm.vasp.io.iter_ionic_steps(str(tmpdir.join("vasprun.xml")),
+                                      fields=["energy", "eigenvalues"]))
+    assert len(steps) == 3
+    assert sorted(steps[0].keys()) == [
+        "e_0_energy", "e_fr_energy", "e_wo_entrp", "eigenvalues"
+    ]
+    assert steps[0]["eigenvalues"].shape == (2, 3, 4, 2)
+
+    with pytest.raises(casm.vasp.io.VasprunError):
+        list(casm.vasp.io.iter_ionic_steps(vasprunfile, fields=["magmom"]))
@@ -2,8 +2,10 @@ import os.path
 import pytest
 import shutil
 import subprocess
+import sys
 
 from casm.misc.contexts import captured_output, print_stringIO
+import casm
 import casm.vasp
 
 
@@ -22,3 +24,29 @@ def test_vasp_relax(vasp_cmd, ZrO_vasp_rundir):
         # assert True
     #print_stringIO(sout) # print stdout from captured_output context
     #print_stringIO(serr) # print stderr from captured_output context
+
+
+def test_vasp_relax_fake(shared_datadir, tmpdir, monkeypatch):
+    """ Test vasp.Relax.run() with the vasp.fake stand-in for vasp """
+    # so that 'python -m casm.scripts.vasp_fake' works without installing
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.path.dirname(os.path.dirname(os.path.abspath(casm.__file__))))
+    calcdir = tmpdir.mkdir("calctype.default")
+    datadir = str(shared_datadir / "ZrO/SCEL1_1_1_1_0_0_0/2")
+    for name in ["INCAR", "KPOINTS", "POSCAR"]:
+        shutil.copyfile(os.path.join(datadir, name), str(calcdir.join(name)))
+    calcdir.join("POTCAR").write("")
+
+    settings = {
+        "vasp_cmd": sys.executable + " -m casm.scripts.vasp_fake",
+        "fine_ngx": False,
+        "supervisor": "auto" if casm.vasp.io.inotify_available() else "poll"
+    }
+    with captured_output() as (sout, serr):
+        calculation = casm.vasp.Relax(str(calcdir), settings)
+        status, task = calculation.run()
+    assert (status, task) == ("complete", None)
+    assert os.path.isfile(str(calcdir.join("run.final", "OUTCAR")))
+    assert casm.vasp.io.Oszicar(str(calcdir.join("run.final",
+                                                 "OSZICAR"))).E == [-4.0]
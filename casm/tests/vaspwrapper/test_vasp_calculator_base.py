@@ -0,0 +1,366 @@
+import json
+import math
+import os
+import sys
+
+from prisms_jobs import JobDB
+from prisms_jobs.jobdb import job_status_dict
+
+import pandas
+
+import casm.project
+import casm.vasp
+from casm.vaspwrapper.vasp_calculator_base import PACKED_CALCDIRS, \
+    VaspCalculatorBase, complete_packed_job, config_paths, \
+    config_records, config_status, estimate_cost, job_index, pack_bundles, \
+    packed_cmd, packed_job_index, packed_walltime, parallel_map
+
+INCAR = """SYSTEM = test relax
+ISIF = 2
+NSW = 2
+"""
+
+OSZICAR = """DAV:   1    -0.1E+02
+   1 F= -.10E+02 E0= -.11E+02  d E =-.10E+02
+DAV:   1    -0.1E+02
+   2 F= -.10E+02 E0= -.12E+02  d E =-.10E+02
+"""
+
+POSCAR = """ZrO
+1.0
+3.0982072391092994 0.0000000000000000 0.0000000000000000
+-1.5491036195546497 2.6831261697583990 0.0000000000000000
+0.0000000000000000 0.0000000000000000 5.6984418621159145
+Zr O
+2 2
+Direct
+0.0000000000000000 0.0000000000000000 0.0000000000000000
+0.6666659999999993 0.3333330000000032 0.5000000000000000
+0.3333330000000032 0.6666659999999993 0.2500000000000000
+0.3333330000000032 0.6666659999999993 0.7500000000000000
+"""
+
+
+def _square(x):
+    return x * x
+
+
+def test_parallel_map(capsys):
+    args_list = [(i, ) for i in range(10)]
+    expected = [i * i for i in range(10)]
+    assert parallel_map(_square, args_list) == expected
+    assert parallel_map(_square, args_list, n_jobs=4) == expected
+    assert parallel_map(_square, args_list, n_jobs=2,
+                        executor="process") == expected
+
+    parallel_map(_square, args_list, n_jobs=2, label="test")
+    out = capsys.readouterr().out
+    assert "test: 10/10" in out
+
+
+def test_config_status(tmpdir):
+    calcdir = str(tmpdir)
+    status, task, n_runs, energy = config_status(casm.vasp.Relax, calcdir,
+                                                 None)
+    assert (status, n_runs) == ("incomplete", 0)
+    assert math.isnan(energy)
+
+    rundir = tmpdir.mkdir("run.0")
+    rundir.join("INCAR").write(INCAR)
+    rundir.join("OSZICAR").write(OSZICAR)
+    casm.vasp.io.clear_file_cache()
+    status, task, n_runs, energy = config_status(casm.vasp.Relax, calcdir,
+                                                 None)
+    assert (status, n_runs, energy) == ("incomplete", 1, -12.0)
+
+
+def test_status_threads(tmpdir, capsys):
+    setfile = tmpdir.join("calc.json")
+    setfile.write(
+        json.dumps({
+            "queue": "batch",
+            "ppn": "1",
+            "walltime": "1:00:00",
+            "nodes": "1",
+            "fine_ngx": False
+        }))
+    names = ["SCEL1_1_1_1_0_0_0/" + str(i) for i in range(100)]
+    calcdirs = [str(tmpdir.join("calc", str(i))) for i in range(100)]
+    calc = VaspCalculatorBase.__new__(VaspCalculatorBase)
+    calc.calculator = casm.vasp.Relax
+    calc.selection = type(
+        "Selection", (object, ), {
+            "data":
+            pandas.DataFrame({
+                "name": names,
+                "setfile": str(setfile),
+                "calcdir": calcdirs
+            })
+        })
+
+    stdout = sys.stdout
+    status = calc.status(n_jobs=8)
+    assert sys.stdout is stdout
+    assert status["configname"].tolist() == names
+    assert set(status["status"]) == set(["incomplete"])
+
+    out = capsys.readouterr().out
+    assert "status: 100/100" in out
+    assert "Constructing" not in out
+
+
+def test_job_index(tmpdir):
+    db = JobDB(str(tmpdir.join("jobs.db")))
+    calcdirs = [
+        str(tmpdir.join("SCEL1_1_1_1_0_0_0", str(i), "calctype.default"))
+        for i in range(3)
+    ]
+    db.add(
+        job_status_dict(jobid="1",
+                        rundir=calcdirs[0],
+                        jobstatus="C",
+                        taskstatus="Complete"))
+    db.add(job_status_dict(jobid="2", rundir=calcdirs[0], jobstatus="R"))
+    db.add(
+        job_status_dict(jobid="3",
+                        rundir=os.path.join(calcdirs[1], "run.0"),
+                        jobstatus="Q"))
+    db.add(
+        job_status_dict(jobid="4",
+                        rundir=str(tmpdir.join("other")),
+                        jobstatus="R"))
+
+    index = job_index(db, calcdirs)
+    assert sorted(index.keys()) == calcdirs[:2]
+    assert [job["jobid"] for job in index[calcdirs[0]]] == ["1", "2"]
+    assert [job["jobstatus"] for job in index[calcdirs[0]]] == ["C", "R"]
+    assert index[calcdirs[1]] == [{
+        "jobid": "3",
+        "jobstatus": "Q",
+        "taskstatus": "Incomplete"
+    }]
+    for calcdir in calcdirs:
+        assert [job["jobid"] for job in index.get(calcdir, [])] == \
+            db.select_regex_id("rundir", calcdir)
+    db.close()
+
+
+def test_pack_bundles():
+    costs = [8, 1, 4, 20, 2, 4]
+    bundles = pack_bundles(costs, 10)
+    assert sorted(i for bundle in bundles for i in bundle) == list(range(6))
+    assert all(
+        sum(costs[i] for i in bundle) <= 10 for bundle in bundles
+        if len(bundle) > 1)
+    assert [3] in bundles
+    assert len(bundles) == 3
+
+
+def test_packed_cmd():
+    cmds = ["run a\n", "run b\n", "run c\n"]
+    logs = ["a.out", "b.out", "c.out"]
+    assert packed_cmd(cmds, logs) == "run a\nrun b\nrun c\n"
+    assert packed_cmd(cmds, logs, n_concurrent=2) == \
+        "(run a) > a.out 2>&1 &\n(run b) > b.out 2>&1 &\nwait\n" \
+        "(run c) > c.out 2>&1 &\nwait\n"
+    assert packed_cmd(cmds[:1], logs[:1], n_concurrent=2, ncpus=4) == \
+        "export CASM_NCPUS=4\n(run a) > a.out 2>&1 &\nwait\n"
+
+
+def test_packed_walltime():
+    assert packed_walltime(["1:00:00", "2:30:00"], 1) == "2:30:00"
+    assert packed_walltime(["1:00:00", "30:00"], 3) == "3:00:00"
+    assert packed_walltime(["1-12:00:00"], 2) == "72:00:00"
+
+
+def test_submit_packed(tmpdir, monkeypatch):
+    import prisms_jobs
+    import casm.vaspwrapper.vasp_calculator_base as base
+
+    class FakeJobDB(object):
+        def update(self):
+            pass
+
+    submitted = []
+
+    class FakeJob(object):
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def submit(self):
+            submitted.append(self.kwargs)
+
+    monkeypatch.setattr(prisms_jobs, "JobDB", FakeJobDB)
+    monkeypatch.setattr(prisms_jobs, "Job", FakeJob)
+    monkeypatch.setattr(base, "job_index", lambda *args: {})
+    monkeypatch.setattr(base, "estimate_cost", lambda calcdir: 1)
+
+    settings = {
+        "nodes": 1,
+        "ppn": 4,
+        "walltime": "2:00:00",
+        "account": None,
+        "pmem": None,
+        "qos": None,
+        "queue": "batch",
+        "message": None,
+        "email": None,
+        "priority": 0,
+        "preamble": None,
+        "prerun": None,
+        "postrun": None
+    }
+    tmpdir.mkdir(".casm")
+    calcdirs = [str(tmpdir.mkdir(str(i))) for i in range(5)]
+    calc = VaspCalculatorBase.__new__(VaspCalculatorBase)
+    calc.casm_directories = casm.project.DirectoryStructure(str(tmpdir))
+    calc.selection = type(
+        "Selection", (object, ), {
+            "data":
+            pandas.DataFrame(
+                {
+                    "name": ["SCEL1_1_1_1_0_0_0/" + str(i) for i in range(5)],
+                    "configdir": calcdirs,
+                    "calcdir": calcdirs
+                })
+        })
+    calc.calctype = "default"
+    calc.auto = False
+    calc.config_setup = lambda config_data: None
+    calc._submit_needed = lambda config_data, db, db_jobs: settings
+    calc.run_cmd = lambda configdir, calctype: "run " + configdir + "\n"
+
+    calc.submit_packed(max_cost=5, n_concurrent=2)
+    assert len(submitted) == 1
+    job = submitted[0]
+    assert job["nodes"] == 2
+    assert job["ppn"] == 4
+    assert job["walltime"] == "6:00:00"
+    assert "export CASM_NCPUS=4\n" in job["command"]
+    assert job["command"].count("wait\n") == 3
+
+    submitted[:] = []
+    calc.submit_packed(max_cost=5)
+    assert submitted[0]["nodes"] == 1
+    assert submitted[0]["walltime"] == "10:00:00"
+    assert "CASM_NCPUS" not in submitted[0]["command"]
+
+
+def test_estimate_cost(tmpdir):
+    tmpdir.join("POSCAR").write(POSCAR)
+    tmpdir.join("KPOINTS").write("Mesh\n0\nAuto\n10\n")
+    assert estimate_cost(str(tmpdir)) == 4
+
+    tmpdir.join("KPOINTS").write("Mesh\n0\nGamma\n9 9 5\n0 0 0\n")
+    assert estimate_cost(str(tmpdir)) == 4 * 9 * 9 * 5
+
+
+def test_job_index_packed(tmpdir):
+    db = JobDB(str(tmpdir.join("jobs.db")))
+    calcdirs = [str(tmpdir.join("calc", str(i))) for i in range(3)]
+    packed_jobs_dir = str(tmpdir.mkdir("packed_jobs"))
+    rundir = tmpdir.join("packed_jobs", "packed.0")
+    rundir.join(PACKED_CALCDIRS).write("\n".join(calcdirs[:2]) + "\n",
+                                       ensure=True)
+    db.add(job_status_dict(jobid="1", rundir=str(rundir), jobstatus="R"))
+
+    db.add(job_status_dict(jobid="2", rundir=calcdirs[2], jobstatus="R"))
+
+    index = job_index(db, calcdirs, packed_jobs_dir)
+    assert sorted(index.keys()) == calcdirs
+    assert index[calcdirs[1]][0]["jobid"] == "1"
+    assert index[calcdirs[1]][0]["packed"]
+    assert list(job_index(db, calcdirs).keys()) == calcdirs[2:]
+
+    index = packed_job_index(db, calcdirs, packed_jobs_dir)
+    assert sorted(index.keys()) == calcdirs[:2]
+    assert [job["jobid"] for job in index[calcdirs[0]]] == ["1"]
+    db.close()
+
+
+def test_complete_packed_job(tmpdir, monkeypatch):
+    import casm.vaspwrapper.vasp_calculator_base as base
+    calls = []
+    monkeypatch.setattr(base,
+                        "complete_job",
+                        lambda jobid=None: calls.append("complete"))
+    monkeypatch.setattr(base, "error_job",
+                        lambda message: calls.append(message))
+
+    calcdirs = [tmpdir.mkdir(str(i)) for i in range(2)]
+    rundir = tmpdir.mkdir("packed.0")
+    rundir.join(PACKED_CALCDIRS).write("\n".join(str(d)
+                                                 for d in calcdirs) + "\n")
+    calcdirs[0].join("status.json").write('{"status": "complete"}')
+    complete_packed_job(str(rundir))
+    assert calls == ["1 of 2 packed configurations not complete"]
+
+    calcdirs[1].join("status.json").write('{"status": "complete"}')
+    complete_packed_job(str(rundir))
+    assert calls[-1] == "complete"
+
+
+def test_config_paths(tmpdir):
+    tmpdir.mkdir(".casm")
+    dir = casm.project.DirectoryStructure(str(tmpdir))
+    clex = casm.project.ClexDescription("formation_energy", "formation_energy",
+                                        "default", "default", "default",
+                                        "default")
+    tmpdir.join("training_data", "settings", "calctype.default",
+                "calc.json").write("{}", ensure=True)
+    tmpdir.join("training_data", "SCEL2_1_2_1_0_0_0", "1", "settings",
+                "calctype.default", "calc.json").write("{}", ensure=True)
+    names = [
+        "SCEL1_1_1_1_0_0_0/0", "SCEL2_1_2_1_0_0_0/0", "SCEL2_1_2_1_0_0_0/1"
+    ]
+
+    paths = config_paths(dir, pandas.Series(names), clex)
+    assert list(
+        paths["configdir"]) == [dir.configuration_dir(name) for name in names]
+    assert list(
+        paths["calcdir"]) == [dir.calctype_dir(name, clex) for name in names]
+    assert list(paths["setfile"]) == [
+        dir.settings_path_crawl("calc.json", name, clex) for name in names
+    ]
+    assert paths["setfile"][2] == str(
+        tmpdir.join("training_data", "SCEL2_1_2_1_0_0_0", "1", "settings",
+                    "calctype.default", "calc.json"))
+
+    data = pandas.DataFrame({"name": names, "selected": 1})
+    data.loc[:, "calcdir"] = paths["calcdir"]
+    records = config_records(data)
+    assert [r["name"] for r in records] == names
+    assert records[1]["calcdir"] == paths["calcdir"][1]
+
+
+def test_append_selection_data(tmpdir):
+    tmpdir.mkdir(".casm")
+
+    class FakeSelection(object):
+        def __init__(self):
+            self.data = pandas.DataFrame({"name": ["SCEL1_1_1_1_0_0_0/0"]})
+
+        def add_data(self, key, values):
+            self.data.loc[:, key] = values
+
+    class Calculator(VaspCalculatorBase):
+        def config_properties(self, config_data):
+            config_dict = super(Calculator,
+                                self).config_properties(config_data)
+            config_dict["extra"] = "value"
+            return config_dict
+
+    for cls, columns in [(VaspCalculatorBase, []), (Calculator, ["extra"])]:
+        calc = cls.__new__(cls)
+        calc.selection = FakeSelection()
+        calc.casm_directories = casm.project.DirectoryStructure(str(tmpdir))
+        calc.clex = casm.project.ClexDescription("formation_energy",
+                                                 "formation_energy", "default",
+                                                 "default", "default",
+                                                 "default")
+        calc.calc_subdir = ""
+        calc.append_selection_data()
+        assert calc.selection.data.columns.tolist(
+        ) == ["name", "configdir", "calcdir", "setfile"] + columns
+        assert calc.selection.data["calcdir"][0] == \
+            calc.casm_directories.calctype_dir("SCEL1_1_1_1_0_0_0/0", calc.clex)
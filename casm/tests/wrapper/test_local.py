@@ -0,0 +1,77 @@
+import json
+import os
+import signal
+import sys
+import threading
+from io import StringIO
+
+import pytest
+
+from casm.wrapper.local import WorkQueue, run_queue
+
+
+def test_run_queue(tmpdir):
+    queue_file = str(tmpdir.join("queue.json"))
+    queue = WorkQueue(queue_file)
+    for i in range(4):
+        d = tmpdir.mkdir("calc." + str(i))
+        queue.add("calc." + str(i), "echo $CASM_NCPUS > ncpus", str(d),
+                  str(d.join("log")))
+    queue.add("fail", "exit 3", str(tmpdir))
+
+    env = dict(os.environ)
+    env["CASM_NCPUS"] = "2"
+    assert run_queue(queue, n_workers=2, env=env, out=StringIO()) == 1
+    for i in range(4):
+        assert tmpdir.join("calc." + str(i), "ncpus").read() == "2\n"
+
+    with open(queue_file) as f:
+        tasks = json.load(f)["tasks"]
+    assert [t["status"] for t in tasks] == ["done"] * 4 + ["failed"]
+    assert tasks[-1]["returncode"] == 3
+
+
+def test_resume_queue(tmpdir):
+    queue_file = str(tmpdir.join("queue.json"))
+    queue = WorkQueue(queue_file)
+    queue.add("a", "echo a >> out", str(tmpdir))
+    queue.add("b", "echo b >> out", str(tmpdir))
+    # as if interrupted while running "b"
+    queue.set_status(queue.tasks[0], "done", 0)
+    queue.set_status(queue.tasks[1], "running")
+
+    queue = WorkQueue(queue_file)
+    queue.add("a", "echo a >> out", str(tmpdir))
+    assert [t["id"] for t in queue.pending()] == ["b"]
+    assert run_queue(queue, out=StringIO()) == 0
+    assert tmpdir.join("out").read() == "b\n"
+
+
+def test_interrupt_queue(tmpdir):
+    queue_file = str(tmpdir.join("queue.json"))
+    queue = WorkQueue(queue_file)
+    for i in range(6):
+        queue.add(str(i), "sleep 1 && echo " + str(i) + " >> out", str(tmpdir))
+    queue.add("fail", "exit 3", str(tmpdir))
+    queue.save()
+
+    timer = threading.Timer(0.3, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    with pytest.raises(KeyboardInterrupt):
+        run_queue(queue, n_workers=2, out=StringIO())
+    timer.join()
+    assert not tmpdir.join("out").exists()
+    with open(queue_file) as f:
+        tasks = json.load(f)["tasks"]
+    assert [t["status"] for t in tasks] == ["pending"] * 7
+
+    # resume, and rerun failed tasks when added again
+    queue = WorkQueue(queue_file)
+    queue.tasks = queue.tasks[:2]
+    assert run_queue(queue, n_workers=2, out=StringIO()) == 0
+    assert sorted(tmpdir.join("out").read().split()) == ["0", "1"]
+    queue.add("fail", "exit 3", str(tmpdir))
+    assert run_queue(queue, out=StringIO()) == 1
+    queue.add("fail", "exit 0", str(tmpdir))
+    assert [t["id"] for t in queue.pending()] == ["fail"]
+    assert run_queue(queue, out=StringIO()) == 0